@@ -1,5 +1,10 @@
 from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
 from django.core.exceptions import ValidationError as DjangoValidationError 
+from django.core.paginator import Paginator
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
+from .counts import COUNT_MODE_ESTIMATE, get_count
 from .models import (
     Team,
     Personnel,
@@ -8,14 +13,106 @@ from .models import (
     WorkOrder,
     Part,
     Aircraft, 
+    ProductionEvent,
 )
+from .recycling import cancel_work_orders, recycle_aircraft, recycle_parts
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Büyük tablolarda changelist sayımını COUNT(*) yerine counts.get_count ile yapar:
+    PostgreSQL'de eşik üzerindeki tablolarda planlayıcı tahmini, diğer durumlarda önbelleğe alınmış sayım kullanılır.
+    """
+    @cached_property
+    def count(self):
+        count, _ = get_count(self.object_list, COUNT_MODE_ESTIMATE, scope='admin')
+        return count
+
+
+class LargeTableAdminMixin:
+    """Milyonlarca satırlı tablolar için changelist ayarları: tahmini sayım, tam sayım sorgusu yok."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class InputListFilter(admin.SimpleListFilter):
+    """
+    Seçenek listesi yerine metin kutusu gösteren filtre; binlerce kayıtlı ilişkiler (personel, iş emri)
+    için tüm kayıtları seçenek olarak çizmeyi önler. Değer `field_path` alanıyla birebir karşılaştırılır.
+    """
+    template = 'admin/aircraft_production_app/input_filter.html'
+    field_path = None
+    placeholder = ''
+
+    def lookups(self, request, model_admin):
+        # SimpleListFilter seçenek yoksa çizilmez; metin kutusu için tek bir yer tutucu seçenek döner.
+        return (('', ''),)
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if not value:
+            return queryset
+        return queryset.filter(**{self.field_path: value})
+
+    def get_facet_counts(self, pk_attname, filtered_qs):
+        return {}
+
+    def choices(self, changelist):
+        # Arama, sıralama ve diğer filtreler gizli alanlarla korunur.
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(remove=[self.parameter_name]),
+            'query_parts': [
+                (name, value) for name, value in changelist.params.items() if name != self.parameter_name
+            ],
+        }
+
+
+class CreatedByPersonnelFilter(InputListFilter):
+    title = "üreten personel (kullanıcı adı)"
+    parameter_name = 'created_by'
+    field_path = 'created_by_personnel__user__username'
+
+
+class AssembledByPersonnelFilter(InputListFilter):
+    title = "montajı yapan personel (kullanıcı adı)"
+    parameter_name = 'assembled_by'
+    field_path = 'assembled_by_personnel__user__username'
+
+
+class WorkOrderIdFilter(InputListFilter):
+    title = "iş emri numarası"
+    parameter_name = 'work_order_id'
+    field_path = 'work_order_id'
+
+    def queryset(self, request, queryset):
+        if self.value() and not self.value().strip().isdigit():
+            return queryset.none()
+        return super().queryset(request, queryset)
+
+
+class WorkOrderCreatorFilter(InputListFilter):
+    title = "oluşturan (kullanıcı adı)"
+    parameter_name = 'created_by'
+    field_path = 'created_by__username'
+
+
+def report_recycle_result(model_admin, request, report, success_message):
+    """Toplu geri dönüştürme raporunu admin mesajlarına dönüştürür."""
+    if report.processed:
+        model_admin.message_user(request, success_message.format(count=report.processed), messages.SUCCESS)
+    if report.skipped:
+        model_admin.message_user(request, f"{len(report.skipped)} kayıt zaten işlenmiş durumda olduğu için atlandı.", messages.INFO)
+    for refused in report.refused:
+        model_admin.message_user(request, f"'{refused['label']}': {refused['reason']}", messages.ERROR)
 
 
 @admin.register(WorkOrder)
-class WorkOrderAdmin(admin.ModelAdmin):
+class WorkOrderAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """WorkOrder modelini Admin arayüzünde yönetmek için özel ayarlar."""
     list_display = ('__str__', 'aircraft_model', 'quantity', 'status', 'created_by', 'assigned_to_assembly_team', 'created_at')
-    list_filter = ('status', 'aircraft_model', 'assigned_to_assembly_team', 'created_by')
+    list_filter = ('status', 'aircraft_model', 'assigned_to_assembly_team', WorkOrderCreatorFilter)
+    list_select_related = ('aircraft_model', 'created_by', 'assigned_to_assembly_team')
     search_fields = ('aircraft_model__name', 'notes', 'id')
     readonly_fields = ('created_by', 'created_at', 'updated_at')
 
@@ -31,17 +128,34 @@ class WorkOrderAdmin(admin.ModelAdmin):
 
     def delete_queryset(self, request, queryset):
         """Birden fazla iş emrini toplu iptal (delete override) eder."""
-        for obj in queryset:
-            obj.delete()
+        report = cancel_work_orders(queryset)
+        report_recycle_result(self, request, report, "{count} iş emri iptal edildi.")
+
+
+class PartChangeList(ChangeList):
+    """Sayfadaki parçaların takılı olduğu uçak bilgisini tek sorguda çözer."""
+    def get_results(self, request):
+        super().get_results(request)
+        # result_list'in kendisi değerlendirilir; satırlar aynı (çözülmüş) nesnelerle çizilir.
+        Part.resolve_installed_aircraft_info(self.result_list)
 
 
 @admin.register(Part)
-class PartAdmin(admin.ModelAdmin):
+class PartAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Part modelini Admin arayüzünde yönetmek için özel ayarlar."""
     list_display = ('serial_number','part_type','aircraft_model_compatibility','status','produced_by_team','created_by_personnel','production_date','get_installed_aircraft_info', 'updated_at')
-    list_filter = ('status', 'part_type', 'aircraft_model_compatibility', 'produced_by_team','created_by_personnel')
+    list_filter = ('status', 'part_type', 'aircraft_model_compatibility', 'produced_by_team', CreatedByPersonnelFilter)
+    # Takılı olduğu uçak da JOIN ile okunur; get_installed_aircraft_info satır başına sorgu yapmaz.
+    list_select_related = (
+        'part_type', 'aircraft_model_compatibility', 'produced_by_team', 'created_by_personnel__user',
+        'installed_in__aircraft_model',
+    )
     search_fields = ('serial_number', 'part_type__category', 'aircraft_model_compatibility__name')
     readonly_fields = ('serial_number', 'production_date', 'updated_at', 'created_by_personnel', 'get_installed_aircraft_info')
+    autocomplete_fields = ('produced_by_team',)
+
+    def get_changelist(self, request, **kwargs):
+        return PartChangeList
 
     def get_form(self, request, obj=None, **kwargs):
         """Form oluşturulurken özel logic eklemek için override."""
@@ -58,20 +172,8 @@ class PartAdmin(admin.ModelAdmin):
 
     def delete_queryset(self, request, queryset):
         """Birden fazla parçayı toplu geri dönüştürmek (delete override) için kullanılır."""
-        deleted_count = 0
-        errors = []
-        for obj in queryset:
-            try:
-                obj.delete()
-                deleted_count += 1
-            except DjangoValidationError as e:
-                errors.append(f"'{obj}': {e.messages[0] if e.messages else str(e)}")
-
-        if deleted_count > 0:
-            self.message_user(request, f"{deleted_count} parça başarıyla geri dönüştürüldü.", messages.SUCCESS)
-        if errors:
-            for error_msg in errors:
-                self.message_user(request, error_msg, messages.ERROR)
+        report = recycle_parts(queryset)
+        report_recycle_result(self, request, report, "{count} parça başarıyla geri dönüştürüldü.")
 
     def save_model(self, request, obj, form, change):
         """Yeni parçaya created_by_personnel atamak için override."""
@@ -85,12 +187,15 @@ class PartAdmin(admin.ModelAdmin):
 
 
 @admin.register(Aircraft)
-class AircraftAdmin(admin.ModelAdmin):
+class AircraftAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Aircraft modelini Admin arayüzünde yönetmek için özel ayarlar."""
     list_display = ('serial_number', 'aircraft_model', 'status', 'assembled_by_team','assembled_by_personnel', 'assembly_date', 'updated_at','work_order')
-    list_filter = ('aircraft_model', 'status', 'assembled_by_team', 'assembled_by_personnel', 'work_order')
+    list_filter = ('aircraft_model', 'status', 'assembled_by_team', AssembledByPersonnelFilter, WorkOrderIdFilter)
+    list_select_related = ('aircraft_model', 'assembled_by_team', 'assembled_by_personnel__user', 'work_order__aircraft_model')
     search_fields = ('serial_number', 'aircraft_model__name')
     readonly_fields = ('serial_number', 'assembly_date', 'updated_at', 'assembled_by_personnel')
+    # Parça ve iş emri seçimleri tüm tabloyu <select> olarak çizmek yerine arama ile yapılır.
+    autocomplete_fields = ('wing', 'fuselage', 'tail', 'avionics', 'work_order')
 
     def get_form(self, request, obj=None, **kwargs):
         """Form oluşturulurken iş emrine göre aircraft_model alanını otomatik ayarlar."""
@@ -106,8 +211,8 @@ class AircraftAdmin(admin.ModelAdmin):
 
     def delete_queryset(self, request, queryset):
         """Birden fazla hava aracını toplu geri dönüştürmek (delete override) için kullanılır."""
-        for obj in queryset:
-            obj.delete()
+        report = recycle_aircraft(queryset)
+        report_recycle_result(self, request, report, "{count} hava aracı geri dönüştürüldü; parçaları kullanıma hazır.")
 
     def save_model(self, request, obj, form, change):
         """Yeni hava aracı oluştururken assembled_by_personnel alanını ayarlar."""
@@ -157,12 +262,22 @@ class TeamAdmin(admin.ModelAdmin):
     list_filter = ('team_type',)
     search_fields = ('name',)
 
+    def get_queryset(self, request):
+        """
+        Sayımlar TeamQuerySet.with_stats ile tek sorguda hesaplanır; personel adları tek bir prefetch sorgusuyla okunur
+        (Team.get_produced_item_count, personnel_count ve display_personnel_names ek sorgu yapmaz).
+        """
+        return super().get_queryset(request).with_stats().prefetch_related(
+            Prefetch('members', queryset=Personnel.objects.select_related('user'))
+        )
+
 
 @admin.register(Personnel)
 class PersonnelAdmin(admin.ModelAdmin):
     """Personnel modelini Admin arayüzünde yönetmek için özel ayarlar."""
     list_display = ('user', 'get_full_name', 'team', 'get_team_type')
     list_filter = ('team__team_type', 'team')
+    list_select_related = ('user', 'team')
     search_fields = ('user__username', 'user__first_name', 'user__last_name', 'team__name')
     autocomplete_fields = ['user', 'team']
 
@@ -176,4 +291,22 @@ class PersonnelAdmin(admin.ModelAdmin):
         """Personelin bağlı olduğu takımın tipini döndürür."""
         if obj.team:
             return obj.team.get_team_type_display()
-        return "-"
\ No newline at end of file
+        return "-"
+
+
+@admin.register(ProductionEvent)
+class ProductionEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    """Üretim olay günlüğünü yalnızca görüntüleme amacıyla kullanılır."""
+    list_display = ('occurred_at', 'event_type', 'entity_type', 'serial_number', 'entity_id', 'team')
+    list_filter = ('event_type', 'entity_type')
+    search_fields = ('=serial_number',)
+    list_select_related = ('team',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,213 @@
+# aircraft_production_app/api_bench.py
+"""
+API endpoint benchmark'ı: her senaryo (endpoint) ve rol için gecikme yüzdelikleri, SQL sorgu sayısı ve SQL süresi.
+
+- İstekler Django test client'ı ile, gerçek token doğrulaması ve middleware zinciri üzerinden gönderilir.
+- Isınma istekleri (önbellekler dolsun diye) ölçüme katılmaz; sorgu sayıları bu yüzden kararlı durumu gösterir.
+- Veri değiştiren senaryolar geri alınan bir transaction içinde çalışır; veri kümesi değişmez.
+- Sorgu bütçeleri (API_QUERY_BUDGETS) depoda tutulur; bir senaryo bütçesini aşarsa ihlal olarak raporlanır.
+  Bütçe artırmak, kod incelemesinde görünür bir değişiklik olmalıdır.
+"""
+import platform
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .models import Aircraft, DefinedTeamTypes, Part, Personnel, PartStatusChoices, StockLevel, WorkOrder
+
+DATATABLE_PARAMS = {'draw': 1, 'start': 0, 'length': 25}
+ROLES = ('admin', 'wing', 'assembly')
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Ölçülen tek bir istek tipi. `payload` bir fonksiyonsa veri kümesine göre çalışma anında hesaplanır."""
+    name: str
+    path: str
+    method: str = 'get'
+    payload: object = None
+    mutates: bool = False
+
+
+def assembly_payload():
+    """Her kategoride en çok AVAILABLE parçası olan modelin montaj isteği (parça eksikliğinden 400 alınmasın)."""
+    stock = (
+        StockLevel.objects.filter(status=PartStatusChoices.AVAILABLE)
+        .values('aircraft_model_id').annotate(available=Min('count')).order_by('-available', 'aircraft_model_id').first()
+    )
+    return {'aircraft_model_id': stock['aircraft_model_id'] if stock else 0}
+
+
+SCENARIOS = (
+    Scenario('parts', '/api/parts/', payload=DATATABLE_PARAMS),
+    Scenario('aircraft', '/api/aircraft/', payload=DATATABLE_PARAMS),
+    Scenario('work-orders', '/api/work-orders/', payload=DATATABLE_PARAMS),
+    Scenario('stock-levels-parts', '/api/inventory/stock-levels/', payload={**DATATABLE_PARAMS, 'stock_type': 'parts'}),
+    Scenario('stock-levels-aircraft', '/api/inventory/stock-levels/', payload={**DATATABLE_PARAMS, 'stock_type': 'aircrafts'}),
+    Scenario('assemble-aircraft', '/api/assembly/assemble-aircraft/', method='post', payload=assembly_payload, mutates=True),
+)
+
+# {senaryo: {rol: en fazla SQL sorgusu}}; ısınmadan sonraki kararlı durum için.
+# Liste endpoint'lerinde sayım önbellekten okunur; önbellek süresi dolduğunda sayım sorgusu eklenir (sayfa + sayım).
+# Montaj bütçesi, iç içe transaction'ların SAVEPOINT/RELEASE ifadelerini de içerir.
+API_QUERY_BUDGETS = {
+    'parts': {'admin': 2, 'wing': 2, 'assembly': 2},
+    'aircraft': {'admin': 2, 'wing': 2, 'assembly': 2},
+    'work-orders': {'admin': 2, 'wing': 2, 'assembly': 2},
+    'stock-levels-parts': {'admin': 3, 'wing': 3, 'assembly': 3},
+    'stock-levels-aircraft': {'admin': 2, 'wing': 2, 'assembly': 2},
+    'assemble-aircraft': {'admin': 0, 'wing': 0, 'assembly': 22},
+}
+
+
+@dataclass
+class ScenarioResult:
+    endpoint: str
+    role: str
+    method: str
+    path: str
+    status: int
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    queries: int  # İterasyonlardaki en yüksek sorgu sayısı
+    sql_ms: float  # İterasyon başına ortalama SQL süresi
+    query_budget: int = None
+
+    @property
+    def over_budget(self):
+        return self.query_budget is not None and self.queries > self.query_budget
+
+
+def percentile(sorted_values, percent):
+    """Doğrusal ara değerlemeli yüzdelik; `sorted_values` artan sırada olmalıdır."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def get_role_users():
+    """
+    {rol: kullanıcı}; admin için ilk süper kullanıcı, takım rolleri için üyesi olan ilk kanat/montaj takımı personeli.
+    Eksik rol varsa ValueError fırlatır.
+    """
+    users = {'admin': User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()}
+    for role, team_type in (('wing', DefinedTeamTypes.WING_TEAM), ('assembly', DefinedTeamTypes.ASSEMBLY_TEAM)):
+        personnel = Personnel.objects.filter(team__team_type=team_type, user__is_active=True).select_related('user').order_by('pk').first()
+        users[role] = personnel.user if personnel else None
+    missing = [role for role, user in users.items() if user is None]
+    if missing:
+        raise ValueError(
+            f"No user found for role(s): {', '.join(missing)}. "
+            "Create a superuser and run generate_production_dataset first."
+        )
+    return users
+
+
+def run_scenario(client, scenario, role, token_key, iterations, warmup):
+    payload = scenario.payload() if callable(scenario.payload) else scenario.payload
+    headers = {'HTTP_AUTHORIZATION': f'Token {token_key}'}
+    request = getattr(client, scenario.method)
+
+    def send():
+        if scenario.method == 'get':
+            return request(scenario.path, payload, **headers)
+        return request(scenario.path, payload, content_type='application/json', **headers)
+
+    latencies = []
+    query_counts = []
+    sql_seconds = 0.0
+    status = None
+    for iteration in range(warmup + iterations):
+        with transaction.atomic() if scenario.mutates else nullcontext():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = send()
+                elapsed = time.perf_counter() - started
+            if scenario.mutates:
+                transaction.set_rollback(True)
+        if iteration < warmup:
+            continue
+        status = response.status_code
+        latencies.append(elapsed * 1000)
+        query_counts.append(len(queries))
+        sql_seconds += sum(float(query['time']) for query in queries.captured_queries)
+
+    latencies.sort()
+    return ScenarioResult(
+        endpoint=scenario.name, role=role, method=scenario.method.upper(), path=scenario.path, status=status,
+        iterations=iterations, p50_ms=round(percentile(latencies, 50), 3), p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3), mean_ms=round(sum(latencies) / len(latencies), 3),
+        queries=max(query_counts), sql_ms=round(sql_seconds * 1000 / iterations, 3),
+        query_budget=API_QUERY_BUDGETS.get(scenario.name, {}).get(role),
+    )
+
+
+def run_api_benchmark(iterations=30, warmup=3, endpoints=None, roles=None):
+    """
+    Seçilen senaryo/rol çiftlerini ölçer ve JSON'a dönüştürülebilir bir sözlük döndürür:
+    {'meta': {...}, 'results': [...], 'budget_violations': [...]}.
+    """
+    if iterations < 1 or warmup < 0:
+        raise ValueError("iterations must be positive and warmup cannot be negative.")
+    users = get_role_users()
+    client = Client()
+    results = []
+    # Test client'ı 'testserver' host adıyla istek gönderir.
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for scenario in SCENARIOS:
+            if endpoints and scenario.name not in endpoints:
+                continue
+            for role in roles or ROLES:
+                token, _ = Token.objects.get_or_create(user=users[role])
+                results.append(run_scenario(client, scenario, role, token.key, iterations, warmup))
+
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'dataset': {
+                'parts': Part.objects.count(),
+                'aircraft': Aircraft.objects.count(),
+                'work_orders': WorkOrder.objects.count(),
+            },
+        },
+        'results': [asdict(result) for result in results],
+        'budget_violations': [
+            {'endpoint': result.endpoint, 'role': result.role, 'queries': result.queries, 'budget': result.query_budget}
+            for result in results if result.over_budget
+        ],
+    }
+
+
+def compare_results(baseline, current):
+    """
+    İki çalıştırmayı (endpoint, rol) bazında karşılaştırır:
+    [(endpoint, rol, eski p95, yeni p95, eski sorgu, yeni sorgu), ...]; yalnızca iki tarafta da olan satırlar.
+    """
+    previous = {(row['endpoint'], row['role']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        old = previous.get((row['endpoint'], row['role']))
+        if old:
+            rows.append((row['endpoint'], row['role'], old['p95_ms'], row['p95_ms'], old['queries'], row['queries']))
+    return rows
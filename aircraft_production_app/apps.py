@@ -6,4 +6,12 @@ class AircraftProductionAppConfig(AppConfig):
     name = 'aircraft_production_app'
 
     def ready(self):
-        import aircraft_production_app.signals # Sinyalleri import et
\ No newline at end of file
+        import aircraft_production_app.signals # Sinyalleri import et
+        import aircraft_production_app.checks # Çok süreçli dağıtım kontrollerini kaydet
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from .metrics import install_query_wrapper
+        connection_created.connect(install_query_wrapper, dispatch_uid='metrics_query_wrapper') # İstek başına SQL ölçümü
+        if getattr(settings, 'METRICS_ENABLED', True):
+            from .metrics import instrument_serializers
+            instrument_serializers() # Serializer süresi /metrics altında raporlanır
\ No newline at end of file
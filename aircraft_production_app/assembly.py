@@ -0,0 +1,111 @@
+# aircraft_production_app/assembly.py
+"""
+Bir iş emri için birden fazla hava aracının tek transaction içinde toplu montajı.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+
+from .counts import invalidate_counts_on_commit
+from .events import record_events
+from .inventory import pick_available_parts
+from .search import index_for_search
+from .models import (
+    Aircraft, AircraftStockLevel, Part, ProductionEvent, WorkOrder,
+    AircraftStatusChoices, ProductionEventTypeChoices, PartCategory, PartStatusChoices, WorkOrderStatusChoices,
+)
+
+
+def assemble_work_order_batch(work_order_id, count, assembling_team, personnel=None, allow_partial=True):
+    """
+    İş emri için `count` adet uçağı set bazlı olarak monte eder.
+
+    - 4 x count parça tek sorguda FIFO sırasıyla seçilir (bkz. inventory.pick_available_parts).
+    - Seri numaraları tek blok halinde ayrılır, uçaklar bulk_create ile yazılır,
+      parçalar tek UPDATE ile 'USED' yapılır ve iş emri sayacı/durumu en sonda bir kez güncellenir.
+    - Stok yetmezse monte edilebilen kadar uçak üretilir (allow_partial=False ise hiçbiri);
+      eksik kalan her birim için hangi kategorilerin eksik olduğu raporlanır.
+
+    Dönüş değeri: (iş emri, oluşturulan uçaklar, eksikler listesi)
+    Doğrulama hatalarında DjangoValidationError fırlatır.
+    """
+    with transaction.atomic():
+        try:
+            # Aynı iş emri için paralel toplu montajların hedef miktarı aşmaması için satır kilitlenir.
+            work_order = WorkOrder.objects.select_for_update().select_related('aircraft_model').get(pk=work_order_id)
+        except WorkOrder.DoesNotExist:
+            raise DjangoValidationError({'work_order_id': "Geçersiz İş Emri ID'si."})
+
+        if work_order.status in [WorkOrderStatusChoices.COMPLETED, WorkOrderStatusChoices.CANCELLED]:
+            raise DjangoValidationError({'work_order_id': "Bu iş emri tamamlanmış veya iptal edilmiş, yeni uçak monte edilemez."})
+        if work_order.assigned_to_assembly_team_id and work_order.assigned_to_assembly_team_id != assembling_team.pk:
+            raise DjangoValidationError({'work_order_id': "Bu iş emri başka bir montaj takımına atanmış."})
+
+        remaining = work_order.quantity - work_order.completed_count
+        if count > remaining:
+            raise DjangoValidationError({'count': f"İş emri için en fazla {remaining} adet uçak daha monte edilebilir."})
+
+        picked_parts = pick_available_parts(work_order.aircraft_model, quantity=count)
+        buildable = min(len(parts) for parts in picked_parts.values())
+
+        shortfalls = [
+            {
+                'unit': unit,
+                'missing_parts': [
+                    category.label for category, parts in picked_parts.items() if len(parts) < unit
+                ],
+            }
+            for unit in range(buildable + 1, count + 1)
+        ]
+        if buildable == 0 or (shortfalls and not allow_partial):
+            return work_order, [], shortfalls
+
+        aircrafts = [
+            Aircraft(
+                aircraft_model=work_order.aircraft_model,
+                assembled_by_team=assembling_team,
+                assembled_by_personnel=personnel,
+                work_order=work_order,
+                wing=picked_parts[PartCategory.WING][index],
+                fuselage=picked_parts[PartCategory.FUSELAGE][index],
+                tail=picked_parts[PartCategory.TAIL][index],
+                avionics=picked_parts[PartCategory.AVIONICS][index],
+            )
+            for index in range(buildable)
+        ]
+        Aircraft.allocate_serial_numbers(aircrafts)
+        Aircraft.objects.bulk_create(aircrafts)
+        for aircraft in aircrafts:
+            aircraft.snapshot_tracked_fields()
+        # bulk_create sinyal göndermez; uçak stok özetini tek seferde güncelle.
+        AircraftStockLevel.objects.apply_deltas({
+            (work_order.aircraft_model_id, assembling_team.pk, AircraftStatusChoices.ACTIVE.value): len(aircrafts)
+        })
+        invalidate_counts_on_commit(Aircraft)
+        index_for_search(Aircraft, aircrafts)
+        record_events(
+            ProductionEvent.for_instance(
+                aircraft, ProductionEventTypeChoices.AIRCRAFT_ASSEMBLED, status=aircraft.status, work_order_id=work_order.pk,
+                parts={slot: getattr(aircraft, f'{slot}_id') for slot in Aircraft.part_slot_fields}
+            )
+            for aircraft in aircrafts
+        )
+
+        used_part_ids = [part.pk for parts in picked_parts.values() for part in parts[:buildable]]
+        installations = {}
+        for aircraft in aircrafts:
+            installations.update(aircraft.get_installations())
+        marked_count = Part.objects.filter(pk__in=used_part_ids, status=PartStatusChoices.AVAILABLE).set_status(
+            PartStatusChoices.USED, installations=installations
+        )
+        if marked_count != len(used_part_ids):
+            raise DjangoValidationError("Seçilen parçalardan biri artık kullanıma hazır değil; toplu montaj iptal edildi.")
+        for parts in picked_parts.values():
+            for part in parts[:buildable]:
+                part.status = PartStatusChoices.USED
+                part.installed_in_id, part.installed_slot = installations[part.pk]
+                part.snapshot_tracked_fields()
+
+        # bulk_create sinyal göndermez; iş emri sayacı ve durumu tek UPDATE ile güncellenir.
+        work_order.apply_progress(buildable)
+
+    return work_order, aircrafts, shortfalls
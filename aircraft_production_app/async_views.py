@@ -0,0 +1,118 @@
+# aircraft_production_app/async_views.py
+"""
+Sık çağrılan salt okunur uç noktaların async karşılıkları; ASGI modunda aynı URL'lerden sunulur
+(bkz. aircraft_production_project/asgi_urls.py).
+
+- Yanıtlar DRF view'larıyla aynıdır: aynı serializer'lar, sayfalama zarfı, sayım stratejisi ve JSON renderer kullanılır.
+- Sorgular async ORM ile çalışır; token ve rol bağlamı süreç içi önbellekte bulunursa thread'e hiç geçilmez.
+- Kimlik doğrulama DRF ayarlarındaki gibi yalnızca token (Authorization: Token ...) ile yapılır.
+- Parça/uçak/iş emri listeleri DRF view'ları olarak kalır (filtre arka uçları ve sayfalama senkron çalışır);
+  ASGI altında Django bunları istek başına ayrı bir thread'de çalıştırır.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import CachingTokenAuthentication
+from .models import Personnel
+from .roles import abuild_role_context
+from .stock_levels import INVALID_STOCK_TYPE_MESSAGE, STOCK_TYPES, build_stock_levels_response, stock_level_querysets
+from .views import AircraftModelViewSet, PartTypeViewSet, current_user_payload
+
+ALLOWED_METHODS = ('GET', 'HEAD')
+
+_renderer = JSONRenderer()
+
+
+def render_json(data, status=200):
+    """DRF JSONRenderer ile aynı baytları üreten JSON yanıtı."""
+    return HttpResponse(_renderer.render(data), status=status, content_type='application/json')
+
+
+def async_api_view(view):
+    """
+    Async view'ı @api_view(['GET']) ve IsAuthenticated davranışıyla sarar: token doğrulaması, DRF biçiminde
+    401/405 yanıtları; view çağrılmadan önce request.user ve request.role_context atanır.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ALLOWED_METHODS:
+            response = render_json({'detail': exceptions.MethodNotAllowed(request.method).detail}, status=405)
+            response['Allow'] = ', '.join(ALLOWED_METHODS)
+            return response
+
+        authenticator = CachingTokenAuthentication()
+        try:
+            credentials = await authenticator.aauthenticate(request)
+            if credentials is None:
+                raise exceptions.NotAuthenticated()
+        except exceptions.APIException as exc:
+            response = render_json({'detail': exc.detail}, status=exc.status_code)
+            response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+            return response
+
+        request.user = credentials[0]
+        request.role_context = await abuild_role_context(request.user)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def _paginated_list(request, viewset_class):
+    """
+    ViewSet.list() karşılığı: filtre arka uçları ve serializer aynıdır, sayım view'ın sayfalama sınıfının
+    stratejisiyle (önbellek anahtarı senkron view ile ortak) yapılır; sayfa async ORM ile okunur.
+    """
+    view = viewset_class(action='list', format_kwarg=None, args=(), kwargs={})
+    view.request = Request(request)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    paginator = view.paginator
+    paginator.request, paginator.view = view.request, view
+    paginator.limit = paginator.get_limit(view.request)
+    paginator.offset = paginator.get_offset(view.request)
+    count = await sync_to_async(paginator.count_queryset)(queryset, view.request, view)
+    rows = []
+    if count and paginator.offset <= count:
+        rows = [row async for row in queryset[paginator.offset:paginator.offset + paginator.limit]]
+    data = view.get_serializer(rows, many=True).data
+    return render_json(paginator.get_paginated_response(data).data)
+
+
+@async_api_view
+async def current_user_info(request):
+    """views.current_user_info karşılığı; personel ve takımı tek sorguda okunur."""
+    user = request.user
+    personnel = await Personnel.objects.select_related('team').filter(user_id=user.pk).afirst()
+    if personnel is not None:
+        personnel.user = user  # Serializer'ın kullanıcı alanları için ek sorgu yapılmaz.
+    return render_json(current_user_payload(user, personnel))
+
+
+@async_api_view
+async def aircraft_model_list(request):
+    """AircraftModelViewSet.list karşılığı."""
+    return await _paginated_list(request, AircraftModelViewSet)
+
+
+@async_api_view
+async def part_type_list(request):
+    """PartTypeViewSet.list karşılığı."""
+    return await _paginated_list(request, PartTypeViewSet)
+
+
+@async_api_view
+async def stock_levels(request):
+    """views.StockLevelsAPIView karşılığı."""
+    stock_type = request.GET.get('stock_type')
+    if stock_type not in STOCK_TYPES:
+        return render_json({"error": INVALID_STOCK_TYPE_MESSAGE}, status=400)
+
+    querysets = stock_level_querysets(stock_type, request.role_context, request.GET)
+    results = None
+    if querysets is not None:
+        results = {name: [row async for row in queryset] for name, queryset in querysets.items()}
+    return render_json(build_stock_levels_response(stock_type, request.GET, results))
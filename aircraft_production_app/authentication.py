@@ -0,0 +1,149 @@
+# aircraft_production_app/authentication.py
+import copy
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+from .caching import LocalTTLCache
+from .roles import RoleContext, role_context_cache
+
+
+class RoleAwareTokenAuthentication(TokenAuthentication):
+    """
+    DRF TokenAuthentication ile aynı doğrulamayı yapar; token, kullanıcı, personel ve takım
+    tek bir select_related sorgusuyla okunur; rol bağlamı bu nesnelerden ek sorgu yapılmadan hazırlanır
+    (bkz. roles.get_role_context).
+    """
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user__personnel__team').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        # Rol bağlamı önbellekte yoksa zaten yüklenmiş personel/takım nesnelerinden sorgusuz oluşturulur.
+        if role_context_cache.get(token.user.pk) is None:
+            personnel = token.user.personnel if hasattr(token.user, 'personnel') else None
+            role_context_cache.set(token.user.pk, RoleContext.from_user(token.user, personnel))
+        return (token.user, token)
+
+
+token_cache = LocalTTLCache(
+    maxsize=getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 4096),
+    ttl=getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 300),
+)
+shared_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _shared_cache():
+    """TOKEN_AUTH_SHARED_CACHE ayarı bir önbellek adı içeriyorsa o önbelleği döndürür."""
+    alias = getattr(settings, 'TOKEN_AUTH_SHARED_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _shared_cache_key(key):
+    # Token değeri önbellek anahtarında açık halde tutulmaz.
+    return f"token-auth:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def evict_token(key):
+    """Token'ı süreç içi ve (varsa) paylaşılan önbellekten siler."""
+    token_cache.delete(key)
+    shared_cache = _shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(_shared_cache_key(key))
+
+
+def evict_user_tokens(user_id):
+    """Kullanıcıya ait tüm token'ları önbellekten siler."""
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        evict_token(key)
+
+
+def get_token_cache_stats():
+    """Token önbelleğinin isabet/ıska sayaçlarını döndürür."""
+    return {**token_cache.stats(), 'shared': dict(shared_cache_stats, enabled=_shared_cache() is not None)}
+
+
+class CachingTokenAuthentication(RoleAwareTokenAuthentication):
+    """
+    Token -> kullanıcı eşlemesini süreç içi TTL/LRU önbellekte (isteğe bağlı olarak paylaşılan önbellekte) tutar.
+    Önbellek isabetinde veritabanına gidilmez; rol bağlamı da önbellekteyse istek sıfır kimlik doğrulama sorgusuyla geçer.
+    Token silindiğinde veya kullanıcı değiştiğinde (örn. pasife alındığında) kayıt sinyallerle silinir.
+    """
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = self._load_entry(key)
+        return self._copy_entry(cached)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() karşılığı async view'lar için (bkz. async_views.py). Süreç içi önbellek isabetinde
+        thread'e geçilmez; ıskada paylaşılan önbellek ve veritabanı okuması thread'de yapılır.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain invalid characters.'))
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = await sync_to_async(self._load_entry)(key)
+        return self._copy_entry(cached)
+
+    def _load_entry(self, key):
+        cached = self._get_from_shared_cache(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cached = self._cache_entry(user, token)
+            token_cache.set(key, cached)
+            shared_cache = _shared_cache()
+            if shared_cache is not None:
+                shared_cache.set(_shared_cache_key(key), cached, token_cache.ttl)
+        return cached
+
+    @staticmethod
+    def _copy_entry(cached):
+        # Önbellekteki nesneler istekler arasında paylaşılmaması için kopyalanır.
+        user = copy.copy(cached[0])
+        token = copy.copy(cached[1])
+        token.user = user
+        return (user, token)
+
+    def _get_from_shared_cache(self, key):
+        shared_cache = _shared_cache()
+        if shared_cache is None:
+            return None
+        cached = shared_cache.get(_shared_cache_key(key))
+        if cached is None:
+            shared_cache_stats['misses'] += 1
+            return None
+        shared_cache_stats['hits'] += 1
+        token_cache.set(key, cached)
+        return cached
+
+    @staticmethod
+    def _cache_entry(user, token):
+        """
+        Önbelleğe yazılacak (kullanıcı, token) kopyalarını hazırlar.
+        Personel/takım ilişkileri tutulmaz; rol bağlamı kendi önbelleğinden okunur ve ayrı geçersiz kılınır.
+        """
+        user = copy.copy(user)
+        user._state.fields_cache = {}
+        token = copy.copy(token)
+        token._state.fields_cache = {}
+        return (user, token)
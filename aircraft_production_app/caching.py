@@ -0,0 +1,62 @@
+# aircraft_production_app/caching.py
+"""
+Süreç içi (process-local) önbellek yardımcıları.
+Paylaşılan önbelleğe (django.core.cache) gitmeye değmeyecek kadar sık okunan, küçük ve kısa ömürlü veriler içindir.
+"""
+from collections import OrderedDict
+import threading
+import time
+
+
+class LocalTTLCache:
+    """
+    En az kullanılanı çıkaran (LRU) ve her kaydı `ttl` saniye sonra geçersiz sayan, thread-safe sözlük önbelleği.
+    Her süreç kendi kopyasını tutar; başka süreçlerdeki geçersiz kılmalar en geç `ttl` sonunda yansır.
+    """
+    _missing = object()
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, self._missing)
+            if entry is self._missing:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """İsabet/ıska sayaçlarını ve doluluk bilgisini döndürür."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize, 'ttl': self.ttl}
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,37 @@
+# aircraft_production_app/checks.py
+"""
+Çok süreçli dağıtım için sistem kontrolleri (`manage.py check`, migrate ve runserver öncesinde çalışır).
+
+WEB_WORKERS > 1 iken süreç içi önbellek ve canlı olay yayını diğer worker'lara ulaşmaz: bir süreçte
+geçersiz kılınan sayım/istatistik diğerlerinde eski kalır, SSE istemcileri yalnızca bağlandıkları sürecin
+değişikliklerini görür.
+"""
+from django.conf import settings
+from django.core.checks import Error, register
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_multi_worker_settings(app_configs, **kwargs):
+    """Birden fazla worker'da paylaşılan önbellek ve postgres canlı olay arka ucu zorunludur."""
+    workers = getattr(settings, 'WEB_WORKERS', 1)
+    if workers <= 1:
+        return []
+    errors = []
+    if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+        errors.append(Error(
+            f"WEB_WORKERS={workers} requires a cache shared between processes.",
+            hint="Set CACHE_BACKEND=database (and run createcachetable) or WEB_WORKERS=1.",
+            id='aircraft_production_app.E001',
+        ))
+    if getattr(settings, 'LIVE_EVENTS_BACKEND', 'local') != 'postgres':
+        errors.append(Error(
+            f"WEB_WORKERS={workers} requires LIVE_EVENTS_BACKEND=postgres.",
+            hint="The local backend only delivers live events to clients connected to the same process.",
+            id='aircraft_production_app.E002',
+        ))
+    return errors
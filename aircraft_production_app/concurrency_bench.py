@@ -0,0 +1,178 @@
+# aircraft_production_app/concurrency_bench.py
+"""
+Çalışan bir sunucuya karşı eşzamanlı dashboard istemcisi yük testi (requests/sec ve gecikme yüzdelikleri).
+
+- Her istemci kalıcı (keep-alive) bir HTTP/1.1 bağlantısıyla dashboard'un açılışta yaptığı istekleri
+  (DASHBOARD_REQUESTS) sırayla ve bekleme yapmadan tekrarlar; istemciler rollere sırayla dağıtılır.
+- İstemci asyncio ile tek süreçte çalışır (ek bağımlılık yoktur); çok yüksek hızlarda istemcinin kendisi
+  darboğaz olabilir, bu yüzden sonuçlar aynı makinede WSGI ve ASGI modlarını karşılaştırmak için kullanılmalıdır.
+- Isınma süresinde başlayan istekler ölçüme katılmaz.
+"""
+import asyncio
+import platform
+import time
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+import django
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .api_bench import ROLES, get_role_users, percentile
+
+DASHBOARD_REQUESTS = (
+    ('user-me', '/api/user/me/'),
+    ('aircraft-models', '/api/aircraft-models/'),
+    ('part-types', '/api/part-types/'),
+    ('stock-levels-parts', '/api/inventory/stock-levels/?stock_type=parts&draw=1&start=0&length=-1'),
+    ('stock-levels-aircraft', '/api/inventory/stock-levels/?stock_type=aircrafts&draw=1&start=0&length=10'),
+    ('parts', '/api/parts/?draw=1&start=0&length=25'),
+    ('work-orders', '/api/work-orders/?draw=1&start=0&length=25'),
+)
+
+
+class HttpConnection:
+    """Tek bir keep-alive HTTP/1.1 bağlantısı; yalnızca GET ve Content-Length/chunked gövdeleri destekler."""
+
+    def __init__(self, host, port, headers):
+        self.host = host
+        self.port = port
+        self.headers = ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path):
+        """İsteği gönderir, gövdeyi okur ve (durum kodu, gövde boyutu) döndürür."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f'GET {path} HTTP/1.1\r\n{self.headers}\r\n'.encode())
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = 0
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+                if not chunk_size:
+                    break
+        else:
+            size = int(headers.get('content-length', 0))
+            await self.reader.readexactly(size)
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, size
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+@dataclass
+class EndpointResult:
+    endpoint: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+async def _run_client(connection, offset, measure_from, deadline, samples):
+    """
+    Süre dolana kadar dashboard isteklerini tekrarlar; ölçüm başladıktan sonraki istekleri kaydeder.
+    İstemciler sıraya farklı noktalardan başlar, böylece her an tüm uç noktalara yük düşer.
+    """
+    sequence = DASHBOARD_REQUESTS[offset:] + DASHBOARD_REQUESTS[:offset]
+    while True:
+        for name, path in sequence:
+            started = time.perf_counter()
+            if started >= deadline:
+                connection.close()
+                return
+            try:
+                status, _ = await connection.get(path)
+                failed = not 200 <= status < 300
+            except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+                connection.close()
+                failed = True
+            if started >= measure_from:
+                samples.append((name, (time.perf_counter() - started) * 1000, failed))
+
+
+async def _run_load(host, port, host_header, tokens, clients, duration, warmup):
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    samples = []
+    connections = [
+        HttpConnection(host, port, {'Host': host_header, 'Authorization': f'Token {tokens[index % len(tokens)]}'})
+        for index in range(clients)
+    ]
+    await asyncio.gather(*(
+        _run_client(connection, index % len(DASHBOARD_REQUESTS), measure_from, deadline, samples)
+        for index, connection in enumerate(connections)
+    ))
+    return samples
+
+
+def get_role_tokens(roles=None):
+    """Rol kullanıcılarının token'ları (bkz. api_bench.get_role_users); eksik rol varsa ValueError."""
+    users = get_role_users()
+    return [Token.objects.get_or_create(user=users[role])[0].key for role in roles or ROLES]
+
+
+def summarize(name, samples):
+    latencies = sorted(latency for _, latency, _ in samples)
+    return EndpointResult(
+        endpoint=name, requests=len(samples), errors=sum(1 for _, _, failed in samples if failed),
+        p50_ms=round(percentile(latencies, 50), 3), p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+    )
+
+
+def run_concurrency_benchmark(url, tokens, clients=200, duration=30.0, warmup=5.0):
+    """
+    `url` adresindeki sunucuya `clients` eşzamanlı dashboard istemcisiyle yük uygular ve JSON'a
+    dönüştürülebilir bir sözlük döndürür: {'meta': {...}, 'summary': {...}, 'endpoints': [...]}.
+    """
+    if clients < 1 or duration <= 0 or warmup < 0:
+        raise ValueError("clients and duration must be positive and warmup cannot be negative.")
+    if not tokens:
+        raise ValueError("At least one API token is required.")
+    parts = urlsplit(url)
+    if parts.scheme != 'http' or not parts.hostname:
+        raise ValueError(f"Only plain http:// URLs are supported, got {url!r}.")
+    port = parts.port or 80
+
+    samples = asyncio.run(_run_load(parts.hostname, port, parts.netloc, tokens, clients, duration, warmup))
+    if not samples:
+        raise ValueError("No requests completed; is the server running?")
+    summary = asdict(summarize('all', samples))
+    summary['requests_per_second'] = round(len(samples) / duration, 1)
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'url': url,
+            'clients': clients,
+            'duration': duration,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'summary': summary,
+        'endpoints': [
+            asdict(summarize(name, [sample for sample in samples if sample[0] == name]))
+            for name, _ in DASHBOARD_REQUESTS
+        ],
+    }
@@ -0,0 +1,111 @@
+# aircraft_production_app/counts.py
+"""
+DataTable yanıtlarındaki recordsTotal/recordsFiltered değerleri için kayıt sayma stratejileri.
+
+- exact: her istekte COUNT(*) çalıştırır.
+- cached: sonucu (view, kullanıcı kapsamı, filtre özeti) anahtarıyla TTL süresince önbellekte tutar.
+  Modelde yazma olduğunda model sürümü artırılır ve eski anahtarlar kendiliğinden geçersizleşir.
+- estimate: PostgreSQL planlayıcı tahminini (EXPLAIN) kullanır; tahmin eşik değerinin altındaysa
+  'cached' moduna düşer. Diğer veritabanlarında her zaman 'cached' kullanılır.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.cache import cache
+from django.db import connections, router, transaction
+
+COUNT_MODE_EXACT = 'exact'
+COUNT_MODE_CACHED = 'cached'
+COUNT_MODE_ESTIMATE = 'estimate'
+COUNT_MODES = (COUNT_MODE_EXACT, COUNT_MODE_CACHED, COUNT_MODE_ESTIMATE)
+
+
+def _version_key(model):
+    return f"datatable-count-version:{model._meta.label_lower}"
+
+
+def get_count_version(model):
+    """Modelin sayım önbelleği sürümünü döndürür."""
+    return cache.get_or_set(_version_key(model), 1, None)
+
+
+def invalidate_counts(*models):
+    """Verilen modeller için önbelleğe alınmış tüm sayımları geçersiz kılar (sürüm artırımı)."""
+    for model in models:
+        key = _version_key(model)
+        cache.add(key, 1, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Anahtar add ile incr arasında silinmişse yeniden oluştur.
+            cache.set(key, 2, None)
+
+
+def invalidate_counts_on_commit(*models):
+    """
+    Sayımları hemen ve transaction commit edildikten sonra tekrar geçersiz kılar.
+    İkinci artırım, commit öncesinde eski veriyle önbelleğe yazılmış sayımları da temizler.
+    """
+    invalidate_counts(*models)
+    transaction.on_commit(lambda: invalidate_counts(*models))
+
+
+def _compile(queryset):
+    """Sorgunun sırasız SQL metnini ve parametrelerini döndürür; sonuç kümesi kesin boşsa None döner."""
+    try:
+        return queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return None
+
+
+def cached_count(queryset, scope='', compiled=None):
+    """
+    Kayıt sayısını önbellekten döndürür, yoksa hesaplayıp saklar.
+    Kullanıcı kapsamı (takım filtresi vb.) sorgu metninin parçası olduğundan filtre özetine dahildir;
+    `scope` anahtarı yalnızca farklı view'ların aynı sorguyu paylaşmasını ayırır.
+    """
+    sql, params = compiled or _compile(queryset)
+    digest = hashlib.sha1(f"{sql}|{params!r}".encode()).hexdigest()
+    model = queryset.model
+    cache_key = f"datatable-count:{model._meta.label_lower}:v{get_count_version(model)}:{scope}:{digest}"
+    timeout = getattr(settings, 'DATATABLE_COUNT_CACHE_TIMEOUT', 30)
+    return cache.get_or_set(cache_key, queryset.count, timeout)
+
+
+def estimated_count(queryset, compiled=None):
+    """
+    PostgreSQL planlayıcısının satır tahminini döndürür (EXPLAIN, sorgu çalıştırılmaz).
+    Diğer veritabanlarında None döner.
+    """
+    connection = connections[router.db_for_read(queryset.model)]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = compiled or _compile(queryset)
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_count(queryset, mode=None, scope=''):
+    """
+    Seçilen stratejiye göre kayıt sayısını hesaplar.
+    Dönüş değeri: (sayı, sayıyı üreten mod)
+    """
+    mode = mode or getattr(settings, 'DATATABLE_COUNT_MODE', COUNT_MODE_CACHED)
+    compiled = _compile(queryset)
+    if compiled is None:
+        # queryset.none() veya boş bir __in filtresi: sorgu çalıştırmaya gerek yok.
+        return 0, COUNT_MODE_EXACT
+    if mode == COUNT_MODE_EXACT:
+        return queryset.count(), COUNT_MODE_EXACT
+    if mode == COUNT_MODE_ESTIMATE:
+        estimate = estimated_count(queryset, compiled)
+        threshold = getattr(settings, 'DATATABLE_COUNT_ESTIMATE_THRESHOLD', 100000)
+        if estimate is not None and estimate >= threshold:
+            return estimate, COUNT_MODE_ESTIMATE
+    return cached_count(queryset, scope, compiled), COUNT_MODE_CACHED
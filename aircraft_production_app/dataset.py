@@ -0,0 +1,482 @@
+# aircraft_production_app/dataset.py
+"""
+Yük testi ve benchmark ortamları için ölçeklenebilir sentetik üretim verisi.
+
+- Takımlar, personel, iş emirleri, uçaklar ve parçalar `seed` değerinden deterministik olarak planlanır;
+  aynı seed ve aynı başlangıç verisi, işçi (worker) sayısından bağımsız olarak aynı veri kümesini üretir.
+- Parça ve uçak birincil anahtarları ile seri numaraları baştan bloklar halinde ayrılır. Böylece parçalar
+  takıldıkları uçağın kimliğini (installed_in) ekleme anında bilir ve parçalar (chunk) ayrık kimlik/seri
+  aralıklarında birbirinden bağımsız, istenirse paralel süreçlerde yazılır.
+- Satırlar bulk_create ile yazılır; stok özet tabloları ve arama indeksi en sonda toplu olarak senkronize edilir.
+  Üretim olay günlüğü (ProductionEvent) doldurulmaz.
+"""
+import multiprocessing
+import random
+import time
+from array import array
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .counts import invalidate_counts
+from .models import (
+    Aircraft, AircraftModel, Part, PartType, Personnel, SerialSequence, Team, User, WorkOrder,
+    AIRCRAFT_SERIAL_DIGITS, PART_SERIAL_DIGITS, PART_TYPE_ABBREVIATIONS,
+    AircraftModelChoices, AircraftStatusChoices, DefinedTeamTypes, PartCategory, PartStatusChoices, WorkOrderStatusChoices,
+    max_serial_suffix,
+)
+from .search import SEARCH_INDEXES, get_search_backend, rebuild_search_index
+from .stock import sync_stock_levels
+
+# Dağılımlar: (değer, ağırlık)
+AIRCRAFT_MODEL_WEIGHTS = (
+    (AircraftModelChoices.TB2, 40), (AircraftModelChoices.AKINCI, 25),
+    (AircraftModelChoices.TB3, 20), (AircraftModelChoices.KIZILELMA, 15),
+)
+AIRCRAFT_STATUS_WEIGHTS = (
+    (AircraftStatusChoices.ACTIVE, 70), (AircraftStatusChoices.SOLD, 20),
+    (AircraftStatusChoices.MAINTENANCE, 5), (AircraftStatusChoices.RECYCLED, 5),
+)
+LOOSE_PART_STATUS_WEIGHTS = ((PartStatusChoices.AVAILABLE, 80), (PartStatusChoices.RECYCLED, 20))
+CATEGORY_TEAM_TYPES = {
+    PartCategory.WING: DefinedTeamTypes.WING_TEAM,
+    PartCategory.FUSELAGE: DefinedTeamTypes.FUSELAGE_TEAM,
+    PartCategory.TAIL: DefinedTeamTypes.TAIL_TEAM,
+    PartCategory.AVIONICS: DefinedTeamTypes.AVIONICS_TEAM,
+}
+SLOT_CATEGORIES = tuple((slot, PartCategory(slot.upper())) for slot in Aircraft.part_slot_fields)
+ASSEMBLY_TEAM_RATIO = 0.2
+WORK_ORDER_LINK_RATIO = 0.6  # Bir iş emrine bağlı monte edilen uçak oranı
+WORK_ORDER_CANCEL_RATIO = 0.03
+WORK_ORDER_UNASSIGNED_RATIO = 0.15
+MAX_WORK_ORDER_QUANTITY = 20
+MAX_PART_AGE_BEFORE_ASSEMBLY_DAYS = 10
+
+
+@dataclass
+class DatasetSpec:
+    """Üretilecek veri kümesinin ölçeği ve parametreleri."""
+    parts: int = 10000
+    aircraft: int = 1000
+    work_orders: int = 100
+    teams: int = 20
+    members_per_team: int = 5
+    days: int = 365
+    seed: int = 42
+    chunk_size: int = 5000
+    workers: int = 1
+    password: str = None
+    build_search_index: bool = True
+
+
+@dataclass
+class DatasetReport:
+    """Aşama başına yazılan satır sayısı ve süre: {aşama: [satır, saniye]}."""
+    phases: dict = field(default_factory=dict)
+
+    def add(self, phase, rows, seconds):
+        entry = self.phases.setdefault(phase, [0, 0.0])
+        entry[0] += rows
+        entry[1] += seconds
+
+    @property
+    def total_rows(self):
+        return sum(rows for rows, _ in self.phases.values())
+
+    @property
+    def total_seconds(self):
+        return sum(seconds for _, seconds in self.phases.values())
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """auto_now/auto_now_add alanlarını geçici olarak kapatır; planlanan tarihler olduğu gibi yazılır."""
+    toggled = []
+    for model in models:
+        for model_field in model._meta.concrete_fields:
+            flags = {name: getattr(model_field, name) for name in ('auto_now', 'auto_now_add') if getattr(model_field, name, False)}
+            if flags:
+                toggled.append((model_field, flags))
+                for name in flags:
+                    setattr(model_field, name, False)
+    try:
+        yield
+    finally:
+        for model_field, flags in toggled:
+            for name, value in flags.items():
+                setattr(model_field, name, value)
+
+
+def _weighted(rng, weighted_values, k):
+    values, weights = zip(*weighted_values)
+    indexes = rng.choices(range(len(values)), weights=weights, k=k)
+    return array('B', indexes), values
+
+
+class DatasetPlan:
+    """
+    Ana süreçte hazırlanan plan: satır başına seçimler kompakt dizilerde tutulur, kimlik ve seri numarası
+    blokları ayrılır ve parçalara (chunk) bölünür. İşçi süreçler yalnızca planı satırlara dönüştürür.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.now = timezone.now()
+        self.rng = random.Random(spec.seed)
+        self.model_ids = dict(AircraftModel.objects.values_list('name', 'pk'))
+        self.part_type_ids = dict(PartType.objects.values_list('category', 'pk'))
+        missing = [name for name, _ in AIRCRAFT_MODEL_WEIGHTS if name not in self.model_ids]
+        missing += [category for category in PartCategory.values if category not in self.part_type_ids]
+        if missing:
+            raise ValueError(f"Missing aircraft models or part types: {', '.join(missing)}. Run the migrations first.")
+
+    # --- Takımlar ve personel ---
+    def team_layout(self):
+        """[(takım tipi, sıra), ...]; takımların ~%20'si montaj, kalanı parça kategorilerine eşit dağıtılır."""
+        spec = self.spec
+        assembly_count = max(1, round(spec.teams * ASSEMBLY_TEAM_RATIO))
+        production_types = list(CATEGORY_TEAM_TYPES.values())
+        layout = [(DefinedTeamTypes.ASSEMBLY_TEAM, index) for index in range(assembly_count)]
+        for index in range(spec.teams - assembly_count):
+            layout.append((production_types[index % len(production_types)], index // len(production_types)))
+        return layout
+
+    # --- Uçaklar ve iş emirleri ---
+    def plan_work_orders_and_aircraft(self):
+        """Montaj takımları, takım listesindeki sıralarıyla (assembly_team_ids indeksi) planlanır."""
+        spec, rng = self.spec, self.rng
+        assembly_team_count = sum(1 for team_type, _ in self.team_layout() if team_type == DefinedTeamTypes.ASSEMBLY_TEAM)
+        model_names = [name for name, _ in AIRCRAFT_MODEL_WEIGHTS]
+
+        work_orders = []
+        queues = {index: deque() for index in range(len(model_names))}
+        wo_models, _ = _weighted(rng, AIRCRAFT_MODEL_WEIGHTS, spec.work_orders)
+        for index in range(spec.work_orders):
+            cancelled = rng.random() < WORK_ORDER_CANCEL_RATIO
+            team = None if rng.random() < WORK_ORDER_UNASSIGNED_RATIO else rng.randrange(assembly_team_count)
+            created_offset = rng.triangular(0, spec.days, 0)
+            work_order = {
+                'model': wo_models[index], 'quantity': rng.randint(1, MAX_WORK_ORDER_QUANTITY), 'team': team,
+                'cancelled': cancelled, 'created_offset': created_offset, 'completed': 0,
+                'target_days': rng.randint(14, 120),
+            }
+            work_orders.append(work_order)
+            if not cancelled:
+                queues[wo_models[index]].append(index)
+
+        self.aircraft_models, _ = _weighted(rng, AIRCRAFT_MODEL_WEIGHTS, spec.aircraft)
+        self.aircraft_statuses, self.aircraft_status_values = _weighted(rng, AIRCRAFT_STATUS_WEIGHTS, spec.aircraft)
+        self.aircraft_work_orders = array('l', [-1]) * spec.aircraft
+        self.aircraft_teams = array('l', [0]) * spec.aircraft
+        self.aircraft_offsets = array('f', [0.0]) * spec.aircraft
+        for index in range(spec.aircraft):
+            offset = rng.triangular(0, spec.days, 0)
+            team = rng.randrange(assembly_team_count)
+            queue = queues[self.aircraft_models[index]]
+            if queue and rng.random() < WORK_ORDER_LINK_RATIO:
+                wo_index = queue[0]
+                work_order = work_orders[wo_index]
+                work_order['completed'] += 1
+                if work_order['completed'] >= work_order['quantity']:
+                    queue.popleft()
+                self.aircraft_work_orders[index] = wo_index
+                team = team if work_order['team'] is None else work_order['team']
+                # İş emri oluşturulmadan önce monte edilmiş olamaz.
+                offset = min(offset, work_order['created_offset'])
+            self.aircraft_teams[index] = team
+            self.aircraft_offsets[index] = offset
+        self.work_orders = work_orders
+        self.model_names = model_names
+
+        recycled_index = self.aircraft_status_values.index(AircraftStatusChoices.RECYCLED)
+        self.installed_aircraft = sum(1 for status in self.aircraft_statuses if status != recycled_index)
+        self.loose_parts = spec.parts - 4 * self.installed_aircraft
+        if self.loose_parts < 0:
+            raise ValueError(
+                f"{spec.aircraft} aircraft need {4 * self.installed_aircraft} installed parts but only {spec.parts} parts were requested."
+            )
+        self.loose_models, _ = _weighted(rng, AIRCRAFT_MODEL_WEIGHTS, self.loose_parts)
+        self.loose_categories = array('B', rng.choices(range(len(SLOT_CATEGORIES)), k=self.loose_parts))
+        self.loose_statuses, self.loose_status_values = _weighted(rng, LOOSE_PART_STATUS_WEIGHTS, self.loose_parts)
+
+    @staticmethod
+    def work_order_status(work_order):
+        """models.WorkOrderManager.progress_status_expression ile aynı kural."""
+        if work_order['cancelled']:
+            return WorkOrderStatusChoices.CANCELLED
+        if work_order['completed'] >= work_order['quantity']:
+            return WorkOrderStatusChoices.COMPLETED
+        if work_order['completed']:
+            return WorkOrderStatusChoices.IN_PROGRESS
+        if work_order['team'] is not None:
+            return WorkOrderStatusChoices.ASSIGNED
+        return WorkOrderStatusChoices.PENDING
+
+    # --- Seri numarası ve kimlik blokları ---
+    def part_prefix(self, model_index, category):
+        return f"{self.model_names[model_index]}-{PART_TYPE_ABBREVIATIONS[category]}-"
+
+    def aircraft_prefix(self, model_index):
+        return f"{self.model_names[model_index]}-"
+
+    def build_tasks(self):
+        """
+        Uçak ve parça parçalarını (chunk) kimlik ve seri numarası başlangıçlarıyla birlikte hazırlar.
+        Her ön ek için gereken toplam blok SerialSequence üzerinden tek seferde ayrılır.
+        """
+        spec = self.spec
+        recycled_index = self.aircraft_status_values.index(AircraftStatusChoices.RECYCLED)
+        chunk_counts = []
+        totals = Counter()
+        for start in range(0, spec.aircraft, spec.chunk_size):
+            counts = Counter()
+            for index in range(start, min(start + spec.chunk_size, spec.aircraft)):
+                model_index = self.aircraft_models[index]
+                counts[self.aircraft_prefix(model_index)] += 1
+                if self.aircraft_statuses[index] != recycled_index:
+                    for _, category in SLOT_CATEGORIES:
+                        counts[self.part_prefix(model_index, category)] += 1
+            chunk_counts.append(('aircraft', start, min(start + spec.chunk_size, spec.aircraft), counts))
+            totals.update(counts)
+        for start in range(0, self.loose_parts, spec.chunk_size):
+            counts = Counter(
+                self.part_prefix(self.loose_models[index], SLOT_CATEGORIES[self.loose_categories[index]][1])
+                for index in range(start, min(start + spec.chunk_size, self.loose_parts))
+            )
+            chunk_counts.append(('parts', start, min(start + spec.chunk_size, self.loose_parts), counts))
+            totals.update(counts)
+
+        next_serials = {}
+        with transaction.atomic():
+            for prefix, count in sorted(totals.items()):
+                queryset = Aircraft.objects.all() if prefix.count('-') == 1 else Part.objects.all()
+                next_serials[prefix] = SerialSequence.objects.reserve(
+                    prefix, count=count, seed=lambda queryset=queryset, prefix=prefix: max_serial_suffix(queryset, prefix)
+                )
+
+        self.aircraft_id_base = (Aircraft.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+        next_part_id = (Part.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+        tasks = []
+        for kind, start, stop, counts in chunk_counts:
+            part_count = sum(count for prefix, count in counts.items() if prefix.count('-') == 2)
+            tasks.append((kind, start, stop, next_part_id, {prefix: next_serials[prefix] for prefix in counts}))
+            next_part_id += part_count
+            for prefix, count in counts.items():
+                next_serials[prefix] += count
+        return tasks
+
+    # --- Satır üretimi (işçi süreçlerde de çalışır) ---
+    def moment(self, offset_days):
+        return self.now - timedelta(days=offset_days)
+
+    def make_part(self, rng, part_id, serial_number, model_index, category, status, produced_at, installed_in_id=None, slot=''):
+        team_id = rng.choice(self.producer_teams[category])
+        return Part(
+            pk=part_id, serial_number=serial_number, part_type_id=self.part_type_ids[category],
+            aircraft_model_compatibility_id=self.model_ids[self.model_names[model_index]],
+            produced_by_team_id=team_id, created_by_personnel_id=rng.choice(self.team_members[team_id]),
+            production_date=produced_at, updated_at=produced_at, status=status,
+            installed_in_id=installed_in_id, installed_slot=slot,
+        )
+
+    def materialize(self, task):
+        """Bir parçanın (chunk) satırlarını oluşturur ve tek transaction'da yazar. Dönüş: (tür, yazılan satır)."""
+        kind, start, stop, next_part_id, next_serials = task
+        next_serials = dict(next_serials)
+        rng = random.Random(f"{self.spec.seed}:{kind}:{start}")
+
+        def take_serial(prefix, digits):
+            value = next_serials[prefix]
+            next_serials[prefix] = value + 1
+            return f"{prefix}{value:0{digits}d}"
+
+        parts = []
+        aircrafts = []
+        if kind == 'aircraft':
+            for index in range(start, stop):
+                model_index = self.aircraft_models[index]
+                status = self.aircraft_status_values[self.aircraft_statuses[index]]
+                aircraft_id = self.aircraft_id_base + index
+                assembled_at = self.moment(self.aircraft_offsets[index])
+                team_id = self.assembly_team_ids[self.aircraft_teams[index]]
+                wo_index = self.aircraft_work_orders[index]
+                slots = {}
+                if status != AircraftStatusChoices.RECYCLED:
+                    for slot, category in SLOT_CATEGORIES:
+                        produced_at = assembled_at - timedelta(days=rng.uniform(0, MAX_PART_AGE_BEFORE_ASSEMBLY_DAYS))
+                        parts.append(self.make_part(
+                            rng, next_part_id, take_serial(self.part_prefix(model_index, category), PART_SERIAL_DIGITS),
+                            model_index, category, PartStatusChoices.USED, produced_at, aircraft_id, slot,
+                        ))
+                        slots[f'{slot}_id'] = next_part_id
+                        next_part_id += 1
+                aircrafts.append(Aircraft(
+                    pk=aircraft_id, serial_number=take_serial(self.aircraft_prefix(model_index), AIRCRAFT_SERIAL_DIGITS),
+                    aircraft_model_id=self.model_ids[self.model_names[model_index]], status=status,
+                    assembly_date=assembled_at, updated_at=assembled_at, assembled_by_team_id=team_id,
+                    assembled_by_personnel_id=rng.choice(self.team_members[team_id]),
+                    work_order_id=self.work_order_ids[wo_index] if wo_index >= 0 else None, **slots,
+                ))
+        else:
+            for index in range(start, stop):
+                model_index = self.loose_models[index]
+                category = SLOT_CATEGORIES[self.loose_categories[index]][1]
+                parts.append(self.make_part(
+                    rng, next_part_id, take_serial(self.part_prefix(model_index, category), PART_SERIAL_DIGITS),
+                    model_index, category, self.loose_status_values[self.loose_statuses[index]],
+                    self.moment(rng.triangular(0, self.spec.days, 0)),
+                ))
+                next_part_id += 1
+
+        # Parçalar henüz yazılmamış uçakları gösterir; FK kısıtları transaction sonunda denetlenir.
+        with transaction.atomic():
+            Part.objects.bulk_create(parts, batch_size=self.spec.chunk_size)
+            Aircraft.objects.bulk_create(aircrafts, batch_size=self.spec.chunk_size)
+        return kind, len(parts), len(aircrafts)
+
+
+# İşçi süreçler planı fork ile devralır.
+_active_plan = None
+
+
+def _materialize_in_worker(task):
+    return _active_plan.materialize(task)
+
+
+def _close_connections():
+    connections.close_all()
+
+
+def _timed(report, phase, function, *args):
+    started = time.perf_counter()
+    rows = function(*args)
+    report.add(phase, rows, time.perf_counter() - started)
+    return rows
+
+
+def generate_production_dataset(spec, progress=None):
+    """
+    Veri kümesini üretir ve DatasetReport döndürür. `progress(mesaj)` verilirse ilerleme bildirilir.
+    Geçersiz parametrelerde ValueError fırlatır.
+    """
+    global _active_plan
+    if spec.teams < len(CATEGORY_TEAM_TYPES) + 1:
+        raise ValueError(f"At least {len(CATEGORY_TEAM_TYPES) + 1} teams are needed (one assembly team and one per part category).")
+    if min(spec.members_per_team, spec.days, spec.chunk_size, spec.workers) < 1 or min(spec.parts, spec.aircraft, spec.work_orders) < 0:
+        raise ValueError("Scale parameters must be positive.")
+    team_prefix = f"GEN{spec.seed}-"
+    if Team.objects.filter(name__startswith=team_prefix).exists():
+        raise ValueError(f"A dataset with seed {spec.seed} already exists; use another --seed.")
+
+    progress = progress or (lambda message: None)
+    report = DatasetReport()
+    plan = DatasetPlan(spec)
+
+    with explicit_timestamps(Part, Aircraft, WorkOrder):
+        # Takımlar, kullanıcılar ve personel
+        def create_teams():
+            password = make_password(spec.password)
+            with transaction.atomic():
+                teams = Team.objects.bulk_create([
+                    Team(name=f"{team_prefix}{team_type}-{index + 1:04d}", team_type=team_type)
+                    for team_type, index in plan.team_layout()
+                ])
+                users = User.objects.bulk_create([
+                    User(username=f"gen{spec.seed}_{team.pk}_{member + 1:02d}", password=password)
+                    for team in teams for member in range(spec.members_per_team)
+                ], batch_size=spec.chunk_size)
+                users_iter = iter(users)
+                personnel = [
+                    Personnel(user_id=next(users_iter).pk, team_id=team.pk)
+                    for team in teams for _ in range(spec.members_per_team)
+                ]
+                Personnel.objects.bulk_create(personnel, batch_size=spec.chunk_size)
+            plan.team_members = {}
+            for person in personnel:
+                plan.team_members.setdefault(person.team_id, []).append(person.user_id)
+            plan.assembly_team_ids = [team.pk for team in teams if team.team_type == DefinedTeamTypes.ASSEMBLY_TEAM]
+            plan.producer_teams = {
+                category: [team.pk for team in teams if team.team_type == team_type]
+                for category, team_type in CATEGORY_TEAM_TYPES.items()
+            }
+            return len(teams) + len(users) + len(personnel)
+
+        # Geçersiz ölçekler (ör. uçaklar için yetersiz parça) hiçbir satır yazılmadan reddedilir.
+        progress("Planning work orders and aircraft...")
+        plan.plan_work_orders_and_aircraft()
+
+        progress("Creating teams and personnel...")
+        _timed(report, 'teams', create_teams)
+
+        def create_work_orders():
+            work_orders = []
+            for work_order in plan.work_orders:
+                created_at = plan.moment(work_order['created_offset'])
+                work_orders.append(WorkOrder(
+                    aircraft_model_id=plan.model_ids[plan.model_names[work_order['model']]],
+                    quantity=work_order['quantity'], status=plan.work_order_status(work_order),
+                    completed_count=0 if work_order['cancelled'] else work_order['completed'],
+                    assigned_to_assembly_team_id=None if work_order['team'] is None else plan.assembly_team_ids[work_order['team']],
+                    created_at=created_at, updated_at=created_at,
+                    target_completion_date=(created_at + timedelta(days=work_order['target_days'])).date(),
+                ))
+            with transaction.atomic():
+                WorkOrder.objects.bulk_create(work_orders, batch_size=spec.chunk_size)
+            plan.work_order_ids = [work_order.pk for work_order in work_orders]
+            return len(work_orders)
+
+        progress(f"Creating {spec.work_orders} work orders...")
+        _timed(report, 'work_orders', create_work_orders)
+
+        tasks = plan.build_tasks()
+        workers = spec.workers
+        if workers > 1 and (connection.vendor == 'sqlite' or 'fork' not in multiprocessing.get_all_start_methods()):
+            progress("Parallel workers need PostgreSQL and fork(); continuing with a single process.")
+            workers = 1
+
+        progress(f"Writing {spec.aircraft} aircraft and {spec.parts} parts in {len(tasks)} chunks with {workers} worker(s)...")
+        started = time.perf_counter()
+        if workers == 1:
+            results = map(plan.materialize, tasks)
+        else:
+            _active_plan = plan
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(workers, initializer=_close_connections)
+            results = pool.imap_unordered(_materialize_in_worker, tasks)
+        try:
+            part_rows = aircraft_rows = 0
+            for done, (_, written_parts, written_aircraft) in enumerate(results, start=1):
+                part_rows += written_parts
+                aircraft_rows += written_aircraft
+                if done % 20 == 0 or done == len(tasks):
+                    progress(f"  {done}/{len(tasks)} chunks, {part_rows} parts, {aircraft_rows} aircraft")
+        finally:
+            if workers > 1:
+                pool.close()
+                pool.join()
+                _active_plan = None
+        seconds = time.perf_counter() - started
+        report.add('parts', part_rows, seconds * part_rows / max(part_rows + aircraft_rows, 1))
+        report.add('aircraft', aircraft_rows, seconds * aircraft_rows / max(part_rows + aircraft_rows, 1))
+
+    # Açık kimliklerle yazıldığı için PostgreSQL dizileri ilerletilir.
+    with connection.cursor() as cursor:
+        for statement in connection.ops.sequence_reset_sql(no_style(), [Part, Aircraft]):
+            cursor.execute(statement)
+
+    progress("Synchronising stock level tables...")
+    _timed(report, 'stock_levels', lambda: sum(len(rows) for rows in sync_stock_levels(repair=True).values()))
+    if spec.build_search_index:
+        for model in SEARCH_INDEXES:
+            if get_search_backend(model).maintains_index:
+                progress(f"Rebuilding the {model._meta.verbose_name} search index...")
+                _timed(report, f'search_index:{model._meta.model_name}', rebuild_search_index, model)
+    invalidate_counts(Part, Aircraft, WorkOrder, Team, Personnel, User)
+    return report
@@ -0,0 +1,82 @@
+# aircraft_production_app/events.py
+"""
+Üretim olay günlüğü (ProductionEvent) için tamponlu yazıcı.
+
+Olaylar transaction içinde, açık savepoint yığını başına bir tamponda biriktirilir ve transaction commit
+edildiğinde tampon başına tek bir bulk_create ile yazılır. Tamponu yalnızca kendi on_commit geri çağrısı güçlü
+olarak tutar: Django geri alınan transaction'ın veya savepoint'in geri çağrılarını attığında tampon da
+(bekleyen olaylarıyla) bırakılır, böylece geri alınan değişikliklerin olayları yazılmaz. Transaction dışında
+kaydedilen olaylar hemen yazılır. Yazılan olaylar canlı olay kanalına da özet olarak yayınlanır (bkz. live.py).
+Modeller bu modülü import ettiğinden model sınıfı geç yüklenir.
+"""
+import weakref
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .counts import invalidate_counts
+from .live import publish_production_events
+
+EVENT_BATCH_SIZE = 500
+
+
+class EventBuffer:
+    """Bir bağlantının, aynı savepoint yığını altında kaydedilip commit bekleyen olayları."""
+
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.key = key
+        self.events = []
+
+    def flush(self):
+        buffers = self.connection.production_event_buffers
+        if buffers.get(self.key) is self:
+            del buffers[self.key]
+        events, self.events = self.events, []
+        write_events(events, using=self.connection.alias)
+
+
+def write_events(events, using=DEFAULT_DB_ALIAS):
+    """Olayları tamponlamadan toplu olarak yazar."""
+    if not events:
+        return
+    model = apps.get_model('aircraft_production_app', 'ProductionEvent')
+    model.objects.using(using).bulk_create(events, batch_size=EVENT_BATCH_SIZE)
+    invalidate_counts(model)
+    # Olaylar yalnızca commit sonrasında (veya transaction dışında) yazıldığı için burada yayınlanabilir.
+    publish_production_events(events, using=using)
+
+
+def _pending_buffer(connection):
+    """
+    Bağlantının açık savepoint yığınına (connection.savepoint_ids) ait tamponu döndürür; yoksa açar ve
+    yazma işini on_commit'e kaydeder. Tamponlar zayıf referansla tutulur; geri alma sonrası kaybolurlar.
+    """
+    buffers = getattr(connection, 'production_event_buffers', None)
+    if buffers is None:
+        buffers = connection.production_event_buffers = weakref.WeakValueDictionary()
+    key = tuple(connection.savepoint_ids)
+    buffer = buffers.get(key)
+    if buffer is None:
+        buffer = buffers[key] = EventBuffer(connection, key)
+        transaction.on_commit(buffer.flush, using=connection.alias)
+    return buffer
+
+
+def record_events(events, using=DEFAULT_DB_ALIAS):
+    """
+    ProductionEvent nesnelerini (kaydedilmemiş) günlüğe ekler.
+    Açık bir transaction varsa commit anında toplu yazılır, yoksa hemen yazılır.
+    """
+    events = list(events)
+    if not events:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        write_events(events, using=using)
+        return
+    _pending_buffer(connection).events.extend(events)
+
+
+def record_event(event, using=DEFAULT_DB_ALIAS):
+    record_events([event], using=using)
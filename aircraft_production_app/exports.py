@@ -0,0 +1,116 @@
+# aircraft_production_app/exports.py
+"""
+Liste uç noktaları için akış (streaming) halinde CSV / NDJSON dışa aktarımı.
+
+Satırlar .values_list() üzerinden .iterator(chunk_size=...) ile okunur (PostgreSQL'de sunucu tarafı imleç);
+model nesnesi ve serializer oluşturulmaz, bellek kullanımı dışa aktarılan kayıt sayısından bağımsızdır.
+Filtreler, arama, sıralama ve rol kapsamı view'ın filter_queryset(get_queryset()) zincirinden gelir.
+ASGI altında gövde async üretilir: Django senkron iteratörleri ASGI'de tamamını belleğe alarak tükettiğinden
+satırlar imleçten EXPORT_CHUNK_SIZE'lık dilimler halinde isteğin thread'inde okunur.
+"""
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.decorators import action
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _EchoBuffer:
+    """csv.writer'ın yazdığı satırı tutmadan geri döndüren sahte dosya nesnesi."""
+    def write(self, value):
+        return value
+
+
+# Excel/LibreOffice bu karakterlerle başlayan hücreleri formül olarak çalıştırır (CSV injection).
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value  # Hücre metin olarak açılır.
+    return value
+
+
+def csv_renderer(headers):
+    """(başlık metni, satır -> metin) çifti döndürür."""
+    writer = csv.writer(_EchoBuffer())
+    # Excel'in UTF-8 olarak açması için BOM ile başlanır.
+    return '\ufeff' + writer.writerow(headers), lambda row: writer.writerow([_csv_value(value) for value in row])
+
+
+def ndjson_renderer(headers):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    return '', lambda row: encoder.encode(dict(zip(headers, row))) + '\n'
+
+
+EXPORT_RENDERERS = {'csv': csv_renderer, 'ndjson': ndjson_renderer}
+
+
+def iter_export(renderer, headers, rows):
+    header, render_row = renderer(headers)
+    if header:
+        yield header
+    for row in rows:
+        yield render_row(row)
+
+
+async def aiter_export(renderer, headers, rows):
+    """
+    iter_export'un async karşılığı. `rows` iteratörü her dilimde sync_to_async ile (isteğin thread'inde, aynı
+    bağlantı ve imleçle) ilerletilir; bellekte en fazla bir dilim tutulur.
+    """
+    header, render_row = renderer(headers)
+    if header:
+        yield header
+    take_chunk = sync_to_async(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)))
+    while chunk := await take_chunk():
+        yield ''.join(render_row(row) for row in chunk)
+
+
+def stream_export(queryset, columns, export_format, filename, asynchronous=False):
+    """
+    `columns` [(başlık, values alan yolu), ...] listesindeki alanları akış halinde dışa aktaran yanıtı döndürür.
+    `asynchronous` ASGI isteklerinde True verilir; gövde async iteratörle üretilir.
+    """
+    headers = [header for header, _ in columns]
+    rows = queryset.values_list(*[field_path for _, field_path in columns]).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    render = aiter_export if asynchronous else iter_export
+    content = render(EXPORT_RENDERERS[export_format], headers, rows)
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"'
+    return response
+
+
+class StreamingExportMixin:
+    """
+    ViewSet'lere GET <liste>/export/?export_format=csv|ndjson uç noktasını ekler.
+    `export_columns` dışa aktarılacak sütunları, `export_filename` dosya adı ön ekini belirler.
+    Liste ile aynı filtre parametreleri kullanılır; sayfalama uygulanmaz.
+    """
+    export_columns = ()
+    export_filename = 'export'
+    export_format_query_param = 'export_format'
+
+    @action(detail=False, methods=['get'], url_path='export', pagination_class=None)
+    def export(self, request):
+        export_format = request.query_params.get(self.export_format_query_param, 'csv')
+        if export_format not in EXPORT_FORMATS:
+            raise serializers.ValidationError({self.export_format_query_param: f"Desteklenen biçimler: {', '.join(EXPORT_FORMATS)}."})
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(
+            queryset, self.export_columns, export_format, self.export_filename,
+            asynchronous=isinstance(request._request, ASGIRequest),
+        )
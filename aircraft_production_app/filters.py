@@ -1,6 +1,18 @@
 # aircraft_production_app/filters.py
 import django_filters
-from .models import WorkOrder, AircraftModel, Team, User, WorkOrderStatusChoices, DefinedTeamTypes, Part, PartType, PartStatusChoices, PartCategory, Aircraft, AircraftStatusChoices
+from django_filters.constants import EMPTY_VALUES
+from .search import search_q
+from .models import ProductionEvent, EventEntityChoices, ProductionEventTypeChoices, WorkOrder, AircraftModel, Team, User, WorkOrderStatusChoices, DefinedTeamTypes, Part, PartType, PartStatusChoices, PartCategory, Aircraft, AircraftStatusChoices
+
+class IndexedContainsFilter(django_filters.CharFilter):
+    """
+    'içerir' aramasını search.search_q ile yapar: seri numarası/not alanları indeksli aramaya,
+    ilişkili küçük tablolardaki alanlar JOIN yerine alt sorguya dönüştürülür.
+    """
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return qs.filter(search_q(qs.model, self.field_name, value.strip()))
 
 class StatusInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
     """Statü değerlerini virgüllerle ayrılmış biçimde filtrelemek için özel sınıf."""
@@ -19,9 +31,9 @@ class WorkOrderFilter(django_filters.FilterSet):
     )
     created_by = django_filters.ModelChoiceFilter(queryset=User.objects.filter(is_staff=True)) # Sadece staff kullanıcılar
 
-    aircraft_model_name = django_filters.CharFilter(field_name='aircraft_model__name', lookup_expr='icontains')
-    assigned_to_assembly_team_name = django_filters.CharFilter(field_name='assigned_to_assembly_team__name', lookup_expr='icontains')
-    created_by_username = django_filters.CharFilter(field_name='created_by__username', lookup_expr='icontains')
+    aircraft_model_name = IndexedContainsFilter(field_name='aircraft_model__name')
+    assigned_to_assembly_team_name = IndexedContainsFilter(field_name='assigned_to_assembly_team__name')
+    created_by_username = IndexedContainsFilter(field_name='created_by__username')
     
     created_at_after = django_filters.DateFilter(field_name='created_at', lookup_expr='date__gte')
     created_at_before = django_filters.DateFilter(field_name='created_at', lookup_expr='date__lte')
@@ -61,11 +73,11 @@ class PartFilter(django_filters.FilterSet):
         label='Üreten Takım'
     )
 
-    part_type_category_name = django_filters.CharFilter(field_name='part_type__category', lookup_expr='icontains', label='Parça Kategori Adı (içerir)')
-    aircraft_model_compatibility_name = django_filters.CharFilter(field_name='aircraft_model_compatibility__name', lookup_expr='icontains', label='Uyumlu Model Adı (içerir)')
-    produced_by_team_name = django_filters.CharFilter(field_name='produced_by_team__name', lookup_expr='icontains', label='Üreten Takım Adı (içerir)')
-    created_by_personnel_username = django_filters.CharFilter(field_name='created_by_personnel__user__username', lookup_expr='icontains', label='Üreten Personel Kullanıcı Adı (içerir)')
-    serial_number = django_filters.CharFilter(lookup_expr='icontains', label='Seri Numarası (içerir)')
+    part_type_category_name = IndexedContainsFilter(field_name='part_type__category', label='Parça Kategori Adı (içerir)')
+    aircraft_model_compatibility_name = IndexedContainsFilter(field_name='aircraft_model_compatibility__name', label='Uyumlu Model Adı (içerir)')
+    produced_by_team_name = IndexedContainsFilter(field_name='produced_by_team__name', label='Üreten Takım Adı (içerir)')
+    created_by_personnel_username = IndexedContainsFilter(field_name='created_by_personnel__user__username', label='Üreten Personel Kullanıcı Adı (içerir)')
+    serial_number = IndexedContainsFilter(field_name='serial_number', label='Seri Numarası (içerir)')
 
     production_date_after = django_filters.DateFilter(field_name='production_date', lookup_expr='date__gte')
     production_date_before = django_filters.DateFilter(field_name='production_date', lookup_expr='date__lte')
@@ -98,9 +110,9 @@ class AircraftFilter(django_filters.FilterSet):
     )
     work_order = django_filters.ModelChoiceFilter(queryset=WorkOrder.objects.all())
 
-    aircraft_model_name = django_filters.CharFilter(field_name='aircraft_model__name', lookup_expr='icontains')
-    assembled_by_team_name = django_filters.CharFilter(field_name='assembled_by_team__name', lookup_expr='icontains')
-    serial_number = django_filters.CharFilter(lookup_expr='icontains')
+    aircraft_model_name = IndexedContainsFilter(field_name='aircraft_model__name')
+    assembled_by_team_name = IndexedContainsFilter(field_name='assembled_by_team__name')
+    serial_number = IndexedContainsFilter(field_name='serial_number')
     work_order_id = django_filters.NumberFilter(field_name='work_order__id')
 
     assembly_date_after = django_filters.DateFilter(field_name='assembly_date', lookup_expr='date__gte')
@@ -113,3 +125,19 @@ class AircraftFilter(django_filters.FilterSet):
             'serial_number', 'aircraft_model_name', 'assembled_by_team_name', 'work_order_id',
             'assembly_date_after', 'assembly_date_before',
         ]
+
+class ProductionEventFilter(django_filters.FilterSet):
+    """
+    Üretim olay günlüğünü filtrelemek için kullanılır.
+    Seri numarası veya (kayıt türü, kayıt ID) ile tek bir kaydın geçmişi indeks üzerinden okunur.
+    """
+    serial_number = django_filters.CharFilter(field_name='serial_number')
+    entity_type = django_filters.ChoiceFilter(choices=EventEntityChoices.choices)
+    entity_id = django_filters.NumberFilter(field_name='entity_id')
+    event_type = django_filters.MultipleChoiceFilter(choices=ProductionEventTypeChoices.choices)
+    occurred_after = django_filters.IsoDateTimeFilter(field_name='occurred_at', lookup_expr='gte')
+    occurred_before = django_filters.IsoDateTimeFilter(field_name='occurred_at', lookup_expr='lte')
+
+    class Meta:
+        model = ProductionEvent
+        fields = ['serial_number', 'entity_type', 'entity_id', 'event_type', 'team', 'occurred_after', 'occurred_before']
@@ -0,0 +1,111 @@
+# aircraft_production_app/installations.py
+"""
+Parça durumları ve Part.installed_in/installed_slot kopyasının uçak yuvalarıyla doğrulanması ve onarımı.
+
+Doğru kaynak uçak yuvalarıdır (wing/fuselage/tail/avionics):
+- Bir yuvada bulunan parça 'USED' olmalı ve installed_in/installed_slot o yuvayı göstermelidir.
+- Hiçbir yuvada bulunmayan parça 'USED' olmamalı ve installed_in boş olmalıdır.
+Durum düzeltmeleri PartQuerySet.set_status ile yapılır (stok özeti, olay günlüğü ve sayım önbelleği güncellenir).
+Birden fazla uçağın yuvasında bulunan parçalar yalnızca raporlanır; hangi uçağın doğru olduğu elle seçilmelidir.
+"""
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Aircraft, Part, PartStatusChoices
+
+READ_CHUNK_SIZE = 2000
+UPDATE_BATCH_SIZE = 500
+
+
+def expected_installations():
+    """
+    Uçak yuvalarından {parça_id: (uçak_id, yuva)} sözlüğünü ve
+    birden fazla uçakta görünen parçalar için [(parça_id, uçak_id, uçak_id), ...] listesini döndürür.
+    """
+    slot_id_fields = [f'{slot}_id' for slot in Aircraft.part_slot_fields]
+    has_parts = Q()
+    for slot in Aircraft.part_slot_fields:
+        has_parts |= Q(**{f'{slot}__isnull': False})
+
+    expected = {}
+    duplicates = []
+    rows = Aircraft.objects.filter(has_parts).order_by('pk').values_list('pk', *slot_id_fields)
+    for aircraft_id, *part_ids in rows.iterator(chunk_size=READ_CHUNK_SIZE):
+        for slot, part_id in zip(Aircraft.part_slot_fields, part_ids):
+            if part_id is None:
+                continue
+            if part_id in expected:
+                duplicates.append((part_id, expected[part_id][0], aircraft_id))
+                continue
+            expected[part_id] = (aircraft_id, slot)
+    return expected, duplicates
+
+
+def _lock_if(queryset, repair):
+    return queryset.select_for_update() if repair else queryset
+
+
+def sync_part_installations(repair=True):
+    """
+    Parça durumlarını ve installed_in kopyasını uçak yuvalarıyla karşılaştırır, repair=True ise düzeltir.
+    Dönüş değeri: {'status': [...], 'installed_in': [...], 'duplicates': [...]};
+    sapmalar (parça_id, kayıtlı değer, beklenen değer) biçimindedir ve parça id'sine göre sıralıdır.
+    Satır kilitleri yalnızca onarımda alınır; salt okuma denetimi montajı ve geri dönüşümü bekletmez.
+    Parçalar akış halinde okunur; bellekte yalnızca yuva eşleşmeleri ve sapmalar tutulur.
+    """
+    status_drift = []
+    pointer_drift = []
+    to_use = {}
+    to_free = []
+    to_point = {}
+
+    with transaction.atomic():
+        expected, duplicates = expected_installations()
+
+        def compare(part_id, status, installation):
+            expected_installation = expected.get(part_id)
+            expected_status = PartStatusChoices.USED if expected_installation else PartStatusChoices.AVAILABLE
+            if (status == PartStatusChoices.USED) != bool(expected_installation):
+                status_drift.append((part_id, status, expected_status.value))
+                if expected_installation:
+                    to_use[part_id] = expected_installation
+                else:
+                    to_free.append(part_id)
+            if installation != expected_installation:
+                pointer_drift.append((part_id, installation, expected_installation))
+                if part_id not in to_use and part_id not in to_free:
+                    to_point[part_id] = expected_installation
+
+        # 'USED' olan veya bir uçağı gösteren parçalar (yuvadaki parçaların çoğu dahil).
+        installed_or_used = Q(status=PartStatusChoices.USED) | Q(installed_in__isnull=False)
+        rows = _lock_if(Part.objects.filter(installed_or_used), repair).order_by('pk')
+        for pk, status, installed_in_id, installed_slot in (
+            rows.values_list('pk', 'status', 'installed_in_id', 'installed_slot').iterator(chunk_size=READ_CHUNK_SIZE)
+        ):
+            compare(pk, status, (installed_in_id, installed_slot) if installed_in_id else None)
+        # Yuvada olduğu halde yukarıdaki koşula uymayan parçalar gruplar halinde okunur.
+        expected_ids = sorted(expected)
+        for start in range(0, len(expected_ids), UPDATE_BATCH_SIZE):
+            batch = Part.objects.filter(pk__in=expected_ids[start:start + UPDATE_BATCH_SIZE]).exclude(installed_or_used)
+            for pk, status in _lock_if(batch, repair).order_by('pk').values_list('pk', 'status'):
+                compare(pk, status, None)
+
+        if repair:
+            # set_status, 'USED' için installed_in'i yazar, diğer durumlar için temizler.
+            if to_use:
+                Part.objects.filter(pk__in=list(to_use)).set_status(PartStatusChoices.USED, installations=to_use)
+            if to_free:
+                Part.objects.filter(pk__in=to_free).set_status(PartStatusChoices.AVAILABLE)
+            Part.objects.bulk_update(
+                [
+                    Part(pk=part_id, installed_in_id=installation[0] if installation else None,
+                         installed_slot=installation[1] if installation else '')
+                    for part_id, installation in to_point.items()
+                ],
+                ['installed_in', 'installed_slot'], batch_size=UPDATE_BATCH_SIZE,
+            )
+    status_drift.sort(key=itemgetter(0))
+    pointer_drift.sort(key=itemgetter(0))
+    return {'status': status_drift, 'installed_in': pointer_drift, 'duplicates': duplicates}
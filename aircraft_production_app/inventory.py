@@ -0,0 +1,125 @@
+# aircraft_production_app/inventory.py
+"""
+Parça envanteri işlemleri: montaj için parça seçimi (FIFO rezervasyon) ve toplu parça üretimi.
+"""
+from django.db import connections, router, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .counts import invalidate_counts_on_commit
+from .events import record_events
+from .models import Part, PartType, ProductionEvent, ProductionEventTypeChoices, StockLevel, PartCategory, PartStatusChoices
+from .search import index_for_search
+
+
+def _pick_with_skip_locked(connection, aircraft_model_id, categories, quantity):
+    """
+    PostgreSQL: her kategori için en eski `quantity` adet AVAILABLE parçayı tek sorguda kilitleyerek seçer.
+    LATERAL alt sorgusu (aircraft_model_compatibility, part_type, status, production_date) indeksi üzerinde
+    kısa bir aralık taraması yapar; başka bir transaction'ın kilitlediği satırlar atlanır (SKIP LOCKED).
+    """
+    part_table = connection.ops.quote_name(Part._meta.db_table)
+    part_type_table = connection.ops.quote_name(PartType._meta.db_table)
+    category_placeholders = ', '.join(['%s'] * len(categories))
+    sql = (
+        f'SELECT picked.*, pt.category AS picked_category '
+        f'FROM {part_type_table} pt '
+        f'CROSS JOIN LATERAL ('
+        f'  SELECT p.* FROM {part_table} p'
+        f'  WHERE p.part_type_id = pt.id AND p.aircraft_model_compatibility_id = %s AND p.status = %s'
+        f'  ORDER BY p.production_date, p.id'
+        f'  LIMIT %s'
+        f'  FOR UPDATE SKIP LOCKED'
+        f') picked '
+        f'WHERE pt.category IN ({category_placeholders}) '
+        f'ORDER BY pt.category, picked.production_date, picked.id'
+    )
+    params = [aircraft_model_id, PartStatusChoices.AVAILABLE.value, quantity, *categories]
+    return list(Part.objects.raw(sql, params))
+
+
+def _pick_with_window(aircraft_model_id, categories, quantity):
+    """
+    Diğer veritabanları: kategori başına sıralama numarası (ROW_NUMBER) ile tek sorguda seçim yapar.
+    SQLite satır kilidi desteklemez; aynı parçanın iki uçağa takılması Aircraft üzerindeki
+    OneToOne kısıtı ve Aircraft.save() içindeki durum kontrolüyle engellenir.
+    """
+    ranked_parts = Part.objects.filter(
+        aircraft_model_compatibility_id=aircraft_model_id,
+        part_type__category__in=categories,
+        status=PartStatusChoices.AVAILABLE,
+    ).annotate(
+        picked_category=F('part_type__category'),
+        pick_rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('part_type_id')],
+            order_by=[F('production_date').asc(), F('id').asc()],
+        ),
+    ).filter(pick_rank__lte=quantity).order_by('part_type__category', 'production_date', 'id')
+    return list(ranked_parts)
+
+
+def pick_available_parts(aircraft_model, quantity=1, categories=None):
+    """
+    Verilen uçak modeli için her parça kategorisinden en eski (FIFO) `quantity` adet AVAILABLE parçayı seçer.
+
+    Tek bir sorgu çalıştırır; PostgreSQL'de seçilen satırlar transaction sonuna kadar kilitli kalır,
+    bu yüzden bir transaction.atomic bloğu içinde çağrılmalıdır.
+    Dönüş değeri: {PartCategory: [Part, ...]} (her liste üretim tarihine göre eskiden yeniye sıralıdır).
+    Stokta yeterli parça olmayan kategorilerin listesi `quantity` değerinden kısa olur.
+    """
+    categories = [PartCategory(category).value for category in (categories or PartCategory)]
+    aircraft_model_id = getattr(aircraft_model, 'pk', aircraft_model)
+
+    connection = connections[router.db_for_write(Part)]
+    if connection.vendor == 'postgresql':
+        parts = _pick_with_skip_locked(connection, aircraft_model_id, categories, quantity)
+    else:
+        parts = _pick_with_window(aircraft_model_id, categories, quantity)
+
+    picked = {PartCategory(category): [] for category in categories}
+    for part in parts:
+        picked[PartCategory(part.picked_category)].append(part)
+    return picked
+
+
+def produce_parts(part_type, team, quantities_by_model, personnel=None, batch_size=1000):
+    """
+    Bir takımın aynı parça tipinden, uçak modeli başına belirtilen adette parçayı toplu olarak üretir.
+
+    Takım doğrulaması çağıran tarafından bir kez yapılmış olmalıdır. Seri numaraları ön ek başına tek
+    blok halinde ayrılır, kayıtlar bulk_create ile yazılır ve stok özet tablosu tek seferde güncellenir.
+    `quantities_by_model`: {AircraftModel: adet}
+    Dönüş değeri: oluşturulan Part nesnelerinin listesi (seri numarası sırasıyla).
+    """
+    parts = [
+        Part(
+            part_type=part_type,
+            aircraft_model_compatibility=aircraft_model,
+            produced_by_team=team,
+            created_by_personnel=personnel,
+            status=PartStatusChoices.AVAILABLE,
+        )
+        for aircraft_model, quantity in quantities_by_model.items()
+        for _ in range(quantity)
+    ]
+    if not parts:
+        return parts
+
+    with transaction.atomic():
+        Part.allocate_serial_numbers(parts)
+        Part.objects.bulk_create(parts, batch_size=batch_size)
+        # bulk_create sinyal göndermez; stok özetini model başına tek farkla güncelle.
+        StockLevel.objects.apply_deltas({
+            (aircraft_model.pk, part_type.pk, PartStatusChoices.AVAILABLE.value): quantity
+            for aircraft_model, quantity in quantities_by_model.items()
+        })
+        invalidate_counts_on_commit(Part)
+        index_for_search(Part, parts)
+        record_events(
+            ProductionEvent.for_instance(part, ProductionEventTypeChoices.PART_PRODUCED, status=part.status)
+            for part in parts
+        )
+    for part in parts:
+        part.snapshot_tracked_fields()
+    return parts
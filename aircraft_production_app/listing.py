@@ -0,0 +1,206 @@
+# aircraft_production_app/listing.py
+"""
+Liste uç noktaları için serializer'sız hızlı yanıt üretimi.
+
+Her projeksiyon, liste serializer'ının ürettiği JSON anahtarlarını aynı sırayla ve aynı değerlerle üretir:
+- İlişkili alanlar JOIN ile tek bir .values() sorgusunda düz sütun olarak okunur (model nesnesi oluşturulmaz).
+- Seçim alanlarının okunabilir etiketleri SQL'de Case/When ile hesaplanır; etiketler sınıf başına bir kez hazırlanır.
+- Tarih/saat alanları DRF alanlarının to_representation'ı ile biçimlendirilir (saat dilimi ve ISO 8601 aynıdır).
+Tekil kayıt, oluşturma ve güncelleme yanıtları serializer üzerinden üretilmeye devam eder.
+"""
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Coalesce, Concat
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .metrics import measure_serialization
+from .models import (
+    Aircraft, AircraftModelChoices, AircraftStatusChoices, PartCategory, PartStatusChoices, WorkOrderStatusChoices,
+)
+
+
+def choice_label(field_path, choices):
+    """
+    Seçim alanının okunabilir etiketini SQL'de hesaplayan Case/When ifadesi.
+    get_FOO_display() gibi tanımsız değerler için ham değer döner.
+    """
+    return Case(
+        *[When(**{field_path: value}, then=Value(str(label))) for value, label in choices],
+        default=F(field_path),
+        output_field=CharField(),
+    )
+
+
+def installed_aircraft_label():
+    """
+    'USED' parçanın takılı olduğu uçağın Aircraft.__str__ ile aynı etiketini Part.installed_in üzerinden
+    JOIN ile hesaplar, diğer durumlarda '-' döndürür (bkz. Part.get_installed_aircraft_info).
+    """
+    return Case(
+        When(
+            status=PartStatusChoices.USED, installed_in__isnull=False,
+            then=Concat(
+                Coalesce('installed_in__aircraft_model__name', Value('Model Belirtilmemiş')), Value(' - SN: '),
+                Coalesce('installed_in__serial_number', Value('Henüz Yok')),
+                output_field=CharField(),
+            ),
+        ),
+        default=Value('-'),
+        output_field=CharField(),
+    )
+
+
+class ListProjection:
+    """
+    Bir liste serializer'ının .values() karşılığı.
+    - `keys`: çıktı anahtarları (serializer Meta.fields sırası)
+    - `fields`: anahtarla aynı adlı model alanları (ilişkilerde ham ID döner)
+    - get_expressions(): diğer anahtarlar için {anahtar: ifade}
+    - `datetime_keys` / `date_keys`: DRF biçimiyle yazılacak tarih alanları
+    """
+    keys = ()
+    fields = ()
+    datetime_keys = ()
+    date_keys = ()
+
+    def __init__(self):
+        datetime_field = serializers.DateTimeField()
+        date_field = serializers.DateField()
+        self.converters = {
+            **{key: datetime_field.to_representation for key in self.datetime_keys},
+            **{key: date_field.to_representation for key in self.date_keys},
+        }
+
+    def get_expressions(self):
+        return {}
+
+    def project(self, queryset):
+        """Filtrelenmiş/sıralanmış model queryset'ini düz .values() sorgusuna çevirir."""
+        return queryset.values(*self.fields, **self.get_expressions())
+
+    def render_row(self, row):
+        converters = self.converters
+        return {
+            key: (converters[key](row[key]) if key in converters and row[key] is not None else row[key])
+            for key in self.keys
+        }
+
+    def render(self, rows):
+        render_row = self.render_row
+        return [render_row(row) for row in rows]
+
+
+class PartListProjection(ListProjection):
+    """PartSerializer liste çıktısı."""
+    keys = (
+        'id', 'serial_number', 'part_type', 'part_type_display',
+        'aircraft_model_compatibility', 'aircraft_model_compatibility_name',
+        'produced_by_team', 'produced_by_team_name',
+        'created_by_personnel', 'created_by_personnel_username',
+        'production_date', 'updated_at',
+        'status', 'status_display',
+        'installed_aircraft_info',
+    )
+    fields = (
+        'id', 'serial_number', 'part_type', 'aircraft_model_compatibility', 'produced_by_team',
+        'created_by_personnel', 'production_date', 'updated_at', 'status',
+    )
+    datetime_keys = ('production_date', 'updated_at')
+
+    def get_expressions(self):
+        return {
+            'part_type_display': choice_label('part_type__category', PartCategory.choices),
+            'aircraft_model_compatibility_name': choice_label('aircraft_model_compatibility__name', AircraftModelChoices.choices),
+            'produced_by_team_name': F('produced_by_team__name'),
+            'created_by_personnel_username': F('created_by_personnel__user__username'),
+            'status_display': choice_label('status', PartStatusChoices.choices),
+            'installed_aircraft_info': installed_aircraft_label(),
+        }
+
+
+class AircraftListProjection(ListProjection):
+    """AircraftSerializer liste çıktısı. work_order_info, WorkOrder.__str__ ile aynı biçimde Python'da birleştirilir."""
+    keys = (
+        'id', 'serial_number', 'aircraft_model', 'aircraft_model_name',
+        'status', 'status_display',
+        'assembly_date', 'updated_at',
+        'assembled_by_team', 'assembled_by_team_name',
+        'assembled_by_personnel', 'assembled_by_personnel_username',
+        'work_order', 'work_order_info',
+        'wing', 'wing_sn', 'fuselage', 'fuselage_sn',
+        'tail', 'tail_sn', 'avionics', 'avionics_sn',
+    )
+    fields = (
+        'id', 'serial_number', 'aircraft_model', 'status', 'assembly_date', 'updated_at',
+        'assembled_by_team', 'assembled_by_personnel', 'work_order',
+        'wing', 'fuselage', 'tail', 'avionics',
+    )
+    datetime_keys = ('assembly_date', 'updated_at')
+
+    def get_expressions(self):
+        return {
+            'aircraft_model_name': choice_label('aircraft_model__name', AircraftModelChoices.choices),
+            'status_display': choice_label('status', AircraftStatusChoices.choices),
+            'assembled_by_team_name': F('assembled_by_team__name'),
+            'assembled_by_personnel_username': F('assembled_by_personnel__user__username'),
+            'work_order_model_name': F('work_order__aircraft_model__name'),
+            'work_order_quantity': F('work_order__quantity'),
+            'work_order_status_display': choice_label('work_order__status', WorkOrderStatusChoices.choices),
+            **{f'{slot}_sn': F(f'{slot}__serial_number') for slot in Aircraft.part_slot_fields},
+        }
+
+    def render_row(self, row):
+        if row['work_order'] is not None:
+            row['work_order_info'] = (
+                f"İş Emri #{row['work_order']} - {row['work_order_model_name']} "
+                f"({row['work_order_quantity']} adet) - {row['work_order_status_display']}"
+            )
+        else:
+            row['work_order_info'] = None
+        return super().render_row(row)
+
+
+class WorkOrderListProjection(ListProjection):
+    """WorkOrderSerializer liste çıktısı."""
+    keys = (
+        'id', 'aircraft_model', 'aircraft_model_name', 'quantity', 'completed_count',
+        'status', 'status_display',
+        'created_by', 'created_by_username',
+        'assigned_to_assembly_team', 'assigned_to_assembly_team_name',
+        'notes', 'created_at', 'updated_at', 'target_completion_date',
+    )
+    fields = (
+        'id', 'aircraft_model', 'quantity', 'completed_count', 'status', 'created_by',
+        'assigned_to_assembly_team', 'notes', 'created_at', 'updated_at', 'target_completion_date',
+    )
+    datetime_keys = ('created_at', 'updated_at')
+    date_keys = ('target_completion_date',)
+
+    def get_expressions(self):
+        return {
+            'aircraft_model_name': choice_label('aircraft_model__name', AircraftModelChoices.choices),
+            'status_display': choice_label('status', WorkOrderStatusChoices.choices),
+            'created_by_username': F('created_by__username'),
+            'assigned_to_assembly_team_name': F('assigned_to_assembly_team__name'),
+        }
+
+
+class ProjectedListMixin:
+    """
+    ViewSet.list() yanıtını `list_projection` ile üretir; filtreleme, arama, sıralama, rol kapsamı ve
+    sayfalama liste uç noktasıyla aynıdır. `list_projection` None ise serializer kullanılır.
+    """
+    list_projection = None
+
+    def list(self, request, *args, **kwargs):
+        projection = self.list_projection
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+        queryset = projection.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with measure_serialization():
+                data = projection.render(page)
+            return self.get_paginated_response(data)
+        with measure_serialization():
+            return Response(projection.render(queryset))
@@ -0,0 +1,401 @@
+# aircraft_production_app/live.py
+"""
+Canlı değişiklik olayları: panodaki tablolar yalnızca ilgili bir değişiklik olduğunda yeniden yüklenir.
+
+- Olaylar commit'ten sonra yayınlanır: üretim olay günlüğü yazıldığında (events.write_events) olay tipi ve takım
+  başına tek bir özet mesaj, stok özet tabloları güncellendiğinde (StockLevelManager.apply_deltas) stok farkları.
+- Mesajlar süreç içi LiveEventBroker üzerinden SSE bağlantılarına dağıtılır (bkz. views.live_events_stream).
+  LIVE_EVENTS_BACKEND='postgres' ise mesajlar PostgreSQL NOTIFY ile gönderilir ve her süreçteki dinleyici
+  thread'i (LISTEN) onları yerel broker'a aktarır; böylece tüm worker'lardaki bağlantılar haberdar olur.
+- Mesajlar sıra numarasıyla son LIVE_EVENTS_HISTORY adet tutulur; yeniden bağlanan istemci Last-Event-ID ile
+  kaldığı yerden devam eder. Aradaki mesajlar artık yoksa veya istemci geride kaldıysa RESYNC mesajı gönderilir
+  ve istemci görünür tüm tablolarını yeniden yükler. Sıra numaraları süreç içidir.
+- Her bağlantı, kullanıcının rolüne göre liste endpoint'leriyle aynı kapsamda mesaj alır (bkz. scope_message).
+  Yetki her keep-alive aralığında yeniden denetlenir; token silinen, pasife alınan veya takımı değişen
+  kullanıcının akışı kapatılır.
+"""
+import asyncio
+from collections import Counter, deque
+import hashlib
+import json
+import logging
+import select
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+RESYNC = 'RESYNC'
+STOCK_CHANGED = 'STOCK_CHANGED'
+MAX_IDS_PER_MESSAGE = 20  # Özet mesajda taşınan en fazla kayıt ID'si
+MAX_NOTIFY_PAYLOAD_BYTES = 7999  # PostgreSQL NOTIFY yükü 8000 bayttan kısa olmalıdır
+RETRY_MS = 3000  # Bağlantı koptuğunda tarayıcının yeniden deneme aralığı
+TICKET_SALT = 'aircraft_production_app.live'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# === BROKER ===
+
+class Subscription:
+    """Bir SSE bağlantısının mesaj kuyruğu; mesajlar herhangi bir thread'den bağlantının event loop'una aktarılır."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def deliver(self, entry):
+        try:
+            self.loop.call_soon_threadsafe(self._put, entry)
+        except RuntimeError:
+            # Event loop kapanmış; bağlantı zaten sona erdi.
+            self.closed = True
+
+    def _put(self, entry):
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # İstemci yetişemiyor: bekleyen mesajlar atılır, istemci tüm görünümlerini yeniden yükler.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((entry[0], {'type': RESYNC}))
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class LiveEventBroker:
+    """Süreç içi yayın/abonelik; son mesajları sıra numaralarıyla saklar. Thread-safe."""
+
+    def __init__(self, history_size=1000, queue_size=500):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._last_id = 0
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, message):
+        with self._lock:
+            self._last_id += 1
+            entry = (self._last_id, message)
+            self._history.append(entry)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(entry)
+            if subscription.closed:
+                self.unsubscribe(subscription)
+        return entry[0]
+
+    def subscribe(self, loop, last_event_id=None):
+        """
+        Yeni abonelik açar (çağıran, `loop` üzerinde çalışmalıdır). `last_event_id` verilirse sonraki mesajlar
+        kuyruğa önceden eklenir; aradaki mesajlar artık yoksa RESYNC eklenir.
+        """
+        subscription = Subscription(loop, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription
+            oldest_id = self._history[0][0] if self._history else self._last_id + 1
+            if last_event_id > self._last_id or last_event_id < oldest_id - 1:
+                # Başka süreçten veya yeniden başlatma öncesinden kalan ID; ya da kaçırılan mesajlar silinmiş.
+                subscription.queue.put_nowait((self._last_id, {'type': RESYNC}))
+            else:
+                for entry in self._entries_after(last_event_id):
+                    subscription._put(entry)
+        return subscription
+
+    def _entries_after(self, event_id):
+        return [entry for entry in self._history if entry[0] > event_id]
+
+    def entries_after(self, event_id):
+        """Geçmişte `event_id`'den sonraki [(sıra numarası, mesaj), ...] kayıtları."""
+        with self._lock:
+            return self._entries_after(event_id)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+broker = LiveEventBroker(
+    history_size=_setting('LIVE_EVENTS_HISTORY', 1000),
+    queue_size=_setting('LIVE_EVENTS_QUEUE_SIZE', 500),
+)
+
+
+# === POSTGRESQL LISTEN/NOTIFY ===
+
+class PostgresNotifyListener:
+    """
+    Süreç başına bir thread: ayrı bir veritabanı bağlantısında LISTEN yapar ve gelen mesajları yerel broker'a aktarır.
+    Bağlantı koparsa yeniden bağlanır ve arada kaçırılmış olabilecek mesajlar için RESYNC yayınlar.
+    """
+
+    def __init__(self, channel, using=DEFAULT_DB_ALIAS):
+        self.channel = channel
+        self.using = using
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='live-events-listener', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        reconnecting = False
+        while True:
+            try:
+                self._listen(reconnecting)
+            except Exception:
+                logger.exception("Live events listener lost its database connection; reconnecting.")
+            reconnecting = True
+            time.sleep(1)
+
+    def _listen(self, reconnecting):
+        wrapper = connections[self.using]
+        raw_connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            raw_connection.autocommit = True
+            with raw_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            if reconnecting:
+                broker.publish({'type': RESYNC})
+            if callable(getattr(raw_connection, 'notifies', None)):
+                # psycopg 3
+                for notify in raw_connection.notifies():
+                    self._deliver(notify.payload)
+            else:
+                # psycopg2
+                while True:
+                    if select.select([raw_connection], [], [], 30) == ([], [], []):
+                        continue
+                    raw_connection.poll()
+                    while raw_connection.notifies:
+                        self._deliver(raw_connection.notifies.pop(0).payload)
+        finally:
+            raw_connection.close()
+
+    @staticmethod
+    def _deliver(payload):
+        try:
+            broker.publish(json.loads(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed live event payload: %.200s", payload)
+
+
+_listener = None
+
+
+def use_postgres_notify():
+    return _setting('LIVE_EVENTS_BACKEND', 'local') == 'postgres'
+
+
+def ensure_listener():
+    """postgres arka ucunda bu sürecin dinleyici thread'ini başlatır (ilk SSE bağlantısında çağrılır)."""
+    global _listener
+    if not use_postgres_notify():
+        return
+    if _listener is None:
+        _listener = PostgresNotifyListener(_setting('LIVE_EVENTS_CHANNEL', 'production_live'))
+    _listener.ensure_started()
+
+
+def publish(message, using=DEFAULT_DB_ALIAS):
+    """
+    Mesajı yayınlar; postgres arka ucunda NOTIFY ile tüm süreçlere, aksi halde yerel broker'a.
+    NOTIFY başarısız olursa yerel bağlantılara RESYNC yayınlanır (diğer süreçler mesajı kaçırmış olabilir).
+    """
+    if not use_postgres_notify():
+        broker.publish(message)
+        return
+    channel = _setting('LIVE_EVENTS_CHANNEL', 'production_live')
+    try:
+        with connections[using].cursor() as cursor:
+            for payload in notify_payloads(message):
+                cursor.execute('SELECT pg_notify(%s, %s)', [channel, payload])
+    except Exception:
+        # Canlı olaylar en iyi çaba ile iletilir; yayın hatası yazma işlemini bozmamalıdır.
+        logger.exception("Could not publish live event %s", message.get('type'))
+        broker.publish({'type': RESYNC})
+
+
+def notify_payloads(message):
+    """
+    Mesajın NOTIFY yüklerini döndürür. Sınırı aşan stok mesajları satırları bölünerek birden fazla yüke
+    ayrılır; bölünemeyen mesajın yerine RESYNC gönderilir ve istemciler tablolarını yeniden yükler.
+    """
+    payload = json.dumps(message, separators=(',', ':'))
+    if len(payload.encode()) <= MAX_NOTIFY_PAYLOAD_BYTES:
+        return [payload]
+    rows = message.get('rows') or []
+    if len(rows) < 2:
+        logger.warning("Live event %s exceeds the NOTIFY payload limit; publishing RESYNC instead.", message.get('type'))
+        return [json.dumps({'type': RESYNC})]
+    middle = len(rows) // 2
+    return notify_payloads({**message, 'rows': rows[:middle]}) + notify_payloads({**message, 'rows': rows[middle:]})
+
+
+# === MESAJLAR ===
+
+def publish_production_events(events, using=DEFAULT_DB_ALIAS):
+    """Commit edilmiş ProductionEvent nesnelerini (olay tipi, takım) başına tek bir özet mesaj olarak yayınlar."""
+    groups = {}
+    for event in events:
+        key = (event.event_type, event.entity_type, event.team_id)
+        groups.setdefault(key, []).append(event.entity_id)
+    for (event_type, entity_type, team_id), entity_ids in groups.items():
+        publish({
+            'type': event_type, 'entity': entity_type, 'team_id': team_id,
+            'count': len(entity_ids), 'ids': entity_ids[:MAX_IDS_PER_MESSAGE],
+        }, using=using)
+
+
+_part_type_categories = {}
+
+
+def _part_type_category(part_type_id):
+    if part_type_id not in _part_type_categories:
+        part_type_model = apps.get_model('aircraft_production_app', 'PartType')
+        _part_type_categories.update(part_type_model.objects.values_list('pk', 'category'))
+    return _part_type_categories.get(part_type_id)
+
+
+def _publish_stock_deltas(model_name, key_fields, deltas, using):
+    rows = []
+    for key, delta in sorted(deltas.items(), key=lambda item: tuple(str(value) for value in item[0])):
+        row = dict(zip(key_fields, key))
+        if model_name == 'stocklevel':
+            rows.append({
+                'aircraft_model_id': row['aircraft_model_id'], 'part_type_id': row['part_type_id'],
+                'category': _part_type_category(row['part_type_id']), 'status': row['status'], 'delta': delta,
+            })
+        else:
+            rows.append({
+                'aircraft_model_id': row['aircraft_model_id'], 'team_id': row['assembled_by_team_id'],
+                'status': row['status'], 'delta': delta,
+            })
+    publish({'type': STOCK_CHANGED, 'stock': 'parts' if model_name == 'stocklevel' else 'aircraft', 'rows': rows}, using=using)
+
+
+def publish_stock_deltas(stock_model, key_fields, deltas, using=DEFAULT_DB_ALIAS):
+    """Stok özet farklarını transaction commit edildiğinde yayınlar; geri alınan farklar yayınlanmaz."""
+    deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+    if not deltas:
+        return
+    model_name = stock_model._meta.model_name
+    transaction.on_commit(lambda: _publish_stock_deltas(model_name, key_fields, deltas, using), using=using)
+
+
+def scope_message(role, message):
+    """
+    Mesajı kullanıcının rolüne göre süzer (liste endpoint'lerindeki kapsamla aynı); görmemesi gerekiyorsa None.
+    - Parça olayları: admin, montaj takımları ve parçayı üreten takım.
+    - Uçak olayları: admin ve uçağı monte eden takım.
+    - İş emri olayları: admin, atanan montaj takımı; atanmamış iş emirleri tüm montaj takımları.
+    - Parça stoğu: admin ve montaj takımları tüm satırları, üretim takımları kendi kategorisini görür.
+    - Uçak stoğu: admin tüm satırları, montaj takımları kendi satırlarını görür.
+    """
+    if message['type'] == RESYNC or role.is_admin:
+        return message
+    if role.team_id is None:
+        return None
+
+    if message['type'] == STOCK_CHANGED:
+        if message['stock'] == 'parts':
+            if role.can_assemble:
+                return message
+            rows = [row for row in message['rows'] if row['category'] == role.producible_category]
+        else:
+            rows = [row for row in message['rows'] if role.can_assemble and row['team_id'] == role.team_id]
+        return {**message, 'rows': rows} if rows else None
+
+    entity = message['entity']
+    if entity == 'PART':
+        visible = role.can_assemble or message['team_id'] == role.team_id
+    elif entity == 'AIRCRAFT':
+        visible = role.can_assemble and message['team_id'] == role.team_id
+    else:
+        visible = role.can_assemble and message['team_id'] in (None, role.team_id)
+    return message if visible else None
+
+
+# === SSE ===
+
+def token_fingerprint(key):
+    """Token değerinin özeti; bilet imzalı ama şifresiz olduğundan token açık halde taşınmaz."""
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issue_stream_ticket(user, token=None):
+    """
+    EventSource özel başlık gönderemediği için SSE bağlantısı kısa ömürlü, imzalı bir bilet ile açılır;
+    token URL'de taşınmaz. Bilet, alındığı token'a bağlanır; token silinirse akış kapanır (bkz. stream_events).
+    """
+    key = getattr(token, 'key', None)
+    return signing.dumps({'user_id': user.pk, 'token': token_fingerprint(key) if key else None}, salt=TICKET_SALT)
+
+
+def read_stream_ticket(ticket):
+    """
+    Biletin (kullanıcı ID'si, token özeti) çiftini döndürür; geçersiz veya süresi dolmuşsa
+    signing.BadSignature fırlatır.
+    """
+    data = signing.loads(ticket, salt=TICKET_SALT, max_age=_setting('LIVE_EVENTS_TICKET_MAX_AGE', 60))
+    return data['user_id'], data.get('token')
+
+
+def format_sse(event_id, message):
+    return f"id: {event_id}\ndata: {json.dumps(message, separators=(',', ':'))}\n\n"
+
+
+async def stream_events(role, last_event_id=None, reauthorize=None):
+    """
+    Bir SSE bağlantısının gövdesi: rolün görebildiği mesajlar ve belirli aralıklarla keep-alive yorumları.
+    `reauthorize` verilirse her keep-alive aralığında çağrılır ve kullanıcının güncel rol bağlamını döndürür;
+    kullanıcı artık yetkili değilse (None) veya rolü/takımı değiştiyse akış kapanır. İstemci yeni bilet
+    isteyerek yeniden bağlanır.
+    """
+    ensure_listener()
+    loop = asyncio.get_running_loop()
+    subscription = broker.subscribe(loop, last_event_id)
+    keepalive = _setting('LIVE_EVENTS_KEEPALIVE', 15)
+    reauthorize_at = loop.time() + keepalive
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            try:
+                entry = await asyncio.wait_for(subscription.get(), keepalive)
+            except asyncio.TimeoutError:
+                entry = None
+            if reauthorize is not None and loop.time() >= reauthorize_at:
+                if await reauthorize() != role:
+                    return
+                reauthorize_at = loop.time() + keepalive
+            if entry is None:
+                yield ': keepalive\n\n'
+                continue
+            event_id, message = entry
+            scoped = scope_message(role, message)
+            if scoped is not None:
+                yield format_sse(event_id, scoped)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,72 @@
+# aircraft_production_app/management/commands/bench_api.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aircraft_production_app.api_bench import ROLES, SCENARIOS, compare_results, run_api_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the main API endpoints per role (p50/p95/p99 latency, SQL query count and SQL time) '
+        'against the current dataset and fails when a checked-in query budget is exceeded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Measured requests per endpoint and role (default: 30).')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured warm-up requests per endpoint and role (default: 3).')
+        parser.add_argument(
+            '--endpoint', choices=[scenario.name for scenario in SCENARIOS], action='append',
+            help='Endpoint to benchmark; may be given more than once (default: all).'
+        )
+        parser.add_argument('--role', choices=ROLES, action='append', help='Role to benchmark; may be given more than once (default: all).')
+        parser.add_argument('--output', help='Write the JSON results to this file.')
+        parser.add_argument('--compare', help='JSON results of a previous run to compare p95 latency and query counts against.')
+        parser.add_argument('--no-budgets', action='store_true', help='Report query budget violations without failing.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as baseline_file:
+                    baseline = json.load(baseline_file)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        try:
+            report = run_api_benchmark(
+                iterations=options['iterations'], warmup=options['warmup'],
+                endpoints=options['endpoint'], roles=options['role'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for row in report['results']:
+            budget = '-' if row['query_budget'] is None else row['query_budget']
+            self.stdout.write(
+                f"{row['endpoint']:<22} {row['role']:<9} {row['status']} | p50 {row['p50_ms']:8.2f} ms"
+                f" | p95 {row['p95_ms']:8.2f} ms | p99 {row['p99_ms']:8.2f} ms"
+                f" | {row['queries']:3d} queries (budget {budget}) | sql {row['sql_ms']:7.2f} ms"
+            )
+        if baseline:
+            self.stdout.write("Compared to the baseline:")
+            for endpoint, role, old_p95, new_p95, old_queries, new_queries in compare_results(baseline, report):
+                change = (new_p95 - old_p95) / old_p95 * 100 if old_p95 else 0
+                self.stdout.write(
+                    f"  {endpoint:<22} {role:<9} p95 {old_p95:.2f} -> {new_p95:.2f} ms ({change:+.1f}%)"
+                    f" | queries {old_queries} -> {new_queries}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        violations = report['budget_violations']
+        for violation in violations:
+            self.stdout.write(self.style.WARNING(
+                f"  {violation['endpoint']} ({violation['role']}): {violation['queries']} queries, budget {violation['budget']}"
+            ))
+        if violations and not options['no_budgets']:
+            raise CommandError(f"{len(violations)} query budgets exceeded.")
+        self.stdout.write(self.style.SUCCESS("All endpoints are within their query budgets." if not violations else "Done."))
@@ -0,0 +1,71 @@
+# aircraft_production_app/management/commands/bench_concurrency.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aircraft_production_app.api_bench import ROLES
+from aircraft_production_app.concurrency_bench import get_role_tokens, run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests a running server with concurrent dashboard clients (keep-alive connections replaying the '
+        'dashboard start-up requests) and reports requests/sec and latency percentiles per endpoint. '
+        'Run it once against the WSGI server and once against the ASGI server to compare the two modes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server (default: http://127.0.0.1:8000).')
+        parser.add_argument('--clients', type=int, default=200, help='Concurrent dashboard clients (default: 200).')
+        parser.add_argument('--duration', type=float, default=30.0, help='Measured seconds (default: 30).')
+        parser.add_argument('--warmup', type=float, default=5.0, help='Unmeasured seconds before the measurement (default: 5).')
+        parser.add_argument('--role', choices=ROLES, action='append', help='Role the clients log in as; may be given more than once (default: all, round-robin).')
+        parser.add_argument('--token', action='append', help='API token to use instead of looking up role users in the database; may be given more than once.')
+        parser.add_argument('--output', help='Write the JSON results to this file.')
+        parser.add_argument('--compare', help='JSON results of a previous run (e.g. the other server mode) to compare against.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as baseline_file:
+                    baseline = json.load(baseline_file)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        try:
+            tokens = options['token'] or get_role_tokens(options['role'])
+            self.stdout.write(
+                f"{options['clients']} clients against {options['url']} for {options['duration']:g}s "
+                f"(+{options['warmup']:g}s warm-up)..."
+            )
+            report = run_concurrency_benchmark(
+                options['url'], tokens, clients=options['clients'],
+                duration=options['duration'], warmup=options['warmup'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for row in report['endpoints']:
+            self.stdout.write(
+                f"{row['endpoint']:<22} {row['requests']:7d} requests {row['errors']:5d} errors"
+                f" | p50 {row['p50_ms']:8.2f} ms | p95 {row['p95_ms']:8.2f} ms | p99 {row['p99_ms']:8.2f} ms"
+            )
+        summary = report['summary']
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['requests_per_second']:.1f} requests/sec with {options['clients']} clients"
+            f" | p50 {summary['p50_ms']:.2f} ms | p95 {summary['p95_ms']:.2f} ms | p99 {summary['p99_ms']:.2f} ms"
+            f" | {summary['errors']} errors"
+        ))
+        if baseline:
+            old = baseline['summary']
+            change = (summary['requests_per_second'] - old['requests_per_second']) / old['requests_per_second'] * 100 if old['requests_per_second'] else 0
+            self.stdout.write(
+                f"Compared to the baseline: {old['requests_per_second']:.1f} -> {summary['requests_per_second']:.1f} requests/sec"
+                f" ({change:+.1f}%) | p95 {old['p95_ms']:.2f} -> {summary['p95_ms']:.2f} ms"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(report, output_file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
@@ -0,0 +1,94 @@
+# aircraft_production_app/management/commands/bench_list_rendering.py
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from aircraft_production_app.listing import AircraftListProjection, PartListProjection, WorkOrderListProjection
+from aircraft_production_app.models import Aircraft, Part, WorkOrder
+from aircraft_production_app.serializers import AircraftSerializer, PartSerializer, WorkOrderSerializer
+
+# (serializer, projeksiyon, liste view'ının kullandığı queryset)
+TARGETS = {
+    'parts': (
+        PartSerializer, PartListProjection(),
+        lambda: Part.objects.select_related(
+            'part_type', 'aircraft_model_compatibility', 'produced_by_team', 'created_by_personnel__user'
+        ).order_by('-production_date', '-id'),
+    ),
+    'aircraft': (
+        AircraftSerializer, AircraftListProjection(),
+        lambda: Aircraft.objects.select_related(
+            'aircraft_model', 'assembled_by_team', 'assembled_by_personnel__user', 'work_order',
+            'wing', 'fuselage', 'tail', 'avionics'
+        ).order_by('-assembly_date', '-id'),
+    ),
+    'work-orders': (
+        WorkOrderSerializer, WorkOrderListProjection(),
+        lambda: WorkOrder.objects.select_related(
+            'aircraft_model', 'created_by', 'assigned_to_assembly_team'
+        ).order_by('-created_at', '-id'),
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares list rendering throughput (rows/sec) of the DRF serializers and the values() projections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Number of rows rendered per run (default: 1000).')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per path; the fastest run is reported (default: 3).')
+        parser.add_argument(
+            '--target', choices=sorted(TARGETS), action='append',
+            help='Endpoint to benchmark; may be given more than once (default: all).'
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        mismatches = []
+        for name in options['target'] or sorted(TARGETS):
+            serializer_class, projection, get_queryset = TARGETS[name]
+            rows = options['rows']
+
+            def render_serializer():
+                return serializer_class(get_queryset()[:rows], many=True).data
+
+            def render_projection():
+                return projection.render(projection.project(get_queryset())[:rows])
+
+            serializer_seconds, serializer_data = self.measure(render_serializer, options['repeat'])
+            projection_seconds, projection_data = self.measure(render_projection, options['repeat'])
+            row_count = len(projection_data)
+            if not row_count:
+                self.stdout.write(f"{name}: no rows to render, skipped.")
+                continue
+
+            if self.as_json(serializer_data) != self.as_json(projection_data):
+                mismatches.append(name)
+            self.stdout.write(
+                f"{name}: {row_count} rows | serializer {row_count / serializer_seconds:,.0f} rows/s"
+                f" | projection {row_count / projection_seconds:,.0f} rows/s"
+                f" | speedup x{serializer_seconds / projection_seconds:.1f}"
+            )
+
+        if mismatches:
+            raise CommandError(f"Projection output differs from the serializer output for: {', '.join(mismatches)}")
+        self.stdout.write(self.style.SUCCESS("Projection output matches the serializers."))
+
+    @staticmethod
+    def measure(render, repeat):
+        """En hızlı çalıştırmanın süresini ve çıktısını döndürür (sorgu + satır üretimi dahil)."""
+        best, data = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    @staticmethod
+    def as_json(data):
+        return json.dumps(data, cls=DjangoJSONEncoder)
@@ -0,0 +1,43 @@
+# aircraft_production_app/management/commands/check_part_installations.py
+from django.core.management.base import BaseCommand, CommandError
+from aircraft_production_app.installations import sync_part_installations
+
+
+class Command(BaseCommand):
+    help = 'Verifies part statuses and Part.installed_in against the aircraft slots and repairs mismatches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report mismatches; exit with an error if any is found.'
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        drift = sync_part_installations(repair=not check_only)
+
+        for part_id, stored, expected in drift['status']:
+            self.stdout.write(f"  part {part_id}: status={stored} expected={expected}")
+        for part_id, stored, expected in drift['installed_in']:
+            self.stdout.write(f"  part {part_id}: installed_in={self.format_installation(stored)} expected={self.format_installation(expected)}")
+        for part_id, first_aircraft_id, second_aircraft_id in drift['duplicates']:
+            self.stdout.write(self.style.WARNING(
+                f"  part {part_id} is mounted on aircraft {first_aircraft_id} and {second_aircraft_id}; fix the slots manually."
+            ))
+
+        total_drift = len(drift['status']) + len(drift['installed_in'])
+        if not total_drift and not drift['duplicates']:
+            self.stdout.write(self.style.SUCCESS("Part installations are consistent with the aircraft slots."))
+        elif check_only:
+            raise CommandError(f"{total_drift} part installation mismatches found. Run without --check to repair them.")
+        elif total_drift:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {total_drift} part installation mismatches."))
+        if drift['duplicates'] and not check_only:
+            raise CommandError(f"{len(drift['duplicates'])} parts are mounted on more than one aircraft.")
+
+    @staticmethod
+    def format_installation(installation):
+        if installation is None:
+            return '(none)'
+        aircraft_id, slot = installation
+        return f"aircraft {aircraft_id}/{slot}"
@@ -0,0 +1,22 @@
+# aircraft_production_app/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from aircraft_production_app.search import SEARCH_INDEXES, get_search_backend, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the n-gram search index used on databases without trigram/full-text support.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Number of rows indexed per batch.'
+        )
+
+    def handle(self, *args, **options):
+        for model in SEARCH_INDEXES:
+            if not get_search_backend(model).maintains_index:
+                self.stdout.write(f"  {model._meta.label}: served by database indexes, nothing to rebuild.")
+                continue
+            indexed_count = rebuild_search_index(model, chunk_size=options['chunk_size'])
+            self.stdout.write(f"  {model._meta.label}: indexed {indexed_count} rows.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuild finished."))
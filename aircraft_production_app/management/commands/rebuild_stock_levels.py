@@ -0,0 +1,31 @@
+# aircraft_production_app/management/commands/rebuild_stock_levels.py
+from django.core.management.base import BaseCommand, CommandError
+from aircraft_production_app.stock import sync_stock_levels
+
+
+class Command(BaseCommand):
+    help = 'Verifies the StockLevel/AircraftStockLevel summary tables against Part and Aircraft rows and repairs drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift; exit with an error if any is found.'
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        drift = sync_stock_levels(repair=not check_only)
+
+        total_drift = 0
+        for table_name, rows in drift.items():
+            for key, stored, expected in rows:
+                stored_display = '(missing)' if stored is None else stored
+                self.stdout.write(f"  {table_name} {key}: stored={stored_display} expected={expected}")
+            total_drift += len(rows)
+
+        if not total_drift:
+            self.stdout.write(self.style.SUCCESS("Stock level tables are consistent with the source rows."))
+        elif check_only:
+            raise CommandError(f"{total_drift} stock level rows have drifted. Run without --check to repair them.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {total_drift} stock level rows."))
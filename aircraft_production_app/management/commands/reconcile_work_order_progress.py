@@ -0,0 +1,27 @@
+# aircraft_production_app/management/commands/reconcile_work_order_progress.py
+from django.core.management.base import BaseCommand, CommandError
+from aircraft_production_app.progress import reconcile_work_order_progress
+
+
+class Command(BaseCommand):
+    help = 'Verifies WorkOrder.completed_count against linked aircraft and repairs drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift; exit with an error if any is found.'
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        drift = reconcile_work_order_progress(repair=not check_only)
+
+        for work_order_id, stored, actual in drift:
+            self.stdout.write(f"  WorkOrder #{work_order_id}: completed_count={stored} linked aircraft={actual}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Work order progress counters are consistent."))
+        elif check_only:
+            raise CommandError(f"{len(drift)} work orders have drifted. Run without --check to repair them.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drift)} work order counters."))
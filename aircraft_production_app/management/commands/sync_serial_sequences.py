@@ -0,0 +1,70 @@
+# aircraft_production_app/management/commands/sync_serial_sequences.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from aircraft_production_app.models import Part, Aircraft, SerialSequence
+
+
+class Command(BaseCommand):
+    help = 'Backfills SerialSequence counters from the serial numbers of existing parts and aircraft.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the counters that would change.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help='Number of serial numbers fetched per database round trip.'
+        )
+
+    def collect_max_suffixes(self, model, chunk_size):
+        """Modeldeki seri numaralarını ön eklerine ayırır ve her ön ek için en büyük sıra numarasını bulur."""
+        max_suffixes = {}
+        serials = model.objects.values_list('serial_number', flat=True).order_by()
+        for serial_number in serials.iterator(chunk_size=chunk_size):
+            if not serial_number or '-' not in serial_number:
+                continue
+            head, suffix = serial_number.rsplit('-', 1)
+            if not suffix.isdigit():
+                continue
+            prefix = f"{head}-"
+            max_suffixes[prefix] = max(max_suffixes.get(prefix, 0), int(suffix))
+        return max_suffixes
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        self.stdout.write("Scanning existing serial numbers...")
+        max_suffixes = self.collect_max_suffixes(Part, chunk_size)
+        max_suffixes.update(self.collect_max_suffixes(Aircraft, chunk_size))
+
+        existing = {
+            sequence.prefix: sequence
+            for sequence in SerialSequence.objects.select_for_update().filter(prefix__in=max_suffixes.keys())
+        }
+
+        to_create = []
+        to_update = []
+        for prefix, max_suffix in sorted(max_suffixes.items()):
+            sequence = existing.get(prefix)
+            if sequence is None:
+                to_create.append(SerialSequence(prefix=prefix, last_value=max_suffix))
+                self.stdout.write(f"  {prefix}: (none) -> {max_suffix}")
+            elif sequence.last_value < max_suffix:
+                self.stdout.write(f"  {prefix}: {sequence.last_value} -> {max_suffix}")
+                sequence.last_value = max_suffix
+                to_update.append(sequence)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f"Dry run: {len(to_create)} counters would be created, {len(to_update)} would be raised."
+            ))
+            return
+
+        SerialSequence.objects.bulk_create(to_create)
+        SerialSequence.objects.bulk_update(to_update, ['last_value'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Serial counters synchronised: {len(to_create)} created, {len(to_update)} raised, "
+            f"{len(max_suffixes) - len(to_create) - len(to_update)} already up to date."
+        ))
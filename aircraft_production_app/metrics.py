@@ -0,0 +1,294 @@
+# aircraft_production_app/metrics.py
+"""
+İstek başına SQL ve süre ölçümü, süreç içi histogramlar ve Prometheus metin formatında dışa aktarım.
+
+- Her bağlantıya bir kez kurulan execute wrapper (dispatch_query) sorguları içinde bulunulan isteğin ölçümüne
+  yönlendirir; sorgu sayısı, DB süresi ve tekrarlanan SQL parmak izleri (N+1 belirtisi) çözümlenen URL adı ve
+  HTTP metodu bazında toplanır. İstek ContextVar ile taşındığı için async ORM'in thread'de çalışan sorguları da sayılır.
+- Serializer süresi, serializer `.data` çağrıları ve liste projeksiyonlarının satır üretimi üzerinden ölçülür
+  (bkz. measure_serialization, instrument_serializers).
+- Histogramlar süreç içidir; birden fazla worker varsa Prometheus her süreci ayrı hedef olarak toplamalıdır.
+- Sorgu sayısı METRICS_QUERY_BUDGET değerini aşan istekler için en çok tekrarlanan SQL parmak izi loglanır.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+import logging
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+RESPONSE_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+UNMATCHED_VIEW = 'unmatched'
+
+_SQL_LITERAL_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),  # String sabitleri
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),  # Sayı sabitleri
+    (re.compile(r'%s'), '?'),  # Parametre yer tutucuları
+    (re.compile(r'"s\w+_x\w+"'), '"savepoint"'),  # Django savepoint adları
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),  # IN (?, ?, ...) listeleri
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def fingerprint_sql(sql):
+    """Parametre ve sabitlerden arındırılmış SQL; aynı sorgunun farklı parametrelerle tekrarları aynı izi verir."""
+    for pattern, replacement in _SQL_LITERAL_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class Histogram:
+    """Prometheus tarzı kümülatif histogram; `counts[i]`, `buckets[i]` değerine eşit veya küçük gözlemlerin sayısıdır."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Son eleman +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for count in self.counts:
+            total += count
+            yield total
+
+
+class RequestMetrics:
+    """Tek bir isteğin ölçümleri; execute_wrapper ve serializer ölçümü tarafından doldurulur."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.fingerprints = Counter()
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.query_count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    @property
+    def duplicate_queries(self):
+        """Aynı parmak izinin ilk çalıştırmadan sonraki tekrarlarının toplamı."""
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def most_repeated(self):
+        """(parmak izi, tekrar sayısı) veya sorgu yoksa None."""
+        return self.fingerprints.most_common(1)[0] if self.fingerprints else None
+
+
+_current_request = ContextVar('current_request_metrics', default=None)
+
+
+def dispatch_query(execute, sql, params, many, context):
+    """Bağlantılara kurulan execute wrapper'ı; istek dışındaki sorgular ölçülmeden çalışır."""
+    request_metrics = _current_request.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics(execute, sql, params, many, context)
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """
+    connection_created sinyali alıcısı (bkz. apps.py). Bağlantılar thread'e özel olduğundan wrapper istek
+    başına değil bağlantı başına kurulur; ASGI altında ORM'in kullandığı thread'in bağlantısı da ölçülür.
+    """
+    if dispatch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(dispatch_query)
+
+
+@contextmanager
+def measure_serialization():
+    """Bloğun süresini, içinde bulunulan isteğin serializer süresine ekler; iç içe bloklar bir kez sayılır."""
+    request_metrics = _current_request.get()
+    if request_metrics is None:
+        yield
+        return
+    request_metrics._serializer_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics._serializer_depth -= 1
+        if not request_metrics._serializer_depth:
+            request_metrics.serializer_seconds += time.perf_counter() - started
+
+
+def instrument_serializers():
+    """
+    DRF BaseSerializer.data özelliğini measure_serialization ile sarar (AppConfig.ready içinden bir kez çağrılır).
+    Serializer, ListSerializer ve iç içe serializer'lar BaseSerializer.data üzerinden geçtiği için tek noktadan ölçülür.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, 'measures_serialization', False):
+        return
+
+    def data(self):
+        with measure_serialization():
+            return original.fget(self)
+
+    data.measures_serialization = True
+    BaseSerializer.data = property(data)
+
+
+class MetricsRegistry:
+    """(view, metod) etiketli sayaç ve histogramları tutan, thread-safe süreç içi kayıt."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()  # (view, metod, durum) -> istek sayısı
+            self.duplicate_queries = Counter()  # (view, metod) -> tekrarlanan sorgu sayısı
+            self.budget_exceeded = Counter()  # (view, metod) -> bütçeyi aşan istek sayısı
+            self.histograms = {}  # (metrik adı, view, metod) -> Histogram
+
+    def _observe(self, name, buckets, labels, value):
+        histogram = self.histograms.get((name, *labels))
+        if histogram is None:
+            histogram = self.histograms[(name, *labels)] = Histogram(buckets)
+        histogram.observe(value)
+
+    def record(self, view, method, status, duration, request_metrics, response_bytes=None, over_budget=False):
+        labels = (view, method)
+        with self._lock:
+            self.requests[(view, method, status)] += 1
+            self.duplicate_queries[labels] += request_metrics.duplicate_queries
+            if over_budget:
+                self.budget_exceeded[labels] += 1
+            self._observe('http_request_duration_seconds', DURATION_BUCKETS, labels, duration)
+            self._observe('db_queries_per_request', QUERY_COUNT_BUCKETS, labels, request_metrics.query_count)
+            self._observe('db_duration_seconds', DURATION_BUCKETS, labels, request_metrics.db_seconds)
+            self._observe('serializer_duration_seconds', DURATION_BUCKETS, labels, request_metrics.serializer_seconds)
+            if response_bytes is not None:
+                self._observe('http_response_size_bytes', RESPONSE_SIZE_BUCKETS, labels, response_bytes)
+
+    def render_prometheus(self):
+        """Prometheus metin formatı (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            self._render_counter(lines, 'http_requests_total', 'Requests per view, method and status.',
+                                 self.requests, ('view', 'method', 'status'))
+            self._render_counter(lines, 'db_duplicate_queries_total', 'Repeated SQL fingerprints within a request (N+1 indicator).',
+                                 self.duplicate_queries, ('view', 'method'))
+            self._render_counter(lines, 'db_query_budget_exceeded_total', 'Requests that exceeded METRICS_QUERY_BUDGET.',
+                                 self.budget_exceeded, ('view', 'method'))
+            by_name = {}
+            for (name, *labels), histogram in sorted(self.histograms.items()):
+                by_name.setdefault(name, []).append((labels, histogram))
+            for name, series in by_name.items():
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), histogram in series:
+                    label_text = f'view="{_escape(view)}",method="{method}"'
+                    bounds = [_format_number(bound) for bound in histogram.buckets] + ['+Inf']
+                    for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{label_text}}} {_format_number(histogram.sum)}')
+                    lines.append(f'{name}_count{{{label_text}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_counter(lines, name, help_text, counter, label_names):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(counter.items()):
+            label_text = ','.join(f'{label}="{_escape(str(value_))}"' for label, value_ in zip(label_names, labels))
+            lines.append(f'{name}{{{label_text}}} {value}')
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+class QueryMetricsMiddleware:
+    """
+    Her isteğin SQL sorgularını ve süresini ölçer, sonuçları `registry` içine (view, metod) bazında kaydeder.
+    Akış (streaming) yanıtlarında gövde middleware'den sonra üretildiği için yalnızca görünüm süresi ölçülür.
+    Hem senkron hem async çalışır; ASGI altında async view'lar için thread'e geçiş eklemez.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        request_metrics = RequestMetrics()
+        token = _current_request.set(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self._record(request, response, request_metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return await self.get_response(request)
+
+        request_metrics = RequestMetrics()
+        token = _current_request.set(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        self._record(request, response, request_metrics, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _record(request, response, request_metrics, duration):
+        query_budget = getattr(settings, 'METRICS_QUERY_BUDGET', 0)
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNMATCHED_VIEW
+        over_budget = bool(query_budget) and request_metrics.query_count > query_budget
+        if over_budget:
+            fingerprint, repeats = request_metrics.most_repeated()
+            logger.warning(
+                "%s %s (%s) ran %d queries, budget is %d; most repeated SQL (%d times): %s",
+                request.method, request.path, view, request_metrics.query_count, query_budget, repeats, fingerprint,
+            )
+        response_bytes = None if response.streaming else len(response.content)
+        registry.record(
+            view, request.method, response.status_code, duration, request_metrics,
+            response_bytes=response_bytes, over_budget=over_budget,
+        )
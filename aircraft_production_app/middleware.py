@@ -0,0 +1,81 @@
+# aircraft_production_app/middleware.py
+"""
+Django'nun standart middleware'lerinin ASGI altında thread'e geçmeden çalışan alt sınıfları.
+
+MiddlewareMixin async modda her process_request/process_response çağrısını sync_to_async ile ayrı bir
+thread'de çalıştırır; standart yığında bu, istek başına bir düzine thread geçişi demektir. Buradaki sınıflar
+G/Ç yapmayan metotları doğrudan çalıştırır; oturum ve mesaj kaydı gibi veritabanına gidebilen adımlar yalnızca
+gerektiğinde thread'de çalışır. WSGI altında davranış üst sınıflarla aynıdır.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.middleware import clickjacking, common, csrf, security
+
+
+class InlineAsyncMiddlewareMixin:
+    """
+    MiddlewareMixin.__acall__ karşılığı. process_response yalnızca response_needs_thread() True döndüğünde
+    thread'de çalışır; process_request her zaman doğrudan çalışır ve G/Ç yapmamalıdır.
+    """
+
+    def response_needs_thread(self, request):
+        return False
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            if self.response_needs_thread(request):
+                response = await sync_to_async(self.process_response, thread_sensitive=True)(request, response)
+            else:
+                response = self.process_response(request, response)
+        return response
+
+
+class SecurityMiddleware(InlineAsyncMiddlewareMixin, security.SecurityMiddleware):
+    pass
+
+
+class SessionMiddleware(InlineAsyncMiddlewareMixin, sessions_middleware.SessionMiddleware):
+    """
+    Oturum nesnesi tembel yüklenir; yalnızca istek sırasında oturuma erişildiyse veya SESSION_SAVE_EVERY_REQUEST
+    açıksa (her yanıtta kaydedilir) kayıt için thread'e geçilir.
+    """
+
+    def response_needs_thread(self, request):
+        session = getattr(request, 'session', None)
+        if session is None:
+            return False
+        return settings.SESSION_SAVE_EVERY_REQUEST or session.accessed or session.modified
+
+
+class CommonMiddleware(InlineAsyncMiddlewareMixin, common.CommonMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(InlineAsyncMiddlewareMixin, csrf.CsrfViewMiddleware):
+    """CSRF_USE_SESSIONS açıksa token oturuma yazıldığından yanıt thread'de işlenir."""
+
+    def response_needs_thread(self, request):
+        return settings.CSRF_USE_SESSIONS
+
+
+class AuthenticationMiddleware(InlineAsyncMiddlewareMixin, auth_middleware.AuthenticationMiddleware):
+    """request.user tembel yüklenir; kullanıcı sorgusu ancak erişildiği yerde (view'da) çalışır."""
+
+
+class MessageMiddleware(InlineAsyncMiddlewareMixin, messages_middleware.MessageMiddleware):
+    """Mesaj okunduysa veya eklendiyse depolama (oturum/çerez) güncellemesi thread'de yapılır."""
+
+    def response_needs_thread(self, request):
+        storage = getattr(request, '_messages', None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class XFrameOptionsMiddleware(InlineAsyncMiddlewareMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
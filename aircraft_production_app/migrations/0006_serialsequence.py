@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0005_aircraft_assembled_by_personnel_aircraft_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerialSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=100, unique=True, verbose_name='Seri Numarası Ön Eki')),
+                ('last_value', models.PositiveBigIntegerField(default=0, verbose_name='Son Sıra Numarası')),
+            ],
+            options={
+                'verbose_name': 'Seri Numarası Sayacı',
+                'verbose_name_plural': 'Seri Numarası Sayaçları',
+            },
+        ),
+        # Aşağıdaki AlterField işlemleri SerialSequence ile ilgili değildir: 0005'ten sonra migration'ı yazılmadan
+        # değiştirilmiş model alanlarını (seçenekler, limit_choices_to, verbose_name) yakalar. Uygulanmış veritabanlarının
+        # migration geçmişi bozulmasın diye ayrı bir migration'a taşınmamıştır.
+        migrations.AlterField(
+            model_name='aircraft',
+            name='avionics',
+            field=models.OneToOneField(blank=True, limit_choices_to={'part_type__category': 'AVIONICS', 'status': 'AVAILABLE'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aircraft_as_avionics', to='aircraft_production_app.part', verbose_name='Aviyonik Sistem (Parça SN)'),
+        ),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='fuselage',
+            field=models.OneToOneField(blank=True, limit_choices_to={'part_type__category': 'FUSELAGE', 'status': 'AVAILABLE'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aircraft_as_fuselage', to='aircraft_production_app.part', verbose_name='Gövde (Parça SN)'),
+        ),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='status',
+            field=models.CharField(choices=[('AVAILABLE', 'Hazır'), ('SOLD', 'Satıldı'), ('MAINTENANCE', 'Bakımda'), ('RECYCLED', 'Geri dönüştürüldü')], default='AVAILABLE', max_length=20, verbose_name='Uçak Durumu'),
+        ),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='tail',
+            field=models.OneToOneField(blank=True, limit_choices_to={'part_type__category': 'TAIL', 'status': 'AVAILABLE'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aircraft_as_tail', to='aircraft_production_app.part', verbose_name='Kuyruk (Parça SN)'),
+        ),
+        migrations.AlterField(
+            model_name='aircraft',
+            name='wing',
+            field=models.OneToOneField(blank=True, limit_choices_to={'part_type__category': 'WING', 'status': 'AVAILABLE'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aircraft_as_wing', to='aircraft_production_app.part', verbose_name='Kanat (Parça SN)'),
+        ),
+        migrations.AlterField(
+            model_name='aircraftmodel',
+            name='name',
+            field=models.CharField(choices=[('TB2', 'TB2'), ('TB3', 'TB3'), ('AKINCI', 'AKINCI'), ('KIZILELMA', 'KIZILELMA')], max_length=50, unique=True, verbose_name='Hava Aracı Modeli Adı'),
+        ),
+    ]
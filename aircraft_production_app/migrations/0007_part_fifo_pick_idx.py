@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0006_serialsequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['aircraft_model_compatibility', 'part_type', 'status', 'production_date'], name='part_fifo_pick_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0007_part_fifo_pick_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AircraftStockLevel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('AVAILABLE', 'Hazır'), ('SOLD', 'Satıldı'), ('MAINTENANCE', 'Bakımda'), ('RECYCLED', 'Geri dönüştürüldü')], max_length=20, verbose_name='Uçak Durumu')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Adet')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='aircraft_production_app.aircraftmodel', verbose_name='Hava Aracı Modeli')),
+                ('assembled_by_team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='aircraft_production_app.team', verbose_name='Montajı Yapan Takım')),
+            ],
+            options={
+                'verbose_name': 'Uçak Stok Seviyesi',
+                'verbose_name_plural': 'Uçak Stok Seviyeleri',
+                'constraints': [models.UniqueConstraint(fields=('aircraft_model', 'assembled_by_team', 'status'), name='unique_aircraft_stock_level')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockLevel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('AVAILABLE', 'Kullanıma Hazır'), ('USED', 'Kullanıldı'), ('RECYCLED', 'Geri Dönüştürüldü')], max_length=20, verbose_name='Parça Durumu')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Adet')),
+                ('aircraft_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='aircraft_production_app.aircraftmodel', verbose_name='Hava Aracı Modeli')),
+                ('part_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='aircraft_production_app.parttype', verbose_name='Parça Tipi')),
+            ],
+            options={
+                'verbose_name': 'Parça Stok Seviyesi',
+                'verbose_name_plural': 'Parça Stok Seviyeleri',
+                'constraints': [models.UniqueConstraint(fields=('aircraft_model', 'part_type', 'status'), name='unique_part_stock_level')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# aircraft_production_app/migrations/0009_populate_stock_levels.py
+from django.db import migrations
+from django.db.models import Count
+
+PART_STATUSES = ["AVAILABLE", "USED", "RECYCLED"]
+
+
+def populate_stock_levels(apps, schema_editor):
+    """Stok özet tablolarını mevcut Part ve Aircraft kayıtlarından doldurur."""
+    AircraftModel = apps.get_model('aircraft_production_app', 'AircraftModel')
+    PartType = apps.get_model('aircraft_production_app', 'PartType')
+    Part = apps.get_model('aircraft_production_app', 'Part')
+    Aircraft = apps.get_model('aircraft_production_app', 'Aircraft')
+    StockLevel = apps.get_model('aircraft_production_app', 'StockLevel')
+    AircraftStockLevel = apps.get_model('aircraft_production_app', 'AircraftStockLevel')
+    db_alias = schema_editor.connection.alias
+
+    part_counts = {
+        (row['aircraft_model_compatibility_id'], row['part_type_id'], row['status']): row['count']
+        for row in Part.objects.using(db_alias).order_by().values(
+            'aircraft_model_compatibility_id', 'part_type_id', 'status'
+        ).annotate(count=Count('id'))
+    }
+    # Tüm (model, tip, durum) kombinasyonları için satır oluşturulur; artımlı güncellemeler hep UPDATE olur.
+    for aircraft_model_id in AircraftModel.objects.using(db_alias).values_list('id', flat=True):
+        for part_type_id in PartType.objects.using(db_alias).values_list('id', flat=True):
+            for status in PART_STATUSES:
+                part_counts.setdefault((aircraft_model_id, part_type_id, status), 0)
+    StockLevel.objects.using(db_alias).bulk_create([
+        StockLevel(aircraft_model_id=aircraft_model_id, part_type_id=part_type_id, status=status, count=count)
+        for (aircraft_model_id, part_type_id, status), count in part_counts.items()
+    ])
+
+    AircraftStockLevel.objects.using(db_alias).bulk_create([
+        AircraftStockLevel(
+            aircraft_model_id=row['aircraft_model_id'], assembled_by_team_id=row['assembled_by_team_id'],
+            status=row['status'], count=row['count']
+        )
+        for row in Aircraft.objects.using(db_alias).order_by().values(
+            'aircraft_model_id', 'assembled_by_team_id', 'status'
+        ).annotate(count=Count('id'))
+    ])
+
+
+def clear_stock_levels(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    apps.get_model('aircraft_production_app', 'StockLevel').objects.using(db_alias).all().delete()
+    apps.get_model('aircraft_production_app', 'AircraftStockLevel').objects.using(db_alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0008_stock_levels'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_stock_levels, reverse_code=clear_stock_levels),
+    ]
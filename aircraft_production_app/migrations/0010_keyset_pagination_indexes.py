@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0009_populate_stock_levels'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aircraft',
+            index=models.Index(fields=['assembly_date', 'id'], name='aircraft_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='part',
+            index=models.Index(fields=['production_date', 'id'], name='part_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:28
+
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+NGRAM_SIZE = 3
+# (model, alan) çiftleri; bkz. aircraft_production_app/search.py SEARCH_INDEXES
+TRIGRAM_FIELDS = [('Part', 'serial_number'), ('Aircraft', 'serial_number')]
+FULLTEXT_FIELDS = [('WorkOrder', 'notes')]
+
+
+def _postgres_indexes():
+    """PostgreSQL'e özgü arama indekslerini (model adı, indeks) olarak döndürür."""
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.contrib.postgres.search import SearchVector
+
+    indexes = [
+        (model_name, GinIndex(OpClass(Upper(field_name), name='gin_trgm_ops'), name=f'{model_name.lower()}_{field_name}_trgm_idx'))
+        for model_name, field_name in TRIGRAM_FIELDS
+    ]
+    indexes += [
+        (model_name, GinIndex(SearchVector(field_name, config='simple'), name=f'{model_name.lower()}_{field_name}_fts_idx'))
+        for model_name, field_name in FULLTEXT_FIELDS
+    ]
+    return indexes
+
+
+def _ngrams(text):
+    text = (text or '').upper()
+    return {text[index:index + NGRAM_SIZE] for index in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def create_search_indexes(apps, schema_editor):
+    """PostgreSQL'de trigram/tam metin indekslerini oluşturur, diğer veritabanlarında n-gram tablosunu doldurur."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for model_name, index in _postgres_indexes():
+            schema_editor.add_index(apps.get_model('aircraft_production_app', model_name), index)
+        return
+
+    SearchNgram = apps.get_model('aircraft_production_app', 'SearchNgram')
+    db_alias = schema_editor.connection.alias
+    for model_name, field_name in TRIGRAM_FIELDS + FULLTEXT_FIELDS:
+        model = apps.get_model('aircraft_production_app', model_name)
+        SearchNgram.objects.using(db_alias).bulk_create([
+            SearchNgram(model_label=f'aircraft_production_app.{model_name.lower()}', field_name=field_name, gram=gram, object_id=object_id)
+            for object_id, value in model.objects.using(db_alias).values_list('pk', field_name).iterator()
+            for gram in _ngrams(value)
+        ], batch_size=1000)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for model_name, index in _postgres_indexes():
+            schema_editor.remove_index(apps.get_model('aircraft_production_app', model_name), index)
+        return
+    apps.get_model('aircraft_production_app', 'SearchNgram').objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchNgram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=64, verbose_name='Model')),
+                ('field_name', models.CharField(max_length=64, verbose_name='Alan')),
+                ('gram', models.CharField(max_length=3, verbose_name='N-gram')),
+                ('object_id', models.BigIntegerField(verbose_name='Kayıt ID')),
+            ],
+            options={
+                'verbose_name': 'Arama N-gramı',
+                'verbose_name_plural': 'Arama N-gramları',
+                'indexes': [models.Index(fields=['model_label', 'object_id'], name='search_ngram_object_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'field_name', 'gram', 'object_id'), name='unique_search_ngram')],
+            },
+        ),
+        migrations.RunPython(create_search_indexes, reverse_code=drop_search_indexes),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:35
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_completed_count(apps, schema_editor):
+    """completed_count sütununu mevcut bağlı uçak sayılarıyla tek UPDATE ile doldurur."""
+    WorkOrder = apps.get_model('aircraft_production_app', 'WorkOrder')
+    Aircraft = apps.get_model('aircraft_production_app', 'Aircraft')
+    db_alias = schema_editor.connection.alias
+    linked_count = Aircraft.objects.using(db_alias).filter(work_order=OuterRef('pk')).order_by().values('work_order').annotate(count=Count('id')).values('count')
+    WorkOrder.objects.using(db_alias).update(
+        completed_count=Coalesce(Subquery(linked_count, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0011_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workorder',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bağlı uçak sayısı; uçak eklendiğinde/ayrıldığında atomik olarak güncellenir (bkz. WorkOrderManager.apply_progress).', verbose_name='Monte Edilen Uçak Sayısı'),
+        ),
+        migrations.RunPython(populate_completed_count, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0012_workorder_completed_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('PART', 'Parça'), ('AIRCRAFT', 'Hava Aracı'), ('WORK_ORDER', 'İş Emri')], max_length=12, verbose_name='Kayıt Türü')),
+                ('entity_id', models.BigIntegerField(verbose_name='Kayıt ID')),
+                ('serial_number', models.CharField(blank=True, default='', max_length=50, verbose_name='Seri Numarası')),
+                ('event_type', models.CharField(choices=[('PART_PRODUCED', 'Parça Üretildi'), ('PART_USED', 'Parça Uçağa Takıldı'), ('PART_FREED', 'Parça Kullanıma Hazır'), ('PART_RECYCLED', 'Parça Geri Dönüştürüldü'), ('AIRCRAFT_ASSEMBLED', 'Hava Aracı Monte Edildi'), ('AIRCRAFT_STATUS_CHANGED', 'Hava Aracı Durumu Değişti'), ('AIRCRAFT_RECYCLED', 'Hava Aracı Geri Dönüştürüldü'), ('WORK_ORDER_CREATED', 'İş Emri Oluşturuldu'), ('WORK_ORDER_STATUS_CHANGED', 'İş Emri Durumu Değişti')], max_length=32, verbose_name='Olay')),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Zaman')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Ayrıntılar')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='aircraft_production_app.team', verbose_name='Takım')),
+            ],
+            options={
+                'verbose_name': 'Üretim Olayı',
+                'verbose_name_plural': 'Üretim Olayları',
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['entity_type', 'entity_id', 'occurred_at'], name='production_event_entity_idx'), models.Index(fields=['serial_number', 'occurred_at'], name='production_event_serial_idx'), models.Index(fields=['occurred_at', 'id'], name='production_event_keyset_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-17 12:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+PART_SLOT_FIELDS = ('wing', 'fuselage', 'tail', 'avionics')
+
+
+def populate_installed_in(apps, schema_editor):
+    """installed_in/installed_slot sütunlarını uçak yuvalarından yuva başına tek UPDATE ile doldurur."""
+    Part = apps.get_model('aircraft_production_app', 'Part')
+    Aircraft = apps.get_model('aircraft_production_app', 'Aircraft')
+    db_alias = schema_editor.connection.alias
+    for slot in PART_SLOT_FIELDS:
+        installed_aircraft = Aircraft.objects.using(db_alias).filter(**{slot: OuterRef('pk')}).values('pk')[:1]
+        Part.objects.using(db_alias).filter(**{f'aircraft_as_{slot}__isnull': False}).update(
+            installed_in=Subquery(installed_aircraft), installed_slot=slot
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aircraft_production_app', '0013_production_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='part',
+            name='installed_in',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='installed_parts', to='aircraft_production_app.aircraft', verbose_name='Takılı Olduğu Uçak'),
+        ),
+        migrations.AddField(
+            model_name='part',
+            name='installed_slot',
+            field=models.CharField(blank=True, choices=[('wing', 'Kanat'), ('fuselage', 'Gövde'), ('tail', 'Kuyruk'), ('avionics', 'Aviyonik')], editable=False, max_length=20, verbose_name='Takılı Olduğu Yuva'),
+        ),
+        migrations.RunPython(populate_installed_in, reverse_code=migrations.RunPython.noop),
+    ]
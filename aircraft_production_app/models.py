@@ -3,10 +3,17 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction # Atomik işlemler için
-from django.db.models import Max # Max'ı import ettiğinizden emin olun
+from django.db import transaction, connections, IntegrityError # Atomik işlemler için
+from django.db.models import F, Q, Case, When, Value
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThan
+from collections import Counter
 from django.templatetags.static import static
+from django.utils import timezone
 from django.core.exceptions import ValidationError as DjangoValidationError 
+from .counts import invalidate_counts_on_commit
+from .events import record_events
+from .live import publish_stock_deltas
 
 
 # === SABİT TANIMLI BİLGİLER ===
@@ -49,6 +56,15 @@ class PartStatusChoices(models.TextChoices):
     RECYCLED = "RECYCLED", "Geri Dönüştürüldü"
     # IN_PRODUCTION ve DEFECTIVE gibi durumlar eklenebilir, şimdilik bunlar kullanılıyor.
 
+class PartSlotChoices(models.TextChoices):
+    """
+    Parçanın uçak üzerinde takıldığı yuva. Değerler Aircraft üzerindeki parça alan adlarıyla aynıdır.
+    """
+    WING = "wing", "Kanat"
+    FUSELAGE = "fuselage", "Gövde"
+    TAIL = "tail", "Kuyruk"
+    AVIONICS = "avionics", "Aviyonik"
+
 class AircraftStatusChoices(models.TextChoices):
     """
     Monte edilmiş hava araçlarının sahip olabileceği durumları tanımlar.
@@ -58,8 +74,196 @@ class AircraftStatusChoices(models.TextChoices):
     MAINTENANCE = "MAINTENANCE", "Bakımda"
     RECYCLED = "RECYCLED", "Geri dönüştürüldü"
 
+class EventEntityChoices(models.TextChoices):
+    """
+    Üretim olay günlüğündeki kayıt türleri.
+    """
+    PART = "PART", "Parça"
+    AIRCRAFT = "AIRCRAFT", "Hava Aracı"
+    WORK_ORDER = "WORK_ORDER", "İş Emri"
+
+class ProductionEventTypeChoices(models.TextChoices):
+    """
+    Üretim olay günlüğüne yazılan olay tipleri.
+    """
+    PART_PRODUCED = "PART_PRODUCED", "Parça Üretildi"
+    PART_USED = "PART_USED", "Parça Uçağa Takıldı"
+    PART_FREED = "PART_FREED", "Parça Kullanıma Hazır"
+    PART_RECYCLED = "PART_RECYCLED", "Parça Geri Dönüştürüldü"
+    AIRCRAFT_ASSEMBLED = "AIRCRAFT_ASSEMBLED", "Hava Aracı Monte Edildi"
+    AIRCRAFT_STATUS_CHANGED = "AIRCRAFT_STATUS_CHANGED", "Hava Aracı Durumu Değişti"
+    AIRCRAFT_RECYCLED = "AIRCRAFT_RECYCLED", "Hava Aracı Geri Dönüştürüldü"
+    WORK_ORDER_CREATED = "WORK_ORDER_CREATED", "İş Emri Oluşturuldu"
+    WORK_ORDER_STATUS_CHANGED = "WORK_ORDER_STATUS_CHANGED", "İş Emri Durumu Değişti"
+
+# Parçanın yeni durumuna karşılık gelen olay tipi.
+PART_STATUS_EVENT_TYPES = {
+    PartStatusChoices.USED: ProductionEventTypeChoices.PART_USED,
+    PartStatusChoices.AVAILABLE: ProductionEventTypeChoices.PART_FREED,
+    PartStatusChoices.RECYCLED: ProductionEventTypeChoices.PART_RECYCLED,
+}
+
+# Seri numaralarında parça kategorisini temsil eden kısaltmalar.
+PART_TYPE_ABBREVIATIONS = {
+    PartCategory.AVIONICS: "AVY",
+    PartCategory.WING: "KNT",
+    PartCategory.FUSELAGE: "GVD",
+    PartCategory.TAIL: "KYR",
+}
+
+PART_SERIAL_DIGITS = 5 # TB2-KNT-00001
+AIRCRAFT_SERIAL_DIGITS = 4 # TB2-0001
+
+
+# === SERİ NUMARASI SAYAÇLARI ===
+
+def max_serial_suffix(queryset, prefix):
+    """
+    Verilen queryset içinde `prefix` ile başlayan seri numaralarının en büyük sıra numarasını döndürür.
+    Sıra numarası sayısal olarak karşılaştırılır (string MAX, hane sayısı aşıldığında yanlış sonuç verir).
+    """
+    max_suffix = 0
+    serials = queryset.filter(serial_number__startswith=prefix).values_list('serial_number', flat=True)
+    for serial_number in serials.iterator(chunk_size=2000):
+        suffix = serial_number[len(prefix):]
+        if suffix.isdigit():
+            max_suffix = max(max_suffix, int(suffix))
+    return max_suffix
+
+
+class SerialSequenceManager(models.Manager):
+    """
+    Seri numarası sayaçlarını satır kilidiyle, sabit zamanda artıran manager.
+    """
+
+    def reserve(self, prefix, count=1, seed=None):
+        """
+        `prefix` için ardışık `count` adet sıra numarası ayırır ve ilk numarayı döndürür.
+        Ayrılan aralık [ilk, ilk + count) şeklindedir.
+
+        Sayaç satırı UPDATE ile artırıldığı için satır kilidi transaction sonuna kadar tutulur;
+        eşzamanlı istekler aynı numarayı alamaz. Sayaç satırı yoksa `seed()` çağrılarak
+        mevcut kayıtlardaki en büyük sıra numarasıyla başlatılır.
+        """
+        if count < 1:
+            raise ValueError("count en az 1 olmalıdır.")
+
+        with transaction.atomic(using=self.db):
+            last_value = self._increment(prefix, count)
+            if last_value is None:
+                initial_value = seed() if seed else 0
+                try:
+                    with transaction.atomic(using=self.db):
+                        self.create(prefix=prefix, last_value=initial_value + count)
+                    return initial_value + 1
+                except IntegrityError:
+                    # Başka bir istek sayacı aynı anda oluşturdu; onun üzerinden devam et.
+                    last_value = self._increment(prefix, count)
+        return last_value - count + 1
+
+    def _increment(self, prefix, count):
+        """Sayacı artırır ve yeni son değeri döndürür. Sayaç yoksa None döner."""
+        connection = connections[self.db]
+        if connection.vendor == 'postgresql':
+            # Tek sorguda artır ve oku: UPDATE ... RETURNING
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {self.model._meta.db_table} SET last_value = last_value + %s '
+                    f'WHERE prefix = %s RETURNING last_value',
+                    [count, prefix]
+                )
+                row = cursor.fetchone()
+            return row[0] if row else None
+
+        if not self.filter(prefix=prefix).update(last_value=F('last_value') + count):
+            return None
+        return self.filter(prefix=prefix).values_list('last_value', flat=True).get()
+
+
+class SerialSequence(models.Model):
+    """
+    Seri numarası ön eki (örn: "TB2-KNT-" veya "TB2-") başına son verilen sıra numarasını tutar.
+    Parça ve uçak seri numaraları bu tablo üzerinden sabit zamanda ve çakışmasız atanır.
+    """
+    prefix = models.CharField(max_length=100, unique=True, verbose_name="Seri Numarası Ön Eki")
+    last_value = models.PositiveBigIntegerField(default=0, verbose_name="Son Sıra Numarası")
+
+    objects = SerialSequenceManager()
+
+    def __str__(self):
+        return f"{self.prefix}{self.last_value}"
+
+    class Meta:
+        """Meta seçenekleri."""
+        verbose_name = "Seri Numarası Sayacı"
+        verbose_name_plural = "Seri Numarası Sayaçları"
+
+
+# === ALAN DEĞİŞİKLİK TAKİBİ ===
+
+class TrackedFieldsMixin:
+    """
+    Veritabanından yüklenen (veya son kaydedilen) alan değerlerini saklar.
+    Kayıt sonrası sinyaller, bir alanın eski değerini ek sorgu yapmadan bu anlık görüntüden okur.
+    `tracked_fields` alan attname'lerini içerir (örn: 'part_type_id').
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            attname: value for attname, value in zip(field_names, values)
+            if attname in cls.tracked_fields and value is not models.DEFERRED
+        }
+        return instance
+
+    def get_loaded_values(self):
+        """Takip edilen alanların yüklendiği andaki değerleri; yeni veya anlık görüntüsüz nesnede None."""
+        loaded_values = getattr(self, '_loaded_values', None)
+        if loaded_values is None or len(loaded_values) != len(self.tracked_fields):
+            return None
+        return loaded_values
+
+    def snapshot_tracked_fields(self):
+        """Takip edilen alanların güncel değerlerini yeni anlık görüntü olarak saklar."""
+        self._loaded_values = {attname: getattr(self, attname) for attname in self.tracked_fields}
+
+
 # === MODELLER ===
 
+def count_subquery(model, team_field, **filters):
+    """`model` tablosunda dış sorgudaki takıma bağlı (ve filtrelere uyan) satır sayısını veren alt sorgu."""
+    counts = (
+        model.objects.filter(**{team_field: models.OuterRef('pk')}, **filters)
+        .order_by().values(team_field).annotate(total=models.Count('pk')).values('total')
+    )
+    return Coalesce(models.Subquery(counts, output_field=models.IntegerField()), 0)
+
+
+class TeamQuerySet(models.QuerySet):
+    """Takım listeleri için toplu istatistikler."""
+
+    def with_stats(self, since=None):
+        """
+        Personel sayısını, durum bazında üretilen parça ve monte edilen uçak sayılarını tek sorguda
+        alt sorgularla ekler. `since` verilirse o andan sonra üretilen/monte edilenler de sayılır.
+        Team.personnel_count ve get_produced_item_count bu anotasyonları kullanır.
+        """
+        annotations = {
+            'member_total': count_subquery(Personnel, 'team'),
+            'aircraft_total': count_subquery(Aircraft, 'assembled_by_team'),
+            **{
+                f'parts_{status.lower()}': count_subquery(Part, 'produced_by_team', status=status)
+                for status in PartStatusChoices.values
+            },
+        }
+        if since is not None:
+            annotations['recent_part_total'] = count_subquery(Part, 'produced_by_team', production_date__gte=since)
+            annotations['recent_aircraft_total'] = count_subquery(Aircraft, 'assembled_by_team', assembly_date__gte=since)
+        return self.annotate(**annotations)
+
+
 class Team(models.Model):
     """
     Üretim veya montaj takımlarını temsil eder.
@@ -72,6 +276,8 @@ class Team(models.Model):
         verbose_name="Takım Tipi"
     )
 
+    objects = TeamQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.get_team_type_display()})"
 
@@ -101,8 +307,12 @@ class Team(models.Model):
     def get_produced_item_count(self):
         """
         Takımın tipine göre ürettiği toplam ürün (uçak veya parça) sayısını döndürür.
-        Tüm durumlar dahildir.
+        Tüm durumlar dahildir. Takım with_stats() ile okunduysa sorgu yapılmaz.
         """
+        if hasattr(self, 'aircraft_total'):
+            if self.team_type == DefinedTeamTypes.ASSEMBLY_TEAM:
+                return self.aircraft_total
+            return sum(getattr(self, f'parts_{status.lower()}') for status in PartStatusChoices.values)
         if self.team_type == DefinedTeamTypes.ASSEMBLY_TEAM:
             # Aircraft modelindeki 'assembled_aircrafts' related_name'i kullanılıyor.
             if hasattr(self, 'aircraft_set'):
@@ -117,6 +327,8 @@ class Team(models.Model):
         Bu takımdaki kayıtlı personel sayısını döndürür.
         """
         # Personnel modelindeki 'team' ForeignKey'inin related_name'i 'members' idi.
+        if hasattr(self, 'member_total'):
+            return self.member_total
         return self.members.count()
     personnel_count.short_description = "Personel Sayısı" # Admin panelindeki sütun başlığı
 
@@ -246,7 +458,71 @@ class WorkOrderStatusChoices(models.TextChoices):
     COMPLETED = "COMPLETED", "Tamamlandı"
     CANCELLED = "CANCELLED", "İptal Edildi"
 
-class WorkOrder(models.Model):
+class WorkOrderManager(models.Manager):
+    """İş emri ilerleme sayacı (completed_count) için atomik güncellemeler."""
+
+    @staticmethod
+    def progress_status_expression(new_count):
+        """
+        Yeni uçak sayısına (`new_count` ifadesi) göre durumu hesaplayan koşullu ifade.
+        Tamamlanmış veya iptal edilmiş iş emirlerinin durumu korunur.
+        """
+        return Case(
+            When(status__in=[WorkOrderStatusChoices.COMPLETED, WorkOrderStatusChoices.CANCELLED], then=F('status')),
+            When(quantity__lte=new_count, then=Value(WorkOrderStatusChoices.COMPLETED.value)),
+            When(GreaterThan(new_count, 0), then=Value(WorkOrderStatusChoices.IN_PROGRESS.value)),
+            When(assigned_to_assembly_team__isnull=False, then=Value(WorkOrderStatusChoices.ASSIGNED.value)),
+            default=Value(WorkOrderStatusChoices.PENDING.value),
+        )
+
+    def apply_progress(self, deltas):
+        """
+        {iş_emri_id: fark} sözlüğündeki farkları completed_count sütununa F() ile ekler ve durumu
+        aynı koşullu UPDATE içinde yeni sayıdan türetir. Sinyal göndermeyen toplu işlemler de bunu çağırır.
+        """
+        deltas = {work_order_id: delta for work_order_id, delta in deltas.items() if work_order_id and delta}
+        if not deltas:
+            return
+        with transaction.atomic(using=self.db):
+            old_statuses = dict(self.filter(pk__in=deltas).values_list('pk', 'status'))
+            now = timezone.now()
+            for work_order_id, delta in deltas.items():
+                new_count = F('completed_count') + delta
+                self.filter(pk=work_order_id).update(
+                    completed_count=new_count,
+                    status=self.progress_status_expression(new_count),
+                    updated_at=now,
+                )
+            self._record_status_changes(old_statuses)
+
+    def refresh_progress_status(self, work_order_ids):
+        """
+        Durumu veritabanındaki güncel completed_count değerinden tek UPDATE ile yeniden hesaplar
+        (örn: miktar değiştiğinde). Sayaç değişmez.
+        """
+        with transaction.atomic(using=self.db):
+            old_statuses = dict(self.filter(pk__in=work_order_ids).values_list('pk', 'status'))
+            self.filter(pk__in=work_order_ids).update(
+                status=self.progress_status_expression(F('completed_count')),
+                updated_at=timezone.now(),
+            )
+            self._record_status_changes(old_statuses)
+
+    def _record_status_changes(self, old_statuses):
+        """{iş_emri_id: eski_durum} sözlüğüne göre değişen durumları olay günlüğüne yazar."""
+        record_events([
+            ProductionEvent.build(
+                EventEntityChoices.WORK_ORDER, ProductionEventTypeChoices.WORK_ORDER_STATUS_CHANGED, pk,
+                team_id=team_id, from_status=old_statuses[pk], to_status=status, completed_count=completed_count
+            )
+            for pk, status, team_id, completed_count in self.filter(pk__in=old_statuses).values_list(
+                'pk', 'status', 'assigned_to_assembly_team_id', 'completed_count'
+            )
+            if old_statuses.get(pk) not in (None, status)
+        ], using=self.db)
+
+
+class WorkOrder(TrackedFieldsMixin, models.Model):
     """
     Belirli bir modelden belirli sayıda hava aracının üretilmesi için oluşturulan iş emirlerini temsil eder.
     İş emirleri yöneticiler tarafından oluşturulur ve montaj takımlarına atanabilir.
@@ -281,19 +557,59 @@ class WorkOrder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
     target_completion_date = models.DateField(null=True, blank=True, verbose_name="Hedef Tamamlanma Tarihi")
+    completed_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Monte Edilen Uçak Sayısı",
+        help_text="Bağlı uçak sayısı; uçak eklendiğinde/ayrıldığında atomik olarak güncellenir (bkz. WorkOrderManager.apply_progress)."
+    )
+
+    objects = WorkOrderManager()
+
+    # Durum geçişleri olay günlüğüne kayıttan sonraki sinyalde yazılır (bkz. signals.py).
+    tracked_fields = ('status', 'quantity')
 
     def save(self, *args, **kwargs):
         """
         İş emri kaydedilirken özel mantık uygular:
         - Yeni oluşturulan bir iş emri ise ve bir montaj takımına atanmışsa durumunu 'ASSIGNED',
           atanmamışsa 'PENDING' olarak ayarlar.
+        - Mevcut iş emrinde completed_count (ve elle değiştirilmediyse status) yazılmaz; bu alanlar
+          apply_progress ile eşzamanlı güncellenir ve bayat bir nesne onları geri almamalıdır.
+          Miktar değiştiyse durum güncel sayaçtan veritabanında yeniden hesaplanır.
         """
         if not self.pk:
             if self.assigned_to_assembly_team:
                 self.status = WorkOrderStatusChoices.ASSIGNED
             else:
                 self.status = WorkOrderStatusChoices.PENDING
+        elif kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            loaded_values = self.get_loaded_values()
+            status_changed = loaded_values is None or loaded_values['status'] != self.status
+            quantity_changed = loaded_values is not None and loaded_values['quantity'] != self.quantity
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname != 'completed_count'
+                and (status_changed or field.attname != 'status')
+            ]
+            with transaction.atomic(using=kwargs.get('using') or self._state.db):
+                super().save(*args, **kwargs)
+                if quantity_changed and not status_changed:
+                    WorkOrder.objects.db_manager(self._state.db).refresh_progress_status([self.pk])
+                self.refresh_from_db(fields=['completed_count', 'status', 'updated_at'])
+            self.snapshot_tracked_fields()
+            return
         super().save(*args, **kwargs) # Asıl kaydetme işlemini yap
+        self.snapshot_tracked_fields()
+
+    def apply_progress(self, delta):
+        """
+        Uçak sayacına farkı ekler, durumu veritabanında tek UPDATE ile günceller ve
+        nesnedeki completed_count/status/updated_at değerlerini yeniler.
+        """
+        WorkOrder.objects.apply_progress({self.pk: delta})
+        self.refresh_from_db(fields=['completed_count', 'status', 'updated_at'])
+        self.snapshot_tracked_fields()
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
@@ -303,13 +619,11 @@ class WorkOrder(models.Model):
         - Bu iş emriyle ilişkili tüm monte edilmiş hava araçlarının 'work_order' alanını None yapar,
           böylece uçaklar iş emrinden ayrılır ancak var olmaya devam eder.
         """
-        for aircraft in self.completed_aircrafts_for_order.all():
-            aircraft.work_order = None
-            aircraft.save()
-
+        from .recycling import cancel_work_orders # recycling modülü models'i import eder
+        cancel_work_orders(WorkOrder.objects.filter(pk=self.pk))
         self.status = WorkOrderStatusChoices.CANCELLED
-        self.save() # Durumu güncelle, fiziksel olarak silme
-        print(f"WorkOrder ID: {self.id} status set to CANCELLED and unlinked from aircraft (soft delete).")
+        self.completed_count = 0
+        self.snapshot_tracked_fields()
 
     def __str__(self):
         """
@@ -323,7 +637,72 @@ class WorkOrder(models.Model):
         verbose_name_plural = "İş Emirleri"
         ordering = ['-created_at'] # Varsayılan sıralama: en yeni iş emri en üstte
 
-class Part(models.Model):
+class PartQuerySet(models.QuerySet):
+    """Part için toplu işlemler."""
+
+    STATUS_UPDATE_BATCH_SIZE = 500
+
+    def set_status(self, status, installations=None):
+        """
+        Queryset'teki parçaların durumunu toplu UPDATE ile değiştirir ve stok özet tablosunu günceller.
+        Zaten istenen durumda olan parçalar atlanır; güncellenen satır sayısı döner.
+        Satırlar önce kilitlenerek okunur, böylece dönen sayı ve stok farkları kesindir.
+        Takılı olduğu uçak bilgisi (installed_in, installed_slot) aynı UPDATE ile güncellenir:
+        'USED' için `installations` {parça_id: (uçak_id, yuva)} sözlüğünden yazılır, diğer durumlarda temizlenir.
+        """
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.exclude(status=status).select_for_update(of=('self',)).order_by()
+                .values_list('pk', 'aircraft_model_compatibility_id', 'part_type_id', 'status', 'serial_number', 'produced_by_team_id')
+            )
+            if not rows:
+                return 0
+
+            now = timezone.now()
+            updated_count = 0
+            for start in range(0, len(rows), self.STATUS_UPDATE_BATCH_SIZE):
+                batch_ids = [row[0] for row in rows[start:start + self.STATUS_UPDATE_BATCH_SIZE]]
+                updated_count += self.model.objects.filter(pk__in=batch_ids).update(
+                    status=status, updated_at=now, **self._installation_updates(status, batch_ids, installations)
+                )
+
+            stock_deltas = Counter()
+            events = []
+            for pk, aircraft_model_id, part_type_id, old_status, serial_number, team_id in rows:
+                stock_deltas[(aircraft_model_id, part_type_id, old_status)] -= 1
+                stock_deltas[(aircraft_model_id, part_type_id, status)] += 1
+                events.append(ProductionEvent.build(
+                    EventEntityChoices.PART, PART_STATUS_EVENT_TYPES[status], pk, serial_number, team_id, from_status=old_status
+                ))
+            StockLevel.objects.apply_deltas(stock_deltas)
+            record_events(events, using=self.db)
+            # Toplu UPDATE sinyal göndermez; DataTable sayım önbelleği burada geçersiz kılınır.
+            invalidate_counts_on_commit(self.model)
+        return updated_count
+
+    @staticmethod
+    def _installation_updates(status, part_ids, installations):
+        """set_status UPDATE'ine eklenecek installed_in/installed_slot değerleri."""
+        if status != PartStatusChoices.USED:
+            return {'installed_in': None, 'installed_slot': ''}
+        installations = {part_id: installations[part_id] for part_id in part_ids if part_id in (installations or {})}
+        if not installations:
+            return {}
+        return {
+            'installed_in_id': models.Case(
+                *[models.When(pk=part_id, then=models.Value(aircraft_id)) for part_id, (aircraft_id, _) in installations.items()],
+                default=models.F('installed_in_id'),
+                output_field=models.BigIntegerField(),
+            ),
+            'installed_slot': models.Case(
+                *[models.When(pk=part_id, then=models.Value(slot)) for part_id, (_, slot) in installations.items()],
+                default=models.F('installed_slot'),
+                output_field=models.CharField(),
+            ),
+        }
+
+
+class Part(TrackedFieldsMixin, models.Model):
     """
     Üretilmiş tekil parçaları temsil eder.
     Her parça bir parça tipine (kategori), uyumlu olduğu bir hava aracı modeline,
@@ -375,41 +754,76 @@ class Part(models.Model):
         related_name="created_parts",
         verbose_name="Üreten Personel"
     )
+    # Uçak yuvalarının (wing/fuselage/tail/avionics) parça tarafındaki kopyası; "bu parça nerede" sorusu
+    # dört sütun yerine tek indeksli sütundan yanıtlanır. PartQuerySet.set_status ile güncel tutulur,
+    # sapmalar check_part_installations komutuyla bulunup onarılır.
+    installed_in = models.ForeignKey(
+        'Aircraft',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="installed_parts",
+        verbose_name="Takılı Olduğu Uçak"
+    )
+    installed_slot = models.CharField(
+        max_length=20,
+        choices=PartSlotChoices.choices,
+        blank=True,
+        editable=False,
+        verbose_name="Takılı Olduğu Yuva"
+    )
+
+    objects = PartQuerySet.as_manager()
+
+    # Stok özet tablosunun anahtarını oluşturan alanlar (bkz. signals.py)
+    stock_key_fields = ('aircraft_model_compatibility_id', 'part_type_id', 'status')
+    tracked_fields = stock_key_fields + ('serial_number',)
 
     def get_part_type_abbreviation(self):
         """
         Parça kategorilerine göre seri numarasında kullanılacak kısaltmaları döndürür.
         """
-        abbreviations = {
-            PartCategory.AVIONICS: "AVY",
-            PartCategory.WING: "KNT",
-            PartCategory.FUSELAGE: "GVD",
-            PartCategory.TAIL: "KYR",
-        }
         # PartType modelimizdeki category alanı PartCategory enum'ını kullanıyor.
-        return abbreviations.get(self.part_type.category, "XXX") # Eşleşme yoksa XXX
+        return PART_TYPE_ABBREVIATIONS.get(self.part_type.category, "XXX") # Eşleşme yoksa XXX
+
+    def get_serial_prefix(self):
+        """
+        Seri numarası ön ekini döndürür: <UçakModelAdı>-<ParçaTipiKısaltması>-
+        """
+        return f"{self.aircraft_model_compatibility.name}-{self.get_part_type_abbreviation()}-"
+
+    @classmethod
+    def allocate_serial_numbers(cls, parts):
+        """
+        Seri numarası olmayan parçalara, ön ek başına tek bir blok ayırarak seri numarası atar.
+        Toplu oluşturma (bulk_create) öncesinde kullanılır; kayıt yapmaz.
+        """
+        parts_by_prefix = {}
+        for part in parts:
+            if not part.serial_number:
+                parts_by_prefix.setdefault(part.get_serial_prefix(), []).append(part)
+
+        for prefix, prefix_parts in parts_by_prefix.items():
+            first_value = SerialSequence.objects.reserve(
+                prefix, count=len(prefix_parts),
+                seed=lambda prefix=prefix: max_serial_suffix(cls.objects.all(), prefix)
+            )
+            for offset, part in enumerate(prefix_parts):
+                part.serial_number = f"{prefix}{first_value + offset:0{PART_SERIAL_DIGITS}d}"
 
     def save(self, *args, **kwargs):
         """
         Parça kaydedilirken özel mantık uygular:
         - Eğer yeni bir parça ise (veya seri numarası boşsa), otomatik olarak bir seri numarası atar.
           Seri numarası formatı: <UçakModelAdı>-<ParçaTipiKısaltması>-<SıraNo> (örn: TB2-KNT-00001).
+          Sıra numarası SerialSequence sayacından alınır (eşzamanlı kayıtlarda çakışma olmaz).
         """
         if not self.serial_number: # Sadece seri numarası yoksa ata (yeni kayıt veya boş bırakılmışsa)
-            prefix = f"{self.aircraft_model_compatibility.name}-{self.get_part_type_abbreviation()}-"
-
-            # Aynı model ve parça tipindeki mevcut parça sayısını alıp bir fazlasını sıra numarası olarak kullan.
-            # Bu, basit bir sıralama sağlar. Yüksek eşzamanlılık durumları için daha karmaşık bir
-            # sequence yönetimi gerekebilir.
-            last_part_count = Part.objects.filter(
-                aircraft_model_compatibility=self.aircraft_model_compatibility,
-                part_type=self.part_type
-            ).exclude(pk=self.pk).count() # Kendisi hariç (güncelleme durumu için)
-
-            new_sequence_no = last_part_count + 1
-            self.serial_number = f"{prefix}{new_sequence_no:05d}" # 5 haneli, başı sıfırla doldurulmuş sıra no
+            Part.allocate_serial_numbers([self])
 
         super().save(*args, **kwargs) # Asıl kaydetme işlemini yap
+        self.snapshot_tracked_fields()
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
@@ -420,12 +834,12 @@ class Part(models.Model):
           ValidationError fırlatılır. Parçanın önce uçaktan sökülmesi (bu senaryo dışı)
           veya uçağın geri dönüştürülmesi gerekir.
         """
-        if self.status == PartStatusChoices.USED:
-            raise ValidationError(f"'{self.serial_number}' seri numaralı parça şu anda bir uçağa takılı (Kullanımda). Doğrudan geri dönüştürülemez/silinemez.")
-
+        from .recycling import recycle_parts # recycling modülü models'i import eder
+        report = recycle_parts(Part.objects.filter(pk=self.pk))
+        if report.refused:
+            raise ValidationError(report.refused[0]['reason'])
         self.status = PartStatusChoices.RECYCLED
-        self.save() # Durumu güncelle, fiziksel olarak silme
-        print(f"Part SN: {self.serial_number} status set to RECYCLED (soft delete).")
+        self.snapshot_tracked_fields()
 
             
     def clean(self):
@@ -469,23 +883,52 @@ class Part(models.Model):
     def get_installed_aircraft_info(self):
         """
         Eğer parça 'USED' durumdaysa, takılı olduğu uçağın string temsilini döndürür.
-        Aksi halde "Takılı Değil" string'ini döndürür.
-        """
-        if self.status == PartStatusChoices.USED:
-            try:
-                if hasattr(self, 'aircraft_as_wing') and self.aircraft_as_wing:
-                    return f"{self.aircraft_as_wing}"
-                elif hasattr(self, 'aircraft_as_fuselage') and self.aircraft_as_fuselage:
-                    return f"{self.aircraft_as_fuselage}"
-                elif hasattr(self, 'aircraft_as_tail') and self.aircraft_as_tail:
-                    return f"{self.aircraft_as_tail}"
-                elif hasattr(self, 'aircraft_as_avionics') and self.aircraft_as_avionics:
-                    return f"{self.aircraft_as_avionics}"
-            except Aircraft.DoesNotExist: # Bu aslında OneToOneField'larda pek olmaz ama genel bir try-except
-                pass
-        return "-" # "Takılı Değil" yerine daha kısa bir ifade
+        Aksi halde "-" döndürür. Değer resolve_installed_aircraft_info ile önceden çözülmüşse sorgu yapılmaz.
+        """
+        if '_installed_aircraft_info' in self.__dict__:
+            return self._installed_aircraft_info
+        if self.status != PartStatusChoices.USED or not self.installed_in_id:
+            return "-"
+        if Part.installed_in.is_cached(self):
+            # select_related('installed_in__aircraft_model') ile yüklenmişse sorgu yapılmaz.
+            return str(self.installed_in)
+        return Part.installed_aircraft_labels([self.pk]).get(self.pk, "-")
     get_installed_aircraft_info.short_description = "Takılı Olduğu Uçak" # Admin panelinde görünecek başlık
 
+    @staticmethod
+    def installed_aircraft_labels(part_ids):
+        """
+        Verilen parçaların takılı olduğu uçakların etiketlerini (Aircraft.__str__ biçiminde) tek sorguda okur.
+        Dönüş değeri: {parça_id: etiket}; bir uçağa takılı olmayan parçalar sözlükte yer almaz.
+        """
+        part_ids = list(part_ids)
+        if not part_ids:
+            return {}
+        rows = Part.objects.filter(pk__in=part_ids, installed_in__isnull=False).values_list(
+            'pk', 'installed_in__aircraft_model__name', 'installed_in__serial_number'
+        )
+        return {part_id: Aircraft.format_label(model_name, serial_number) for part_id, model_name, serial_number in rows}
+
+    @classmethod
+    def resolve_installed_aircraft_info(cls, parts):
+        """
+        Bir sayfa parçanın get_installed_aircraft_info değerlerini tek sorguyla çözer ve nesnelerde saklar.
+        Serializer listeleri ve admin değişiklik listesi bu metodu kullanır; `parts` bir queryset ise değerlendirilir.
+        """
+        parts = list(parts)
+        labels = cls.installed_aircraft_labels(
+            part.pk for part in parts
+            if part.status == PartStatusChoices.USED and part.installed_in_id and not Part.installed_in.is_cached(part)
+        )
+        for part in parts:
+            if part.pk in labels:
+                part._installed_aircraft_info = labels[part.pk]
+            elif part.status == PartStatusChoices.USED and part.installed_in_id and Part.installed_in.is_cached(part):
+                part._installed_aircraft_info = str(part.installed_in)
+            else:
+                part._installed_aircraft_info = "-"
+        return parts
+
     def __str__(self):
         """
         Parça nesnesinin string temsilini döndürür.
@@ -497,9 +940,18 @@ class Part(models.Model):
         verbose_name = "Üretilmiş Parça"
         verbose_name_plural = "Üretilmiş Parçalar"
         ordering = ['-production_date'] # Varsayılan sıralama: en yeni üretilen parça en üstte
+        indexes = [
+            # Montajda FIFO parça seçimi (inventory.pick_available_parts) için indeks aralık taraması.
+            models.Index(
+                fields=['aircraft_model_compatibility', 'part_type', 'status', 'production_date'],
+                name='part_fifo_pick_idx'
+            ),
+            # Anahtar tabanlı sayfalama (pagination.KeysetDataTablePagination) için (tarih, id) araması.
+            models.Index(fields=['production_date', 'id'], name='part_keyset_idx'),
+        ]
 
 # MONTE EDİLMİŞ HAVA ARAÇLARI
-class Aircraft(models.Model):
+class Aircraft(TrackedFieldsMixin, models.Model):
     """
     Monte edilmiş hava araçlarını temsil eder.
     Her hava aracı bir modele, otomatik atanan bir seri numarasına, montaj tarihine,
@@ -575,6 +1027,27 @@ class Aircraft(models.Model):
         limit_choices_to={'part_type__category': PartCategory.AVIONICS, 'status': PartStatusChoices.AVAILABLE}
     )
 
+    # Uçak stok özet tablosunun anahtarını oluşturan alanlar (bkz. signals.py)
+    stock_key_fields = ('aircraft_model_id', 'assembled_by_team_id', 'status')
+    # Parça takılan slotlar; save()/clean() eski parçaları anlık görüntüden okur.
+    part_slot_fields = ('wing', 'fuselage', 'tail', 'avionics')
+    # Montaj akışında aynı istekte okunmuş ilişkiler; full_clean() bunları yeniden sorgulamaz.
+    ASSEMBLY_PRELOADED_FIELDS = ['aircraft_model', 'assembled_by_team', 'assembled_by_personnel', 'work_order', *part_slot_fields]
+    # İş emri sayacı, arama indeksi ve parça durum farkları için ek alanlar da izlenir.
+    tracked_fields = stock_key_fields + ('work_order_id', 'serial_number') + tuple(f'{slot}_id' for slot in part_slot_fields)
+
+    def get_original_values(self):
+        """
+        Kaydın veritabanındaki (yüklendiği veya son kaydedildiği andaki) izlenen alan değerlerini döndürür.
+        Yeni kayıtlar için None döner. Anlık görüntü yoksa (örn. .only() ile yüklenmiş) tek sorguyla okunur.
+        """
+        if not self.pk or self._state.adding:
+            return None
+        loaded_values = self.get_loaded_values()
+        if loaded_values is None:
+            loaded_values = Aircraft.objects.filter(pk=self.pk).values(*self.tracked_fields).first()
+        return loaded_values
+
     @transaction.atomic
     def delete(self, *args, **kwargs):
         """
@@ -583,29 +1056,64 @@ class Aircraft(models.Model):
         - Uçağın parça bağlantılarını (wing, fuselage vb.) None yapar.
         - Uçağın durumunu 'RECYCLED' olarak günceller.
         """
-        parts_to_make_available = [self.wing, self.fuselage, self.tail, self.avionics]
-        for part in parts_to_make_available:
-            if part:
-                part.status = PartStatusChoices.AVAILABLE
-                part.save()
+        from .recycling import recycle_aircraft # recycling modülü models'i import eder
+        recycle_aircraft(Aircraft.objects.filter(pk=self.pk))
+        for slot in self.part_slot_fields:
+            setattr(self, slot, None)
+        self.status = AircraftStatusChoices.RECYCLED
+        self.snapshot_tracked_fields()
+
+    def get_installations(self, part_ids=None):
+        """Uçağın yuvalarındaki parçalar için {parça_id: (uçak_id, yuva)} sözlüğü (bkz. PartQuerySet.set_status)."""
+        installations = {}
+        for slot in self.part_slot_fields:
+            part_id = getattr(self, f'{slot}_id')
+            if part_id and (part_ids is None or part_id in part_ids):
+                installations[part_id] = (self.pk, slot)
+        return installations
 
-        self.wing = None
-        self.fuselage = None
-        self.tail = None
-        self.avionics = None
+    def __str__(self):
+        return self.format_label(self.aircraft_model.name if self.aircraft_model else None, self.serial_number)
 
-        self.status = AircraftStatusChoices.RECYCLED # Uçağın durumunu güncelle
-        self.save(update_fields=['wing', 'fuselage', 'tail', 'avionics', 'status']) # Sadece belirtilen alanları güncelle
-        print(f"Aircraft SN: {self.serial_number} status set to RECYCLED and parts unlinked (soft delete).")
+    @staticmethod
+    def format_label(aircraft_model_name, serial_number):
+        """Uçağın string temsilini model adı ve seri numarasından üretir (model nesnesi gerekmez)."""
+        return f"{aircraft_model_name or 'Model Belirtilmemiş'} - SN: {serial_number or 'Henüz Yok'}"
 
-    def __str__(self):
-        return f"{self.aircraft_model.name if self.aircraft_model else 'Model Belirtilmemiş'} - SN: {self.serial_number or 'Henüz Yok'}"
+    def get_serial_prefix(self):
+        """
+        Seri numarası ön ekini döndürür: <UçakModelAdı>-
+        """
+        return f"{self.aircraft_model.name}-"
+
+    @classmethod
+    def allocate_serial_numbers(cls, aircrafts):
+        """
+        Seri numarası olmayan uçaklara, model başına tek bir blok ayırarak seri numarası atar.
+        Toplu oluşturma (bulk_create) öncesinde kullanılır; kayıt yapmaz.
+        """
+        aircrafts_by_prefix = {}
+        for aircraft in aircrafts:
+            if not aircraft.serial_number:
+                aircrafts_by_prefix.setdefault(aircraft.get_serial_prefix(), []).append(aircraft)
+
+        for prefix, prefix_aircrafts in aircrafts_by_prefix.items():
+            first_value = SerialSequence.objects.reserve(
+                prefix, count=len(prefix_aircrafts),
+                seed=lambda prefix=prefix: max_serial_suffix(cls.objects.all(), prefix)
+            )
+            for offset, aircraft in enumerate(prefix_aircrafts):
+                aircraft.serial_number = f"{prefix}{first_value + offset:0{AIRCRAFT_SERIAL_DIGITS}d}"
 
     class Meta:
         """Meta seçenekleri."""
         verbose_name = "Üretilmiş Hava Aracı"
         verbose_name_plural = "Üretilmiş Hava Araçları"
         ordering = ['-assembly_date'] # Varsayılan sıralama: en yeni monte edilen uçak en üstte
+        indexes = [
+            # Anahtar tabanlı sayfalama (pagination.KeysetDataTablePagination) için (tarih, id) araması.
+            models.Index(fields=['assembly_date', 'id'], name='aircraft_keyset_idx'),
+        ]
 
     def clean(self):
         """
@@ -618,9 +1126,12 @@ class Aircraft(models.Model):
         """
         super().clean()
 
+        # Eski değerler tek seferde anlık görüntüden okunur (yeni kayıtta None).
+        original_values = self.get_original_values() or {}
+
         # Kural 1: İş emri varsa, uçak modeli iş emrindekiyle eşleşmeli.
-        if self.work_order and self.aircraft_model:
-            if self.aircraft_model != self.work_order.aircraft_model:
+        if self.work_order and self.aircraft_model_id:
+            if self.aircraft_model_id != self.work_order.aircraft_model_id:
                 raise ValidationError({
                     'aircraft_model': (
                         f"Seçilen iş emri ({self.work_order}) için belirtilen hava aracı modeli "
@@ -630,18 +1141,7 @@ class Aircraft(models.Model):
 
         # Kural 2: Tamamlanmış bir iş emrine yeni uçak atanamaz/değiştirilemez.
         if self.work_order and self.work_order.status == WorkOrderStatusChoices.COMPLETED:
-            is_new_assignment_to_completed_wo = False
-            if not self.pk: # Yeni uçak oluşturuluyor
-                is_new_assignment_to_completed_wo = True
-            else: # Mevcut uçak güncelleniyor
-                try:
-                    original_aircraft = Aircraft.objects.get(pk=self.pk)
-                    if original_aircraft.work_order != self.work_order: # İş emri değiştiriliyor
-                        is_new_assignment_to_completed_wo = True
-                except Aircraft.DoesNotExist:
-                    pass # Yeni uçak, ilk koşulda yakalanır.
-            
-            if is_new_assignment_to_completed_wo:
+            if original_values.get('work_order_id') != self.work_order_id: # Yeni uçak veya iş emri değiştiriliyor
                 raise ValidationError({
                     'work_order': f"Seçilen iş emri ({self.work_order}) zaten '{WorkOrderStatusChoices.COMPLETED.label}' statüsünde. Bu iş emrine uçak atanamaz/değiştirilemez."
                 })
@@ -652,53 +1152,37 @@ class Aircraft(models.Model):
                 'work_order': "İptal edilmiş bir iş emrine uçak atanamaz."
             })
 
-        part_slots = {
-            'wing': self.wing,
-            'fuselage': self.fuselage,
-            'tail': self.tail,
-            'avionics': self.avionics
-        }
-
-        original_parts = {}
-        if self.pk: # Eğer obje güncelleniyorsa, orijinal parçaları al
-            try:
-                original_aircraft_db = Aircraft.objects.get(pk=self.pk)
-                original_parts = {
-                    'wing': original_aircraft_db.wing,
-                    'fuselage': original_aircraft_db.fuselage,
-                    'tail': original_aircraft_db.tail,
-                    'avionics': original_aircraft_db.avionics
-                }
-            except Aircraft.DoesNotExist:
-                pass # Yeni oluşturuluyorsa buraya girmez
-
-        for slot_name, current_part in part_slots.items():
-            if not current_part: # Eğer slot boşsa (parça seçilmemişse) kontrol etmeye gerek yok
+        model_changed = original_values.get('aircraft_model_id') != self.aircraft_model_id
+        for slot_name in self.part_slot_fields:
+            part_id = getattr(self, f'{slot_name}_id')
+            if not part_id: # Eğer slot boşsa (parça seçilmemişse) kontrol etmeye gerek yok
                 continue
+            if not model_changed and part_id == original_values.get(f'{slot_name}_id'):
+                continue # Değişmeyen parça daha önce doğrulandı; parça nesnesi yüklenmez.
+            current_part = getattr(self, slot_name)
 
             # Kural 4: Parçanın uçak modeli uyumluluğu
-            if self.aircraft_model and current_part.aircraft_model_compatibility != self.aircraft_model:
+            if self.aircraft_model_id and current_part.aircraft_model_compatibility_id != self.aircraft_model_id:
                 raise ValidationError({
                     slot_name: f"Seçilen {current_part.part_type.get_category_display()} (SN: {current_part.serial_number}) bu uçak modeli ({self.aircraft_model}) ile uyumlu değil. "
                                f"Parça {current_part.aircraft_model_compatibility} modeli için üretilmiş."
                 })
 
             # Kural 5: Slota yeni atanan parçanın durumu AVAILABLE olmalı
-            original_part_in_slot = original_parts.get(slot_name)
-            if current_part != original_part_in_slot: # Parça değişmiş veya ilk kez atanıyorsa
+            if current_part.pk != original_values.get(f'{slot_name}_id'): # Parça değişmiş veya ilk kez atanıyorsa
                 if current_part.status != PartStatusChoices.AVAILABLE:
                     raise ValidationError({
                         slot_name: f"Seçilen {current_part.part_type.get_category_display()} (SN: {current_part.serial_number}) montaj için '{PartStatusChoices.AVAILABLE.label}' durumda değil. Mevcut durumu: {current_part.get_status_display()}."
                     })
         # Kural 6: Aktif bir uçak için tüm ana parçalar seçilmiş olmalı.
         if self.status == AircraftStatusChoices.ACTIVE:
-            if not self.wing:
+            if not self.wing_id:
                 raise ValidationError({'wing': "Aktif bir uçak için Kanat seçilmelidir."})
-            if not self.fuselage:
+            if not self.fuselage_id:
                 raise ValidationError({'fuselage': "Aktif bir uçak için Gövde seçilmelidir."})
-            if not self.tail:
+            if not self.tail_id:
                 raise ValidationError({'tail': "Aktif bir uçak için Kuyruk seçilmelidir."})
-            if not self.avionics:
+            if not self.avionics_id:
                 raise ValidationError({'avionics': "Aktif bir uçak için Aviyonik sistem seçilmelidir."})
 
     @transaction.atomic
@@ -707,6 +1191,7 @@ class Aircraft(models.Model):
         Hava aracı kaydedilirken özel mantık uygular:
         - Eğer yeni bir hava aracı ise, otomatik olarak bir seri numarası atar.
           Seri numarası formatı: <UçakModelAdı>-<SıraNo> (örn: TB2-0001).
+          Sıra numarası SerialSequence sayacından alınır.
         - Uçaktan çıkarılan eski parçaların durumunu 'AVAILABLE' yapar.
         - Uçağa yeni takılan parçaların durumunu 'USED' yapar.
         """
@@ -714,56 +1199,240 @@ class Aircraft(models.Model):
             if not self.aircraft_model:
                 # aircraft_model None ise seri numarası üretemeyiz. clean() bunu engellemeli.
                 raise DjangoValidationError("Seri numarası atamak için hava aracı modeli belirtilmelidir.")
+            if not self.serial_number:
+                Aircraft.allocate_serial_numbers([self])
 
-            prefix = f"{self.aircraft_model.name}-" 
-            
-            last_serial_obj = Aircraft.objects.filter(
-                serial_number__startswith=prefix
-            ).aggregate(max_sn_suffix=Max('serial_number'))
-            
-            max_suffix_num = 0
-            if last_serial_obj and last_serial_obj.get('max_sn_suffix'):
-                try:
-                    # Son tireden sonraki kısmı alıp integer'a çevir
-                    suffix_str = last_serial_obj['max_sn_suffix'].split('-')[-1]
-                    max_suffix_num = int(suffix_str)
-                except (IndexError, ValueError, TypeError):
-                    pass # Hata durumunda max_suffix_num = 0 kalır
-            
-            new_sequence_no = max_suffix_num + 1
-            self.serial_number = f"{prefix}{new_sequence_no:04d}" # 4 haneli, başı sıfırla doldurulmuş sıra no
-
-        # Parça Durum Güncelleme Mantığı
-        original_parts_to_make_available = []
-        if self.pk: # Eğer obje güncelleniyorsa
-            try:
-                # Veritabanındaki güncel (kaydetmeden önceki) halini al
-                original_aircraft_db = Aircraft.objects.select_related('wing', 'fuselage', 'tail', 'avionics').get(pk=self.pk)
-                
-                # Mevcut formdaki parçalarla karşılaştır
-                if original_aircraft_db.wing and original_aircraft_db.wing != self.wing:
-                    original_parts_to_make_available.append(original_aircraft_db.wing)
-                if original_aircraft_db.fuselage and original_aircraft_db.fuselage != self.fuselage:
-                    original_parts_to_make_available.append(original_aircraft_db.fuselage)
-                if original_aircraft_db.tail and original_aircraft_db.tail != self.tail:
-                    original_parts_to_make_available.append(original_aircraft_db.tail)
-                if original_aircraft_db.avionics and original_aircraft_db.avionics != self.avionics:
-                    original_parts_to_make_available.append(original_aircraft_db.avionics)
-            except Aircraft.DoesNotExist:
-                pass # Yeni oluşturuluyorsa bu kısım atlanır
+        # Parça Durum Güncelleme Mantığı: eski slotlar anlık görüntüden okunur, yalnızca farklar güncellenir.
+        original_values = self.get_original_values() or {}
+        original_part_ids = {original_values.get(f'{slot}_id') for slot in self.part_slot_fields} - {None}
+
+        # Slotlar önbellekteki nesnelerden okunur; yalnızca id atanmış slotlar için parça getirilmez.
+        current_part_ids = {getattr(self, f'{slot}_id') for slot in self.part_slot_fields} - {None}
 
         super().save(*args, **kwargs)
+        self.snapshot_tracked_fields()
+
+        # Çıkarılan eski parçaların durumunu tek sorguda 'AVAILABLE' yap
+        removed_part_ids = original_part_ids - current_part_ids
+        if removed_part_ids:
+            Part.objects.filter(pk__in=removed_part_ids).set_status(PartStatusChoices.AVAILABLE)
+
+        # Uçağa yeni takılan parçaları tek sorguda 'USED' yap. Parçalardan biri bu arada başka bir
+        # işlemde kullanıldıysa (AVAILABLE değilse) montaj geri alınır.
+        added_part_ids = current_part_ids - original_part_ids
+        if added_part_ids:
+            marked_count = Part.objects.filter(pk__in=added_part_ids, status=PartStatusChoices.AVAILABLE).set_status(
+                PartStatusChoices.USED, installations=self.get_installations(added_part_ids)
+            )
+            if marked_count != len(added_part_ids):
+                raise DjangoValidationError("Seçilen parçalardan biri artık kullanıma hazır değil; montaj iptal edildi.")
+
+        for slot in self.part_slot_fields:
+            current_part = self._state.fields_cache.get(slot)
+            if current_part is not None:
+                current_part.status = PartStatusChoices.USED
+                current_part.installed_in_id, current_part.installed_slot = self.pk, slot
+                current_part.snapshot_tracked_fields()
+
+
+# STOK ÖZET TABLOLARI
+class StockLevelManager(models.Manager):
+    """
+    Stok özet satırlarını artımlı (delta) olarak güncelleyen manager.
+    """
+    key_fields = ()
 
-        # Çıkarılan eski parçaların durumunu 'AVAILABLE' yap
-        for old_part in original_parts_to_make_available:
-            if old_part: # None değilse
-                old_part.status = PartStatusChoices.AVAILABLE
-                old_part.save()
-
-        # Uçağa yeni takılan/atanan parçaların durumunu 'USED' yap
-        current_parts_to_mark_used = [self.wing, self.fuselage, self.tail, self.avionics]
-        for current_part in current_parts_to_mark_used:
-            if current_part: # None değilse
-                if current_part.status != PartStatusChoices.USED:
-                    current_part.status = PartStatusChoices.USED
-                current_part.save() # Parçanın son halini kaydet
\ No newline at end of file
+    def apply_deltas(self, deltas):
+        """
+        {anahtar: fark} sözlüğündeki farkları uygular; anahtar, `key_fields` sırasıyla alan değerlerinden oluşan bir tuple'dır.
+        Destekleyen veritabanlarında (PostgreSQL, SQLite) tek bir INSERT ... ON CONFLICT DO UPDATE ile: satırı olmayan
+        anahtarlar oluşturulur, olanlara fark eklenir. Satır oluşturma kararı tablo yeniden okunarak verilmez; aksi halde
+        READ COMMITTED altında UPDATE ile okuma arasında başka işlemin oluşturduğu satır için fark kaybolurdu.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        connection = connections[self.db]
+        # Anahtarlar sıralı işlenir; eşzamanlı işlemler satır kilitlerini aynı sırayla alır (deadlock önlenir).
+        ordered = sorted(deltas.items())
+        if connection.features.supports_update_conflicts_with_target:
+            self._upsert(connection, ordered)  # Tek ifade; savepoint gerekmez.
+        else:
+            with transaction.atomic(using=self.db):
+                for key, delta in ordered:
+                    self._increment_or_create(key, delta)
+        publish_stock_deltas(self.model, self.key_fields, deltas, using=self.db)
+
+    def _upsert(self, connection, ordered_deltas):
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        table = quote(opts.db_table)
+        key_columns = ', '.join(quote(opts.get_field(name).column) for name in self.key_fields)
+        count_column = quote(opts.get_field('count').column)
+        row_placeholder = '(' + ', '.join(['%s'] * (len(self.key_fields) + 1)) + ')'
+        sql = (
+            f"INSERT INTO {table} ({key_columns}, {count_column}) "
+            f"VALUES {', '.join([row_placeholder] * len(ordered_deltas))} "
+            f"ON CONFLICT ({key_columns}) DO UPDATE SET {count_column} = {table}.{count_column} + EXCLUDED.{count_column}"
+        )
+        params = [value for key, delta in ordered_deltas for value in (*key, delta)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def _increment_or_create(self, key, delta):
+        key_values = dict(zip(self.key_fields, key))
+        if self.filter(**key_values).update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(count=delta, **key_values)
+        except IntegrityError:
+            # Aynı satır eşzamanlı olarak oluşturuldu; farkı üzerine ekle.
+            self.filter(**key_values).update(count=F('count') + delta)
+
+
+class PartStockLevelManager(StockLevelManager):
+    key_fields = ('aircraft_model_id', 'part_type_id', 'status')
+
+
+class AircraftStockLevelManager(StockLevelManager):
+    key_fields = ('aircraft_model_id', 'assembled_by_team_id', 'status')
+
+
+class StockLevel(models.Model):
+    """
+    (Uçak modeli, parça tipi, durum) başına parça sayısını tutan özet tablo.
+    Part kaydetme/silme yolları ve toplu durum güncellemeleri tarafından artımlı olarak güncellenir;
+    `rebuild_stock_levels` komutu kaynak tabloyla karşılaştırıp sapmaları düzeltir.
+    """
+    aircraft_model = models.ForeignKey(AircraftModel, on_delete=models.CASCADE, verbose_name="Hava Aracı Modeli")
+    part_type = models.ForeignKey(PartType, on_delete=models.CASCADE, verbose_name="Parça Tipi")
+    status = models.CharField(max_length=20, choices=PartStatusChoices.choices, verbose_name="Parça Durumu")
+    count = models.BigIntegerField(default=0, verbose_name="Adet")
+
+    objects = PartStockLevelManager()
+
+    def __str__(self):
+        return f"{self.aircraft_model} / {self.part_type} / {self.get_status_display()}: {self.count}"
+
+    class Meta:
+        """Meta seçenekleri."""
+        verbose_name = "Parça Stok Seviyesi"
+        verbose_name_plural = "Parça Stok Seviyeleri"
+        constraints = [
+            models.UniqueConstraint(fields=['aircraft_model', 'part_type', 'status'], name='unique_part_stock_level'),
+        ]
+
+
+class AircraftStockLevel(models.Model):
+    """
+    (Uçak modeli, montaj takımı, durum) başına uçak sayısını tutan özet tablo.
+    Montaj takımları yalnızca kendi satırlarını, adminler tüm takımların toplamını görür.
+    """
+    aircraft_model = models.ForeignKey(AircraftModel, on_delete=models.CASCADE, verbose_name="Hava Aracı Modeli")
+    assembled_by_team = models.ForeignKey(Team, on_delete=models.CASCADE, verbose_name="Montajı Yapan Takım")
+    status = models.CharField(max_length=20, choices=AircraftStatusChoices.choices, verbose_name="Uçak Durumu")
+    count = models.BigIntegerField(default=0, verbose_name="Adet")
+
+    objects = AircraftStockLevelManager()
+
+    def __str__(self):
+        return f"{self.aircraft_model} / {self.assembled_by_team.name} / {self.get_status_display()}: {self.count}"
+
+    class Meta:
+        """Meta seçenekleri."""
+        verbose_name = "Uçak Stok Seviyesi"
+        verbose_name_plural = "Uçak Stok Seviyeleri"
+        constraints = [
+            models.UniqueConstraint(fields=['aircraft_model', 'assembled_by_team', 'status'], name='unique_aircraft_stock_level'),
+        ]
+
+
+class SearchNgram(models.Model):
+    """
+    PostgreSQL dışındaki veritabanlarında metin araması için 3'lü karakter grubu (n-gram) indeksi.
+    Her satır, bir kaydın (model_label, object_id) aranan alanında geçen bir n-gramı temsil eder.
+    Bkz. search.NgramSearchBackend; `rebuild_search_index` komutu tabloyu baştan oluşturur.
+    """
+    model_label = models.CharField(max_length=64, verbose_name="Model")
+    field_name = models.CharField(max_length=64, verbose_name="Alan")
+    gram = models.CharField(max_length=3, verbose_name="N-gram")
+    object_id = models.BigIntegerField(verbose_name="Kayıt ID")
+
+    def __str__(self):
+        return f"{self.model_label}.{self.field_name} #{self.object_id}: {self.gram}"
+
+    class Meta:
+        """Meta seçenekleri."""
+        verbose_name = "Arama N-gramı"
+        verbose_name_plural = "Arama N-gramları"
+        constraints = [
+            # (model, alan, n-gram) aramasını karşılar, object_id indeksten okunur.
+            models.UniqueConstraint(fields=['model_label', 'field_name', 'gram', 'object_id'], name='unique_search_ngram'),
+        ]
+        indexes = [
+            models.Index(fields=['model_label', 'object_id'], name='search_ngram_object_idx'),
+        ]
+
+
+# ÜRETİM OLAY GÜNLÜĞÜ
+class ProductionEvent(models.Model):
+    """
+    Parça, uçak ve iş emri yaşam döngüsündeki olayların yalnızca eklenen (append-only) günlüğü.
+    Olaylar events.record_events ile tamponlanır ve transaction commit edildiğinde toplu yazılır.
+    Seri numarası ve takım, kaynak tabloya gitmeden sorgulanabilmesi için kayda kopyalanır.
+    """
+    # Model adı -> (kayıt türü, olaydaki takımın alındığı alan)
+    ENTITY_SOURCES = {
+        'part': (EventEntityChoices.PART, 'produced_by_team_id'),
+        'aircraft': (EventEntityChoices.AIRCRAFT, 'assembled_by_team_id'),
+        'workorder': (EventEntityChoices.WORK_ORDER, 'assigned_to_assembly_team_id'),
+    }
+
+    entity_type = models.CharField(max_length=12, choices=EventEntityChoices.choices, verbose_name="Kayıt Türü")
+    entity_id = models.BigIntegerField(verbose_name="Kayıt ID")
+    serial_number = models.CharField(max_length=50, blank=True, default='', verbose_name="Seri Numarası")
+    event_type = models.CharField(max_length=32, choices=ProductionEventTypeChoices.choices, verbose_name="Olay")
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Takım"
+    )
+    occurred_at = models.DateTimeField(default=timezone.now, verbose_name="Zaman")
+    data = models.JSONField(default=dict, blank=True, verbose_name="Ayrıntılar")
+
+    @classmethod
+    def build(cls, entity_type, event_type, entity_id, serial_number='', team_id=None, **data):
+        """Kaydedilmemiş bir olay nesnesi oluşturur (bkz. events.record_events)."""
+        return cls(
+            entity_type=entity_type, event_type=event_type, entity_id=entity_id,
+            serial_number=serial_number or '', team_id=team_id, data=data,
+        )
+
+    @classmethod
+    def for_instance(cls, instance, event_type, **data):
+        """Parça, uçak veya iş emri nesnesinden olay oluşturur."""
+        entity_type, team_attname = cls.ENTITY_SOURCES[instance._meta.model_name]
+        return cls.build(
+            entity_type, event_type, instance.pk,
+            getattr(instance, 'serial_number', ''), getattr(instance, team_attname), **data
+        )
+
+    def __str__(self):
+        return f"{self.occurred_at:%Y-%m-%d %H:%M:%S} {self.get_event_type_display()} - {self.serial_number or f'{self.entity_type} #{self.entity_id}'}"
+
+    class Meta:
+        """Meta seçenekleri."""
+        verbose_name = "Üretim Olayı"
+        verbose_name_plural = "Üretim Olayları"
+        ordering = ['-occurred_at', '-id']
+        indexes = [
+            models.Index(fields=['entity_type', 'entity_id', 'occurred_at'], name='production_event_entity_idx'),
+            models.Index(fields=['serial_number', 'occurred_at'], name='production_event_serial_idx'),
+            # Anahtar tabanlı sayfalama (pagination.KeysetDataTablePagination) için (zaman, id) araması.
+            models.Index(fields=['occurred_at', 'id'], name='production_event_keyset_idx'),
+        ]
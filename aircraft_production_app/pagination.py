@@ -1,17 +1,53 @@
 # aircraft_production_app/pagination.py
-from rest_framework.pagination import LimitOffsetPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
 from rest_framework.response import Response
 from collections import OrderedDict
 
-class StandardDataTablePagination(LimitOffsetPagination):
+from .counts import COUNT_MODES, get_count
+
+
+class CountStrategyMixin:
+    """
+    Kayıt sayısını counts.get_count ile hesaplar.
+    Mod sırasıyla ?count_mode parametresinden, view üzerindeki `count_mode` alanından veya
+    DATATABLE_COUNT_MODE ayarından alınır. Kullanılan mod yanıtta 'countMode' olarak döner.
+    """
+    count_mode_query_param = 'count_mode'
+
+    def get_count_mode(self, request, view):
+        requested_mode = request.query_params.get(self.count_mode_query_param)
+        if requested_mode in COUNT_MODES:
+            return requested_mode
+        return getattr(view, 'count_mode', None)
+
+    def count_queryset(self, queryset, request, view):
+        scope = type(view).__name__ if view is not None else ''
+        self.count, self.count_mode = get_count(queryset, self.get_count_mode(request, view), scope)
+        return self.count
+
+
+class StandardDataTablePagination(CountStrategyMixin, LimitOffsetPagination):
     """
     DataTable sunucu tarafı işlemleriyle uyumlu özel pagination sınıfı.
-    Standart DRF pagination yerine 'draw', 'recordsFiltered', 'recordsTotal' ve 'data' alanlarını döndürür.
+    Standart DRF pagination yerine 'draw', 'recordsFiltered', 'recordsTotal', 'countMode' ve 'data' alanlarını döndürür.
     """
     default_limit = 10
     limit_query_param = 'length'
     offset_query_param = 'start'
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        return self.count_queryset(queryset, self.request, self.view)
+
     def get_paginated_response(self, data):
         # Kısa bir açıklama: DataTable 'draw' parametresini gönderir, senk. için geri paslarız.
         draw = 0
@@ -25,6 +61,7 @@ class StandardDataTablePagination(LimitOffsetPagination):
             ('draw', draw),
             ('recordsFiltered', self.count),
             ('recordsTotal', self.count),
+            ('countMode', self.count_mode),
             ('data', data)
         ]))
 
@@ -50,6 +87,145 @@ class StandardDataTablePagination(LimitOffsetPagination):
                     'example': 100,
                     'description': "Filtreleme uygulanmadan önceki toplam kayıt sayısı."
                 },
+                'countMode': {
+                    'type': 'string',
+                    'enum': list(COUNT_MODES),
+                    'example': 'cached',
+                    'description': "Kayıt sayısını üreten strateji: exact, cached veya estimate."
+                },
                 'data': schema,
             },
         }
+
+
+class KeysetDataTablePagination(CountStrategyMixin, BasePagination):
+    """
+    (tarih alanı, id) çifti üzerinde arama (seek) yapan anahtar tabanlı pagination.
+    Derin sayfalarda OFFSET taraması yapmaz; sayfa konumu opak 'cursor' parametresiyle taşınır.
+    Yanıt zarfı StandardDataTablePagination ile aynıdır, ayrıca 'next' ve 'previous' imleçlerini içerir.
+    Kayıt sayısı seçilen sayım stratejisiyle hesaplanır (bkz. counts.get_count).
+    Sıralama, view üzerindeki `keyset_ordering_field` alanına göre yeniden eskiye sabittir.
+    """
+    default_limit = 10
+    max_limit = 1000
+    limit_query_param = 'length'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = "Geçersiz sayfa imleci."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.field_name = getattr(view, 'keyset_ordering_field', 'pk')
+        self.model_field = None if self.field_name == 'pk' else queryset.model._meta.get_field(self.field_name)
+        self.count_queryset(queryset, request, view)
+
+        position, reverse = self.decode_cursor(request)
+        queryset = queryset.order_by(
+            *((self.field_name, 'pk') if reverse else (f'-{self.field_name}', '-pk'))
+        )
+        if position is not None:
+            value, pk = position
+            if reverse:
+                queryset = queryset.filter(Q(**{f'{self.field_name}__gt': value}) | Q(**{self.field_name: value, 'pk__gt': pk}))
+            else:
+                queryset = queryset.filter(Q(**{f'{self.field_name}__lt': value}) | Q(**{self.field_name: value, 'pk__lt': pk}))
+
+        # Bir fazla kayıt okunarak sonraki sayfanın varlığı COUNT sorgusu olmadan anlaşılır.
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if results:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(results[-1], reverse=False)
+            if position is not None and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(results[0], reverse=True)
+        return results
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(limit, self.max_limit) if limit > 0 else self.default_limit
+
+    def encode_cursor(self, instance, reverse):
+        """
+        Kaydın (tarih, id) konumunu URL'de taşınabilir opak bir imlece çevirir.
+        Kayıt model nesnesi veya .values() satırı (sözlük) olabilir (bkz. listing.ProjectedListMixin).
+        """
+        if isinstance(instance, dict):
+            value, pk = instance[self.field_name if self.field_name != 'pk' else 'id'], instance['id']
+        else:
+            value, pk = getattr(instance, self.field_name), instance.pk
+        payload = {'v': value.isoformat() if hasattr(value, 'isoformat') else value, 'pk': pk}
+        if reverse:
+            payload['r'] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+    def decode_cursor(self, request):
+        """İmleci çözer. Dönüş değeri: ((tarih, id) veya None, geriye doğru mu)"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            value = self.model_field.to_python(payload['v']) if self.model_field else payload['v']
+            return (value, int(payload['pk'])), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_paginated_response(self, data):
+        draw = 0
+        if self.request and self.request.query_params.get('draw'):
+            try:
+                draw = int(self.request.query_params.get('draw'))
+            except ValueError:
+                pass
+
+        return Response(OrderedDict([
+            ('draw', draw),
+            ('recordsFiltered', self.count),
+            ('recordsTotal', self.count),
+            ('countMode', self.count_mode),
+            ('next', self.next_cursor),
+            ('previous', self.previous_cursor),
+            ('data', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = StandardDataTablePagination().get_paginated_response_schema(schema)
+        response_schema['properties']['next'] = {
+            'type': 'string', 'nullable': True,
+            'description': "Sonraki sayfa için 'cursor' parametresine verilecek opak imleç."
+        }
+        response_schema['properties']['previous'] = {
+            'type': 'string', 'nullable': True,
+            'description': "Önceki sayfa için 'cursor' parametresine verilecek opak imleç."
+        }
+        return response_schema
+
+
+class SelectablePaginationMixin:
+    """
+    Viewset'lerde pagination sınıfının istek bazında seçilmesini sağlar.
+    ?paging=keyset parametresi verildiğinde `keyset_pagination_class` kullanılır, aksi halde varsayılan sınıf.
+    """
+    keyset_pagination_class = KeysetDataTablePagination
+    paging_query_param = 'paging'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if request is not None and request.query_params.get(self.paging_query_param) == 'keyset':
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -1,5 +1,5 @@
 from rest_framework import permissions
-from .models import Personnel
+from .roles import get_role_context
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
@@ -20,13 +20,8 @@ class IsNotAssemblyTeamForCreate(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        try:
-            personnel = request.user.personnel
-            return not (personnel.team and personnel.team.can_perform_assembly())
-        except Personnel.DoesNotExist:
-            return False
-        except AttributeError:
-            return False
+        role = get_role_context(request)
+        return role.has_personnel and not role.can_assemble
 
 class IsOwnerTeamOrAdminForPart(permissions.BasePermission):
     """
@@ -38,13 +33,8 @@ class IsOwnerTeamOrAdminForPart(permissions.BasePermission):
             return True
         if request.user and request.user.is_staff:
             return True
-        try:
-            personnel = request.user.personnel
-            return obj.produced_by_team == personnel.team
-        except Personnel.DoesNotExist:
-            return False
-        except AttributeError:
-            return False
+        role = get_role_context(request)
+        return role.team_id is not None and obj.produced_by_team_id == role.team_id
 
 class IsAssemblyTeamMemberOrAdminForAircraft(permissions.BasePermission):
     """
@@ -56,13 +46,8 @@ class IsAssemblyTeamMemberOrAdminForAircraft(permissions.BasePermission):
             return True
         if request.user and request.user.is_staff:
             return True
-        try:
-            personnel = request.user.personnel
-            return obj.assembled_by_team == personnel.team and personnel.team.can_perform_assembly()
-        except Personnel.DoesNotExist:
-            return False
-        except AttributeError:
-            return False
+        role = get_role_context(request)
+        return role.can_assemble and obj.assembled_by_team_id == role.team_id
 
 class CanAssembleAircraft(permissions.BasePermission):
     """
@@ -73,10 +58,4 @@ class CanAssembleAircraft(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        try:
-            personnel = request.user.personnel
-            return personnel.team and personnel.team.can_perform_assembly()
-        except Personnel.DoesNotExist:
-            return False
-        except AttributeError:
-            return False
\ No newline at end of file
+        return get_role_context(request).can_assemble
\ No newline at end of file
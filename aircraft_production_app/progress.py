@@ -0,0 +1,36 @@
+# aircraft_production_app/progress.py
+"""
+İş emri ilerleme sayacının (WorkOrder.completed_count) bağlı uçaklarla doğrulanması ve onarımı.
+Artımlı güncellemeler models.WorkOrderManager.apply_progress ile yapılır.
+"""
+from django.db import transaction
+from django.db.models import Count, Value
+
+from .models import Aircraft, WorkOrder
+
+
+def reconcile_work_order_progress(repair=True):
+    """
+    Her iş emrinin completed_count değerini bağlı uçak sayısıyla karşılaştırır.
+    Sapmaları [(iş_emri_id, kayıtlı sayı, gerçek sayı), ...] olarak döndürür; repair=True ise sayacı
+    düzeltir ve durumu yeni sayıdan yeniden türetir.
+    """
+    with transaction.atomic():
+        stored_counts = dict(WorkOrder.objects.select_for_update().values_list('pk', 'completed_count'))
+        actual_counts = dict(
+            Aircraft.objects.filter(work_order__isnull=False).order_by()
+            .values_list('work_order_id').annotate(count=Count('id'))
+        )
+
+        drift = [
+            (work_order_id, stored, actual_counts.get(work_order_id, 0))
+            for work_order_id, stored in stored_counts.items()
+            if stored != actual_counts.get(work_order_id, 0)
+        ]
+        if repair:
+            for work_order_id, _, actual in drift:
+                WorkOrder.objects.filter(pk=work_order_id).update(
+                    completed_count=actual,
+                    status=WorkOrder.objects.progress_status_expression(Value(actual)),
+                )
+    return drift
@@ -0,0 +1,165 @@
+# aircraft_production_app/recycling.py
+"""
+Toplu geri dönüştürme (yumuşak silme) işlemleri: uçak, parça ve iş emri.
+
+Her işlem verilen queryset'in satırlarını tek sorguda kilitleyerek okur, durum değişikliklerini
+birkaç toplu UPDATE ile uygular ve stok özet tablolarını/sayım önbelleğini günceller.
+İşlenemeyen satırlar (örn. uçağa takılı parçalar) hata fırlatılmadan rapora yazılır.
+Model delete() metotları, admin ve API uç noktaları bu fonksiyonları kullanır.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from .counts import invalidate_counts_on_commit
+from .events import record_events
+from .models import (
+    Aircraft, AircraftStockLevel, Part, ProductionEvent, WorkOrder,
+    AircraftStatusChoices, EventEntityChoices, PartStatusChoices, ProductionEventTypeChoices, WorkOrderStatusChoices,
+)
+
+UPDATE_BATCH_SIZE = 1000
+
+
+@dataclass
+class RecycleReport:
+    """
+    Toplu işlemin sonucu.
+    - processed: durumu değiştirilen kayıt sayısı
+    - skipped: zaten hedef durumda olduğu için atlanan kayıt ID'leri
+    - refused: işlenmeyen kayıtlar; [{"id", "label", "reason"}, ...]
+    """
+    processed: int = 0
+    skipped: list = field(default_factory=list)
+    refused: list = field(default_factory=list)
+
+    def refuse(self, pk, label, reason):
+        self.refused.append({'id': pk, 'label': label, 'reason': reason})
+
+    def as_dict(self):
+        return {'processed': self.processed, 'skipped': self.skipped, 'refused': self.refused}
+
+
+def _batched(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), UPDATE_BATCH_SIZE):
+        yield ids[start:start + UPDATE_BATCH_SIZE]
+
+
+def _locked_rows(queryset, *fields):
+    """
+    Queryset'in satırlarını kilitleyerek (sıralamasız) okur. Admin/filtre querysetleri distinct() veya
+    JOIN içerebileceğinden kilit, birincil anahtar alt sorgusuyla süzülmüş yalın bir queryset üzerinde alınır.
+    """
+    model = queryset.model
+    locked = model._default_manager.filter(pk__in=queryset.order_by().values('pk')).select_for_update()
+    return list(locked.order_by().values(*fields))
+
+
+@transaction.atomic
+def recycle_parts(queryset):
+    """
+    Parçaları 'RECYCLED' durumuna alır. Uçağa takılı ('USED') parçalar reddedilir;
+    önce uçağın geri dönüştürülmesi gerekir.
+    """
+    report = RecycleReport()
+    recyclable_ids = []
+    for row in _locked_rows(queryset, 'pk', 'serial_number', 'status'):
+        if row['status'] == PartStatusChoices.RECYCLED:
+            report.skipped.append(row['pk'])
+        elif row['status'] == PartStatusChoices.USED:
+            report.refuse(
+                row['pk'], row['serial_number'],
+                f"'{row['serial_number']}' seri numaralı parça şu anda bir uçağa takılı (Kullanımda). Doğrudan geri dönüştürülemez/silinemez."
+            )
+        else:
+            recyclable_ids.append(row['pk'])
+
+    if recyclable_ids:
+        # set_status stok farklarını ve sayım önbelleğini kendisi günceller.
+        report.processed = Part.objects.filter(pk__in=recyclable_ids).set_status(PartStatusChoices.RECYCLED)
+    return report
+
+
+@transaction.atomic
+def recycle_aircraft(queryset):
+    """
+    Uçakları 'RECYCLED' durumuna alır, parça bağlantılarını kaldırır ve takılı parçaları 'AVAILABLE' yapar.
+    İş emri bağlantısı korunur. Zaten geri dönüştürülmüş uçaklar atlanır.
+    """
+    report = RecycleReport()
+    slot_id_fields = [f'{slot}_id' for slot in Aircraft.part_slot_fields]
+    rows = _locked_rows(queryset, 'pk', 'serial_number', 'aircraft_model_id', 'assembled_by_team_id', 'status', *slot_id_fields)
+
+    aircraft_ids = []
+    part_ids = []
+    stock_deltas = Counter()
+    events = []
+    for row in rows:
+        if row['status'] == AircraftStatusChoices.RECYCLED and not any(row[slot_id] for slot_id in slot_id_fields):
+            report.skipped.append(row['pk'])
+            continue
+        aircraft_ids.append(row['pk'])
+        part_ids.extend(row[slot_id] for slot_id in slot_id_fields if row[slot_id])
+        stock_deltas[(row['aircraft_model_id'], row['assembled_by_team_id'], row['status'])] -= 1
+        stock_deltas[(row['aircraft_model_id'], row['assembled_by_team_id'], AircraftStatusChoices.RECYCLED.value)] += 1
+        events.append(ProductionEvent.build(
+            EventEntityChoices.AIRCRAFT, ProductionEventTypeChoices.AIRCRAFT_RECYCLED, row['pk'],
+            row['serial_number'], row['assembled_by_team_id'], from_status=row['status'],
+            parts={slot: row[f'{slot}_id'] for slot in Aircraft.part_slot_fields},
+        ))
+
+    if not aircraft_ids:
+        return report
+
+    now = timezone.now()
+    for batch_ids in _batched(aircraft_ids):
+        report.processed += Aircraft.objects.filter(pk__in=batch_ids).update(
+            status=AircraftStatusChoices.RECYCLED, updated_at=now,
+            **{slot: None for slot in Aircraft.part_slot_fields}
+        )
+    AircraftStockLevel.objects.apply_deltas(stock_deltas)
+    invalidate_counts_on_commit(Aircraft)
+    record_events(events)
+
+    if part_ids:
+        Part.objects.filter(pk__in=part_ids).set_status(PartStatusChoices.AVAILABLE)
+    return report
+
+
+@transaction.atomic
+def cancel_work_orders(queryset):
+    """
+    İş emirlerini 'CANCELLED' durumuna alır ve bağlı uçakların iş emri bağlantısını kaldırır.
+    Uçaklar var olmaya devam eder; ilerleme sayacı sıfırlanır. Zaten iptal edilmiş iş emirleri atlanır.
+    """
+    report = RecycleReport()
+    work_order_ids = []
+    events = []
+    for row in _locked_rows(queryset, 'pk', 'status', 'completed_count', 'assigned_to_assembly_team_id'):
+        if row['status'] == WorkOrderStatusChoices.CANCELLED and not row['completed_count']:
+            report.skipped.append(row['pk'])
+            continue
+        work_order_ids.append(row['pk'])
+        events.append(ProductionEvent.build(
+            EventEntityChoices.WORK_ORDER, ProductionEventTypeChoices.WORK_ORDER_STATUS_CHANGED, row['pk'],
+            team_id=row['assigned_to_assembly_team_id'], from_status=row['status'], to_status=WorkOrderStatusChoices.CANCELLED.value,
+        ))
+
+    if not work_order_ids:
+        return report
+
+    now = timezone.now()
+    detached_count = 0
+    for batch_ids in _batched(work_order_ids):
+        detached_count += Aircraft.objects.filter(work_order_id__in=batch_ids).update(work_order=None, updated_at=now)
+        report.processed += WorkOrder.objects.filter(pk__in=batch_ids).update(
+            status=WorkOrderStatusChoices.CANCELLED, completed_count=0, updated_at=now
+        )
+    if detached_count:
+        invalidate_counts_on_commit(Aircraft)
+    invalidate_counts_on_commit(WorkOrder)
+    record_events(events)
+    return report
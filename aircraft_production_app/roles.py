@@ -0,0 +1,134 @@
+# aircraft_production_app/roles.py
+"""
+İstek sahibinin rol bilgisi (admin mi, hangi takımda, montaj yapabilir mi, hangi parçayı üretir).
+
+Rol bağlamı istek başına bir kez hesaplanır ve request.role_context olarak taşınır; kullanıcılar arası
+süreç içi LRU önbellekte tutulur. Personnel, Team veya User değiştiğinde ilgili kayıtlar önbellekten
+silinir (bkz. signals.py); diğer süreçlerde en geç ROLE_CONTEXT_CACHE_TTL saniye sonra yenilenir.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .caching import LocalTTLCache
+from .models import PartCategory, Personnel
+
+role_context_cache = LocalTTLCache(
+    maxsize=getattr(settings, 'ROLE_CONTEXT_CACHE_SIZE', 4096),
+    ttl=getattr(settings, 'ROLE_CONTEXT_CACHE_TTL', 60),
+)
+
+
+@dataclass(frozen=True)
+class RoleContext:
+    """Bir kullanıcının yetki kararlarında kullanılan değişmez rol bilgisi."""
+    user_id: Optional[int]
+    is_admin: bool = False
+    personnel_id: Optional[int] = None
+    team_id: Optional[int] = None
+    team_type: Optional[str] = None
+    producible_category: Optional[PartCategory] = None
+    can_assemble: bool = False
+
+    @property
+    def has_personnel(self):
+        return self.personnel_id is not None
+
+    @property
+    def is_production_team(self):
+        """Parça üretebilen bir takımda mı?"""
+        return self.producible_category is not None
+
+    @classmethod
+    def from_user(cls, user, personnel=None):
+        """Kullanıcı ve (varsa) önceden yüklenmiş personel/takım nesnelerinden bağlam oluşturur."""
+        is_admin = bool(user.is_staff or user.is_superuser)
+        if personnel is None:
+            return cls(user_id=user.pk, is_admin=is_admin)
+        team = personnel.team
+        return cls(
+            user_id=user.pk,
+            is_admin=is_admin,
+            personnel_id=personnel.pk,
+            team_id=team.pk if team else None,
+            team_type=team.team_type if team else None,
+            producible_category=team.get_producible_part_category() if team else None,
+            can_assemble=bool(team and team.can_perform_assembly()),
+        )
+
+
+ANONYMOUS_ROLE_CONTEXT = RoleContext(user_id=None)
+
+
+def _loaded_personnel(user):
+    """
+    Kullanıcının personel kaydını döndürür. select_related ile yüklenmişse sorgu yapılmaz,
+    aksi halde personel ve takım tek sorguda okunur. Kayıt yoksa None döner.
+    """
+    try:
+        return user._state.fields_cache['personnel']
+    except KeyError:
+        pass
+    personnel = Personnel.objects.select_related('team').filter(user_id=user.pk).first()
+    user._state.fields_cache['personnel'] = personnel
+    return personnel
+
+
+def build_role_context(user):
+    """Kullanıcının rol bağlamını önbellekten okur, yoksa hesaplayıp önbelleğe yazar."""
+    if not user or not user.is_authenticated:
+        return ANONYMOUS_ROLE_CONTEXT
+    context = role_context_cache.get(user.pk)
+    if context is None:
+        context = RoleContext.from_user(user, _loaded_personnel(user))
+        role_context_cache.set(user.pk, context)
+    return context
+
+
+async def abuild_role_context(user):
+    """build_role_context'in async karşılığı; önbellek isabetinde thread'e geçilmez."""
+    if user and user.is_authenticated:
+        context = role_context_cache.get(user.pk)
+        if context is not None:
+            return context
+    return await sync_to_async(build_role_context)(user)
+
+
+def get_role_context(request):
+    """
+    İsteğin rol bağlamını döndürür; istek başına yalnızca bir kez hesaplanır.
+    Hem Django HttpRequest hem DRF Request nesneleriyle çalışır.
+    """
+    http_request = getattr(request, '_request', request)
+    context = getattr(http_request, 'role_context', None)
+    if context is None or context.user_id != getattr(request.user, 'pk', None):
+        context = build_role_context(request.user)
+        http_request.role_context = context
+    return context
+
+
+STALE_ROLE_MESSAGE = "Personel veya takım kaydınız değişmiş; lütfen işlemi tekrar deneyin."
+
+
+def load_role_personnel(role):
+    """
+    Yazma işlemleri için rol bağlamındaki personeli takımıyla birlikte veritabanından taze okur.
+    Rol bağlamı süreç başına önbelleklendiğinden başka bir süreçte silinmiş veya takımı değiştirilmiş personel
+    için None döner ve önbellekteki bağlam silinir; çağıran işlemi reddetmelidir.
+    """
+    personnel = Personnel.objects.select_related('team').filter(pk=role.personnel_id, user_id=role.user_id).first()
+    team = personnel.team if personnel else None
+    if personnel is None or personnel.team_id != role.team_id or (team.team_type if team else None) != role.team_type:
+        invalidate_role_context(role.user_id)
+        return None
+    return personnel
+
+
+def invalidate_role_context(user_id=None):
+    """Kullanıcının (user_id verilmezse herkesin) önbellekteki rol bağlamını siler."""
+    if user_id is None:
+        role_context_cache.clear()
+    else:
+        role_context_cache.delete(user_id)
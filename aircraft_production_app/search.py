@@ -0,0 +1,166 @@
+# aircraft_production_app/search.py
+"""
+Seri numarası ve not alanlarında indeksli metin araması.
+
+- PostgreSQL: UPPER(alan) üzerinde pg_trgm GIN indeksi (icontains sorguları indeksten karşılanır) ve
+  iş emri notları için to_tsvector tam metin indeksi kullanılır.
+- Diğer veritabanları: SearchNgram tablosunda tutulan 3'lü karakter grupları (n-gram) ile aday kayıtlar
+  bulunur, ardından icontains ile doğrulanır.
+
+Küçük tablolardaki alanlar (takım, model, kullanıcı adı) birleştirme (JOIN) yerine `__in` alt sorgusuyla aranır.
+"""
+from functools import reduce
+import operator
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Count, Q
+from rest_framework import filters
+
+from .models import Aircraft, Part, SearchNgram, WorkOrder
+
+SEARCH_TRIGRAM = 'trigram'
+SEARCH_FULLTEXT = 'fulltext'
+
+# Model başına indeksli aranan alanlar ve PostgreSQL'deki indeks türleri.
+SEARCH_INDEXES = {
+    Part: {'serial_number': SEARCH_TRIGRAM},
+    Aircraft: {'serial_number': SEARCH_TRIGRAM},
+    WorkOrder: {'notes': SEARCH_FULLTEXT},
+}
+
+NGRAM_SIZE = 3
+FULLTEXT_CONFIG = 'simple'
+
+
+def ngrams(text):
+    """Metnin büyük harfe çevrilmiş 3'lü karakter gruplarını küme olarak döndürür."""
+    text = (text or '').upper()
+    return {text[index:index + NGRAM_SIZE] for index in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class PostgresSearchBackend:
+    """pg_trgm ve tam metin indekslerini kullanan arama."""
+    maintains_index = False
+
+    def filter_q(self, model, field_name, term):
+        if SEARCH_INDEXES[model][field_name] == SEARCH_FULLTEXT:
+            from django.contrib.postgres.search import SearchQuery, SearchVector
+            matching = model.objects.annotate(
+                search_vector=SearchVector(field_name, config=FULLTEXT_CONFIG)
+            ).filter(
+                search_vector=SearchQuery(term, config=FULLTEXT_CONFIG, search_type='websearch')
+            ).values('pk')
+            return Q(pk__in=matching)
+        # UPPER(alan) LIKE UPPER('%terim%') ifadesi trigram GIN indeksiyle eşleşir.
+        return Q(**{f'{field_name}__icontains': term})
+
+
+class NgramSearchBackend:
+    """SearchNgram tablosunu kullanan taşınabilir arama."""
+    maintains_index = True
+
+    def filter_q(self, model, field_name, term):
+        grams = ngrams(term)
+        if not grams:
+            # 3 karakterden kısa terimler için indeks kullanılamaz.
+            return Q(**{f'{field_name}__icontains': term})
+        candidates = SearchNgram.objects.filter(
+            model_label=model._meta.label_lower, field_name=field_name, gram__in=grams
+        ).values('object_id').annotate(
+            gram_count=Count('gram')
+        ).filter(gram_count=len(grams)).values('object_id')
+        # N-gramlar sırayı korumaz; adaylar icontains ile doğrulanır.
+        return Q(pk__in=candidates) & Q(**{f'{field_name}__icontains': term})
+
+    def index_instances(self, model, instances):
+        """Verilen kayıtların indeks satırlarını yeniden oluşturur."""
+        model_label = model._meta.label_lower
+        instances = [instance for instance in instances if instance.pk is not None]
+        if not instances:
+            return
+        SearchNgram.objects.filter(
+            model_label=model_label, object_id__in=[instance.pk for instance in instances]
+        ).delete()
+        SearchNgram.objects.bulk_create([
+            SearchNgram(model_label=model_label, field_name=field_name, gram=gram, object_id=instance.pk)
+            for instance in instances
+            for field_name in SEARCH_INDEXES[model]
+            for gram in ngrams(getattr(instance, field_name))
+        ], batch_size=1000)
+
+    def remove_instances(self, model, object_ids):
+        SearchNgram.objects.filter(model_label=model._meta.label_lower, object_id__in=object_ids).delete()
+
+
+def get_search_backend(model):
+    """
+    Modelin veritabanına uygun arama altyapısını döndürür.
+    SEARCH_BACKEND ayarı ('postgresql' veya 'ngram') ile zorlanabilir.
+    """
+    backend_name = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend_name is None:
+        backend_name = 'postgresql' if connections[router.db_for_read(model)].vendor == 'postgresql' else 'ngram'
+    return PostgresSearchBackend() if backend_name == 'postgresql' else NgramSearchBackend()
+
+
+def index_for_search(model, instances):
+    """N-gram altyapısında kayıtları arama indeksine ekler/günceller; PostgreSQL'de bir şey yapmaz."""
+    backend = get_search_backend(model)
+    if backend.maintains_index and model in SEARCH_INDEXES:
+        backend.index_instances(model, instances)
+
+
+def rebuild_search_index(model, chunk_size=2000):
+    """Modelin tüm kayıtları için n-gram indeksini baştan oluşturur. İndekslenen kayıt sayısını döndürür."""
+    backend = get_search_backend(model)
+    if not backend.maintains_index:
+        return 0
+    SearchNgram.objects.filter(model_label=model._meta.label_lower).delete()
+    field_names = list(SEARCH_INDEXES[model])
+    indexed_count = 0
+    batch = []
+    for instance in model.objects.order_by().only('pk', *field_names).iterator(chunk_size=chunk_size):
+        batch.append(instance)
+        if len(batch) >= chunk_size:
+            backend.index_instances(model, batch)
+            indexed_count += len(batch)
+            batch = []
+    backend.index_instances(model, batch)
+    return indexed_count + len(batch)
+
+
+def search_q(model, field_path, term):
+    """
+    Tek bir arama alanı için Q nesnesi üretir:
+    - İndeksli alanlar arama altyapısına yönlendirilir.
+    - İlişkili alanlar (örn. produced_by_team__name) küçük tabloda alt sorgu ile aranır.
+    - 'id' alanı yalnızca sayısal terimlerde birebir eşleşir.
+    """
+    if field_path in SEARCH_INDEXES.get(model, {}):
+        return get_search_backend(model).filter_q(model, field_path, term)
+    if field_path in ('id', 'pk'):
+        return Q(pk=int(term)) if term.isdigit() else Q(pk__in=[])
+    relation_name, _, remote_path = field_path.partition('__')
+    if remote_path:
+        related_model = model._meta.get_field(relation_name).related_model
+        return Q(**{f'{relation_name}__in': related_model.objects.filter(search_q(related_model, remote_path, term)).values('pk')})
+    return Q(**{f'{field_path}__icontains': term})
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    DRF SearchFilter yerine geçer; her terim için alanlar arasında OR, terimler arasında AND uygular.
+    Alanlar search_q ile indeksli aramaya veya alt sorgulara dönüştürülür, böylece
+    çok tablolu UPPER(...) LIKE zinciri ve distinct() gerekmez.
+    """
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        model = queryset.model
+        for term in search_terms:
+            queryset = queryset.filter(reduce(operator.or_, (search_q(model, field_path, term) for field_path in search_fields)))
+        return queryset
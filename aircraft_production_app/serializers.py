@@ -1,7 +1,8 @@
+from django.db import models
 from rest_framework import serializers
 from .models import (
     AircraftModel, PartType, Team, Personnel, User,
-    WorkOrder, Part, Aircraft,
+    WorkOrder, Part, Aircraft, ProductionEvent,
     DefinedTeamTypes, PartCategory, AircraftModelChoices,
     WorkOrderStatusChoices, PartStatusChoices, AircraftStatusChoices
 )
@@ -116,6 +117,15 @@ class TeamSerializer(serializers.ModelSerializer):
             'can_perform_assembly', 'personnel_count'
         ]
 
+class PartListSerializer(serializers.ListSerializer):
+    """
+    Parça listelerinde takılı olduğu uçak bilgisini tüm liste için tek sorguda çözer
+    (bkz. Part.resolve_installed_aircraft_info).
+    """
+    def to_representation(self, data):
+        parts = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return super().to_representation(Part.resolve_installed_aircraft_info(parts))
+
 class PartSerializer(serializers.ModelSerializer):
     """
     Part modelini serileştirir ve parça bilgilerini yönetir.
@@ -158,6 +168,7 @@ class PartSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Part
+        list_serializer_class = PartListSerializer
         fields = [
             'id', 'serial_number', 'part_type', 'part_type_display',
             'aircraft_model_compatibility', 'aircraft_model_compatibility_name',
@@ -175,6 +186,78 @@ class PartSerializer(serializers.ModelSerializer):
             'part_type', 'produced_by_team', 'created_by_personnel', 'status'
         ]
 
+class PartBulkItemSerializer(serializers.Serializer):
+    """
+    Toplu parça üretiminde tek bir (uçak modeli, adet) satırını doğrular.
+    """
+    aircraft_model_compatibility = serializers.PrimaryKeyRelatedField(
+        queryset=AircraftModel.objects.all(),
+        help_text="Parçanın uyumlu olduğu hava aracı modeli ID'si."
+    )
+    quantity = serializers.IntegerField(
+        min_value=1,
+        help_text="Bu model için üretilecek parça adedi."
+    )
+
+class PartBulkCreateSerializer(serializers.Serializer):
+    """
+    Toplu parça üretimi isteğini doğrular.
+    Tek model için 'aircraft_model_compatibility' + 'quantity' veya birden fazla model için 'items' kabul eder.
+    """
+    MAX_QUANTITY = 10000
+
+    aircraft_model_compatibility = serializers.PrimaryKeyRelatedField(
+        queryset=AircraftModel.objects.all(),
+        required=False,
+        help_text="Tek model üretiminde hava aracı modeli ID'si."
+    )
+    quantity = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        help_text="Tek model üretiminde parça adedi."
+    )
+    items = PartBulkItemSerializer(
+        many=True,
+        required=False,
+        help_text="Birden fazla model için (model, adet) listesi."
+    )
+
+    def validate(self, data):
+        """
+        İstek biçimlerinden birinin eksiksiz gönderildiğini ve toplam adedin sınırı aşmadığını doğrular.
+        validated_data['quantities_by_model'] alanını {AircraftModel: adet} olarak doldurur.
+        """
+        items = data.get('items')
+        if items is None:
+            if data.get('aircraft_model_compatibility') is None or data.get('quantity') is None:
+                raise serializers.ValidationError("'aircraft_model_compatibility' ve 'quantity' ya da 'items' gönderilmelidir.")
+            items = [{'aircraft_model_compatibility': data['aircraft_model_compatibility'], 'quantity': data['quantity']}]
+        elif not items:
+            raise serializers.ValidationError({"items": "En az bir satır gönderilmelidir."})
+
+        quantities_by_model = {}
+        for item in items:
+            aircraft_model = item['aircraft_model_compatibility']
+            quantities_by_model[aircraft_model] = quantities_by_model.get(aircraft_model, 0) + item['quantity']
+
+        if sum(quantities_by_model.values()) > self.MAX_QUANTITY:
+            raise serializers.ValidationError(f"Tek istekte en fazla {self.MAX_QUANTITY} parça üretilebilir.")
+        data['quantities_by_model'] = quantities_by_model
+        return data
+
+class BulkRecycleSerializer(serializers.Serializer):
+    """
+    Toplu geri dönüştürme/iptal isteğindeki kayıt ID'lerini doğrular.
+    """
+    MAX_IDS = 10000
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+        help_text="İşlenecek kayıtların ID listesi."
+    )
+
 class AircraftAssemblySerializer(serializers.Serializer):
     """
     AircraftModel ID'si vb. alarak Hava Aracı montajını yönetmek için kullanılan serializer.
@@ -211,6 +294,26 @@ class AircraftAssemblySerializer(serializers.Serializer):
                 raise serializers.ValidationError("Geçersiz İş Emri ID'si.")
         return value
 
+class AircraftBatchAssemblySerializer(serializers.Serializer):
+    """
+    Bir iş emri için toplu (N adet) hava aracı montajı isteğini doğrular.
+    """
+    work_order_id = serializers.IntegerField(
+        write_only=True,
+        help_text="Montajın yapılacağı WorkOrder ID'si."
+    )
+    count = serializers.IntegerField(
+        min_value=1,
+        max_value=1000,
+        write_only=True,
+        help_text="Monte edilecek hava aracı adedi."
+    )
+    allow_partial = serializers.BooleanField(
+        default=True,
+        write_only=True,
+        help_text="Stok yetmezse monte edilebilen kadar uçak üretilsin mi?"
+    )
+
 class AircraftSerializer(serializers.ModelSerializer):
     """
     Aircraft modelini serileştirir ve montaj durumunu gösterir.
@@ -324,7 +427,7 @@ class WorkOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkOrder
         fields = [
-            'id', 'aircraft_model', 'aircraft_model_name', 'quantity',
+            'id', 'aircraft_model', 'aircraft_model_name', 'quantity', 'completed_count',
             'status', 'status_display',
             'created_by', 'created_by_username',
             'assigned_to_assembly_team', 'assigned_to_assembly_team_name',
@@ -335,7 +438,7 @@ class WorkOrderSerializer(serializers.ModelSerializer):
             'aircraft_model_name', 'status_display',
             'created_by_username', 'assigned_to_assembly_team_name',
             'created_by',
-            'status'
+            'status', 'completed_count'
         ]
 
     def get_created_by_username(self, obj):
@@ -370,3 +473,15 @@ class WorkOrderSerializer(serializers.ModelSerializer):
             elif not isinstance(data.get('quantity'), int) or data.get('quantity') < 1:
                 raise serializers.ValidationError({"quantity": "Miktar pozitif bir tam sayı olmalıdır."})
         return data
+
+
+class ProductionEventSerializer(serializers.ModelSerializer):
+    """
+    Üretim olay günlüğü kayıtlarını (salt okunur) serileştirir.
+    """
+    event_type_display = serializers.CharField(source='get_event_type_display', read_only=True)
+
+    class Meta:
+        model = ProductionEvent
+        fields = ['id', 'occurred_at', 'entity_type', 'entity_id', 'serial_number', 'event_type', 'event_type_display', 'team', 'data']
+        read_only_fields = fields
@@ -1,32 +1,41 @@
 # aircraft_production_app/signals.py
-from django.db.models.signals import post_save, pre_delete # pre_delete'i import et
+from collections import Counter
+from django.db.models.signals import post_save, pre_delete, post_delete # pre_delete'i import et
 from django.dispatch import receiver
-from .models import Aircraft, WorkOrder, WorkOrderStatusChoices, Part, PartStatusChoices # Part ve PartStatusChoices'ı import et
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from .authentication import evict_token, evict_user_tokens
+from .counts import invalidate_counts_on_commit
+from .events import record_event
+from .roles import invalidate_role_context
+from .search import SEARCH_INDEXES, get_search_backend, index_for_search
+from .models import Team, Personnel, Aircraft, AircraftStatusChoices, WorkOrder, WorkOrderStatusChoices, Part, PartStatusChoices, StockLevel, AircraftStockLevel # Part ve PartStatusChoices'ı import et
+from .models import ProductionEvent, ProductionEventTypeChoices, PART_STATUS_EVENT_TYPES
 
 @receiver(post_save, sender=Aircraft)
-def update_work_order_status_on_aircraft_creation(sender, instance, created, **kwargs):
-    if instance.work_order:  # Eğer uçak bir iş emrine bağlıysa
-        work_order = instance.work_order
-
-        # Sadece durumu "Tamamlandı" veya "İptal Edildi" olmayan iş emirlerini güncelle
-        if work_order.status not in [WorkOrderStatusChoices.COMPLETED, WorkOrderStatusChoices.CANCELLED]:
-            completed_aircraft_count = Aircraft.objects.filter(work_order=work_order).count()
-
-            if completed_aircraft_count >= work_order.quantity:
-                work_order.status = WorkOrderStatusChoices.COMPLETED
-            elif completed_aircraft_count > 0: # En az bir uçak üretildiyse ama hedefe ulaşılmadıysa
-                work_order.status = WorkOrderStatusChoices.IN_PROGRESS
-            # Eğer completed_aircraft_count == 0 ise (örneğin ilk uçak silinirse ve sayı 0'a düşerse),
-            # durum PENDING veya ASSIGNED'a geri dönebilir. Bu mantık eklenebilir veya
-            # initial save metodundaki PENDING/ASSIGNED yeterli olabilir.
-            # Şimdilik, 0'a düşerse durumunu değiştirmiyoruz, ilk atandığı gibi kalıyor.
-            #Ya da PENDING/ASSIGNED'a geri döndürmek için:
-            else: # completed_aircraft_count == 0
-                if work_order.assigned_to_assembly_team:
-                    work_order.status = WorkOrderStatusChoices.ASSIGNED
-                else:
-                    work_order.status = WorkOrderStatusChoices.PENDING
-            work_order.save()
+def update_work_order_progress_on_aircraft_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Uçak bir iş emrine bağlandığında veya iş emrinden ayrıldığında iş emri sayaçlarını günceller.
+    Eski iş emri, kayıttan önceki anlık görüntüden okunur; iş emri değişmediyse sorgu yapılmaz.
+    """
+    if raw:
+        return
+    if created:
+        old_work_order_id = None
+    else:
+        loaded_values = instance.get_loaded_values()
+        if loaded_values is None: # Önceki durumu bilinmiyor; sapma reconcile_work_order_progress ile düzeltilir.
+            return
+        old_work_order_id = loaded_values['work_order_id']
+    if old_work_order_id != instance.work_order_id:
+        WorkOrder.objects.apply_progress(Counter({old_work_order_id: -1, instance.work_order_id: 1}))
+
+
+@receiver(post_delete, sender=Aircraft)
+def update_work_order_progress_on_aircraft_delete(sender, instance, **kwargs):
+    """Fiziksel olarak silinen uçağın iş emri sayacından düşer."""
+    loaded_values = instance.get_loaded_values() or {'work_order_id': instance.work_order_id}
+    WorkOrder.objects.apply_progress({loaded_values['work_order_id']: -1})
 
 
 @receiver(pre_delete, sender=Aircraft)
@@ -35,18 +44,176 @@ def make_parts_available_on_aircraft_deletion(sender, instance, **kwargs):
     Bir uçak silinmeden hemen önce, üzerinde bulunan parçaların durumunu
     'AVAILABLE' olarak günceller.
     """
-    aircraft_being_deleted = instance
-    parts_to_update = [
-        aircraft_being_deleted.wing,
-        aircraft_being_deleted.fuselage,
-        aircraft_being_deleted.tail,
-        aircraft_being_deleted.avionics
-    ]
-
-    for part_instance in parts_to_update:
-        if part_instance: # Eğer slota bir parça atanmışsa
-            # Parçanın uçağa olan bağlantısını koparmaya gerek yok, çünkü uçak zaten siliniyor.
-            # Sadece durumunu güncellememiz yeterli.
-            part_instance.status = PartStatusChoices.AVAILABLE
-            part_instance.save()
-            print(f"'{part_instance}' (SN: {part_instance.serial_number}) uçağı silindiği için durumu '{PartStatusChoices.AVAILABLE.label}' olarak güncellendi.") # Loglama/Debug için
\ No newline at end of file
+    part_ids = [getattr(instance, f'{slot}_id') for slot in instance.part_slot_fields]
+    part_ids = [part_id for part_id in part_ids if part_id]
+    if part_ids:
+        # Uçak zaten silindiği için bağlantıyı koparmaya gerek yok; durumlar tek sorguda güncellenir.
+        Part.objects.filter(pk__in=part_ids).set_status(PartStatusChoices.AVAILABLE)
+
+
+def _stock_deltas_for_save(instance, created):
+    """
+    Kaydedilen nesnenin stok anahtarındaki değişimi {anahtar: fark} olarak döndürür.
+    Anahtar, modelin `stock_key_fields` değerlerinden oluşur.
+    """
+    new_key = tuple(getattr(instance, attname) for attname in instance.stock_key_fields)
+    deltas = Counter()
+    if created:
+        deltas[new_key] += 1
+        return deltas
+
+    loaded_values = instance.get_loaded_values()
+    if loaded_values is None: # Önceki durumu bilinmiyor; sapma rebuild_stock_levels ile düzeltilir.
+        return deltas
+    old_key = tuple(loaded_values[attname] for attname in instance.stock_key_fields)
+    if old_key != new_key:
+        deltas[old_key] -= 1
+        deltas[new_key] += 1
+    return deltas
+
+
+def _stock_deltas_for_delete(instance):
+    loaded_values = instance.get_loaded_values() or {attname: getattr(instance, attname) for attname in instance.stock_key_fields}
+    return Counter({tuple(loaded_values[attname] for attname in instance.stock_key_fields): -1})
+
+
+@receiver(post_save, sender=Part)
+def update_part_stock_level_on_save(sender, instance, created, raw=False, **kwargs):
+    """Parça oluşturulduğunda veya model/tip/durum değiştiğinde stok özet tablosunu günceller."""
+    if not raw:
+        StockLevel.objects.apply_deltas(_stock_deltas_for_save(instance, created))
+
+
+@receiver(post_delete, sender=Part)
+def update_part_stock_level_on_delete(sender, instance, **kwargs):
+    """Parça fiziksel olarak silindiğinde stok özet tablosundan düşer."""
+    StockLevel.objects.apply_deltas(_stock_deltas_for_delete(instance))
+
+
+@receiver(post_save, sender=Aircraft)
+def update_aircraft_stock_level_on_save(sender, instance, created, raw=False, **kwargs):
+    """Uçak oluşturulduğunda veya model/takım/durum değiştiğinde uçak stok özet tablosunu günceller."""
+    if not raw:
+        AircraftStockLevel.objects.apply_deltas(_stock_deltas_for_save(instance, created))
+
+
+@receiver(post_delete, sender=Aircraft)
+def update_aircraft_stock_level_on_delete(sender, instance, **kwargs):
+    """Uçak fiziksel olarak silindiğinde uçak stok özet tablosundan düşer."""
+    AircraftStockLevel.objects.apply_deltas(_stock_deltas_for_delete(instance))
+
+
+def invalidate_datatable_counts(sender, **kwargs):
+    """Kayıt eklendiğinde/değiştiğinde/silindiğinde o model için önbellekteki DataTable sayımlarını geçersiz kılar."""
+    invalidate_counts_on_commit(sender)
+
+
+# Alıcılar yalnızca DataTable ile listelenen modellere bağlanır; göndericisiz bir post_delete alıcısı
+# tüm modellerde toplu silmenin hızlı yolunu (fast delete) devre dışı bırakırdı.
+for counted_model in (Part, Aircraft, WorkOrder, Team, Personnel, User):
+    post_save.connect(invalidate_datatable_counts, sender=counted_model, dispatch_uid=f'invalidate_counts_save_{counted_model._meta.label_lower}')
+    post_delete.connect(invalidate_datatable_counts, sender=counted_model, dispatch_uid=f'invalidate_counts_delete_{counted_model._meta.label_lower}')
+
+
+@receiver(post_save, sender=Part)
+@receiver(post_save, sender=Aircraft)
+@receiver(post_save, sender=WorkOrder)
+def update_search_index_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """N-gram arama altyapısında kaydın indeks satırlarını günceller."""
+    if raw:
+        return
+    loaded_values = None if created or not hasattr(instance, 'get_loaded_values') else instance.get_loaded_values()
+    if loaded_values is not None and all(
+        field_name in loaded_values and loaded_values[field_name] == getattr(instance, field_name)
+        for field_name in SEARCH_INDEXES[sender]
+    ):
+        return # Aranan alanlar değişmedi.
+    index_for_search(sender, [instance])
+
+
+@receiver(post_delete, sender=Part)
+@receiver(post_delete, sender=Aircraft)
+@receiver(post_delete, sender=WorkOrder)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    """Silinen kaydın n-gram indeks satırlarını kaldırır."""
+    backend = get_search_backend(sender)
+    if backend.maintains_index:
+        backend.remove_instances(sender, [instance.pk])
+
+
+CREATED_EVENT_TYPES = {
+    Part: ProductionEventTypeChoices.PART_PRODUCED,
+    Aircraft: ProductionEventTypeChoices.AIRCRAFT_ASSEMBLED,
+    WorkOrder: ProductionEventTypeChoices.WORK_ORDER_CREATED,
+}
+
+
+def _status_event_type(instance):
+    """Kaydın yeni durumuna karşılık gelen olay tipini döndürür."""
+    if isinstance(instance, Part):
+        return PART_STATUS_EVENT_TYPES[instance.status]
+    if isinstance(instance, Aircraft):
+        if instance.status == AircraftStatusChoices.RECYCLED:
+            return ProductionEventTypeChoices.AIRCRAFT_RECYCLED
+        return ProductionEventTypeChoices.AIRCRAFT_STATUS_CHANGED
+    return ProductionEventTypeChoices.WORK_ORDER_STATUS_CHANGED
+
+
+@receiver(post_save, sender=Part)
+@receiver(post_save, sender=Aircraft)
+@receiver(post_save, sender=WorkOrder)
+def record_production_event_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Oluşturma ve durum değişikliklerini üretim olay günlüğüne ekler. Eski durum anlık görüntüden okunur;
+    toplu işlemler (set_status, bulk_create) olaylarını kendileri kaydeder.
+    """
+    if raw:
+        return
+    if created:
+        data = {'status': instance.status}
+        if sender is Aircraft:
+            data.update(work_order_id=instance.work_order_id, parts={slot: getattr(instance, f'{slot}_id') for slot in Aircraft.part_slot_fields})
+        record_event(ProductionEvent.for_instance(instance, CREATED_EVENT_TYPES[sender], **data), using=instance._state.db)
+        return
+
+    loaded_values = instance.get_loaded_values()
+    if loaded_values is None or loaded_values['status'] == instance.status:
+        return
+    record_event(
+        ProductionEvent.for_instance(instance, _status_event_type(instance), from_status=loaded_values['status'], to_status=instance.status),
+        using=instance._state.db,
+    )
+
+
+@receiver(post_save, sender=Personnel)
+@receiver(post_delete, sender=Personnel)
+def invalidate_role_context_on_personnel_change(sender, instance, **kwargs):
+    """Personelin takımı değiştiğinde kullanıcının önbellekteki rol bağlamını siler."""
+    invalidate_role_context(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_role_context_on_user_change(sender, instance, **kwargs):
+    """Admin yetkisi değişebileceğinden kullanıcının rol bağlamını siler."""
+    invalidate_role_context(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def evict_cached_tokens_on_user_change(sender, instance, created, **kwargs):
+    """Kullanıcı güncellendiğinde (örn. pasife alındığında) önbellekteki token eşlemelerini siler."""
+    if not created:
+        evict_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def evict_cached_token_on_delete(sender, instance, **kwargs):
+    """Silinen (veya kullanıcısıyla birlikte silinen) token'ı önbellekten çıkarır."""
+    evict_token(instance.key)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_role_context_on_team_change(sender, instance, **kwargs):
+    """Takım tipi tüm üyelerin rolünü etkiler; takımlar seyrek değiştiği için önbellek tamamen temizlenir."""
+    invalidate_role_context()
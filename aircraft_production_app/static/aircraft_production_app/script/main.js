@@ -250,6 +250,7 @@ function fetchCurrentUserInfoAndRedirect($button = null, originalButtonText = "G
  * Kullanıcı oturumunu sonlandırır ve giriş sayfasına yönlendirir.
  */
 function handleLogout() {
+    stopLiveUpdates();
     authToken = null; currentUser = null;
     localStorage.removeItem('authToken'); localStorage.removeItem('currentUser');
     window.location.href = LOGIN_PAGE_URL;
@@ -1519,6 +1520,114 @@ function saveTeam() {
 
 
 
+// =================================================================================
+// LIVE UPDATES (SSE)
+// =================================================================================
+
+/** @type {EventSource|null} Canlı olay akışı bağlantısı. */
+let liveEventSource = null;
+/** @type {string} Alınan son olayın sıra numarası; yeniden bağlanırken kaçırılan olaylar bundan sonra istenir. */
+let liveLastEventId = '';
+/** @type {Set<string>} Bir sonraki toplu yenilemede yeniden yüklenecek görünümler. */
+let livePendingRefreshes = new Set();
+/** @type {number|null} Toplu yenileme zamanlayıcısı. */
+let liveRefreshTimer = null;
+/** @type {number} Art arda başarısız bağlantı denemesi sayısı; bağlantı açıldığında sıfırlanır. */
+let liveFailedAttempts = 0;
+/** Sunucuya yeniden bağlanmadan önce beklenecek ilk süre (ms); art arda başarısız denemelerde iki katına çıkar. */
+const LIVE_RECONNECT_DELAY_MS = 5000;
+/** Yeniden bağlanma bekleme süresinin üst sınırı (ms). */
+const LIVE_MAX_RECONNECT_DELAY_MS = 5 * 60 * 1000;
+/** Art arda gelen olayları tek bir yenilemede toplamak için bekleme süresi (ms). */
+const LIVE_REFRESH_DEBOUNCE_MS = 1000;
+
+/**
+ * Canlı olay akışını başlatır. EventSource başlık gönderemediği için önce kısa ömürlü bir bilet alınır;
+ * bağlantı koptuğunda yeni bir biletle, son alınan olaydan itibaren yeniden bağlanılır.
+ * Sunucu akışı desteklemiyorsa (ASGI dışı) veya bilet isteği yeniden denenemeyecek bir hatayla dönerse durulur.
+ */
+function startLiveUpdates() {
+    if (typeof EventSource === 'undefined' || !authToken) return;
+    makeApiRequest('live/ticket/', 'POST', null,
+        function(response) {
+            if (!response.enabled) return; // Canlı güncelleme yok; sayfalar normal şekilde çalışmaya devam eder.
+            const url = liveLastEventId ? `${response.url}&last_event_id=${encodeURIComponent(liveLastEventId)}` : response.url;
+            liveEventSource = new EventSource(url);
+            liveEventSource.onopen = function() { liveFailedAttempts = 0; };
+            liveEventSource.onmessage = function(event) {
+                if (event.lastEventId) liveLastEventId = event.lastEventId;
+                try { handleLiveEvent(JSON.parse(event.data)); }
+                catch (e) { console.error("Canlı olay işlenemedi:", e, event.data); }
+            };
+            liveEventSource.onerror = function() {
+                // Bilet tek kullanımlık değildir ama süresi dolar; yeniden bağlanırken yenisi alınır.
+                stopLiveUpdates();
+                scheduleLiveReconnect();
+            };
+        },
+        function(errorMessage, xhr) {
+            // 4xx (429 hariç) yeniden denemekle düzelmez.
+            if (xhr && xhr.status >= 400 && xhr.status < 500 && xhr.status !== 429) return;
+            scheduleLiveReconnect();
+        },
+        false
+    );
+}
+
+/** Art arda başarısız denemelerde üstel olarak artan bir beklemeden sonra yeniden bağlanır. */
+function scheduleLiveReconnect() {
+    const delay = Math.min(LIVE_RECONNECT_DELAY_MS * 2 ** liveFailedAttempts, LIVE_MAX_RECONNECT_DELAY_MS);
+    liveFailedAttempts++;
+    setTimeout(startLiveUpdates, delay);
+}
+
+/** Canlı olay bağlantısını kapatır. */
+function stopLiveUpdates() {
+    if (liveEventSource) { liveEventSource.close(); liveEventSource = null; }
+}
+
+/**
+ * Sunucudan gelen olayı, etkilediği görünümlere çevirir ve kısa bir süre içinde gelen olayları tek yenilemede toplar.
+ * @param {object} message {type, entity, ...} veya {type: 'STOCK_CHANGED', stock, rows} ya da {type: 'RESYNC'}.
+ */
+function handleLiveEvent(message) {
+    if (message.type === 'RESYNC') {
+        ['parts', 'aircraft', 'workOrders', 'stock'].forEach(view => livePendingRefreshes.add(view));
+    } else if (message.type === 'STOCK_CHANGED') {
+        livePendingRefreshes.add('stock');
+    } else if (message.entity === 'PART') {
+        livePendingRefreshes.add('parts');
+    } else if (message.entity === 'AIRCRAFT') {
+        livePendingRefreshes.add('aircraft');
+    } else if (message.entity === 'WORK_ORDER') {
+        livePendingRefreshes.add('workOrders');
+    }
+    if (!liveRefreshTimer) { liveRefreshTimer = setTimeout(applyLiveRefreshes, LIVE_REFRESH_DEBOUNCE_MS); }
+}
+
+/** Bekleyen görünümlerden yalnızca ekranda olanları, bulunulan sayfayı koruyarak yeniden yükler. */
+function applyLiveRefreshes() {
+    const views = livePendingRefreshes;
+    livePendingRefreshes = new Set();
+    liveRefreshTimer = null;
+    if (views.has('parts')) {
+        if (adminPartsDataTable && $('#partsContent').is(':visible')) adminPartsDataTable.ajax.reload(null, false);
+        if (myTeamPartsDataTable && $('#myTeamPartsContent').is(':visible')) myTeamPartsDataTable.ajax.reload(null, false);
+    }
+    if (views.has('aircraft') && aircraftsDataTable && $('#aircraftsContent').is(':visible')) {
+        aircraftsDataTable.ajax.reload(null, false);
+    }
+    if (views.has('workOrders')) {
+        if (workOrdersDataTable && $('#workOrdersContent').is(':visible')) workOrdersDataTable.ajax.reload(null, false);
+        if (assignedWorkOrdersDataTable && $('#assignedWorkOrdersContent').is(':visible')) assignedWorkOrdersDataTable.ajax.reload(null, false);
+    }
+    if (views.has('stock')) {
+        if ($('#stockLevelsContent').is(':visible')) fetchStockLevels();
+        if ($('#dashboardContent').is(':visible')) displayDashboardStockWarningsFromStockLevelsAPI();
+    }
+}
+
+
 // =================================================================================
 // PAGE INITIALIZATION & EVENT LISTENERS
 // =================================================================================
@@ -1573,6 +1682,7 @@ $(document).ready(function() {
         }
         }
         loadContent(initialContent);
+        startLiveUpdates();
         
         $('#logoutButton').off('click').on('click', handleLogout);
 
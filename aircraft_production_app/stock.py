@@ -0,0 +1,70 @@
+# aircraft_production_app/stock.py
+"""
+Stok özet tablolarının (StockLevel, AircraftStockLevel) kaynak tablolarla doğrulanması ve onarımı.
+Artımlı güncellemeler models.StockLevelManager.apply_deltas ile yapılır.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Aircraft, AircraftStockLevel, Part, StockLevel
+
+
+def compute_part_stock():
+    """Part tablosundan {(aircraft_model_id, part_type_id, status): adet} sözlüğünü hesaplar."""
+    rows = Part.objects.order_by().values_list(
+        'aircraft_model_compatibility_id', 'part_type_id', 'status'
+    ).annotate(count=Count('id'))
+    return {(aircraft_model_id, part_type_id, status): count for aircraft_model_id, part_type_id, status, count in rows}
+
+
+def compute_aircraft_stock():
+    """Aircraft tablosundan {(aircraft_model_id, assembled_by_team_id, status): adet} sözlüğünü hesaplar."""
+    rows = Aircraft.objects.order_by().values_list(
+        'aircraft_model_id', 'assembled_by_team_id', 'status'
+    ).annotate(count=Count('id'))
+    return {(aircraft_model_id, team_id, status): count for aircraft_model_id, team_id, status, count in rows}
+
+
+def _sync_table(model, compute_expected, repair):
+    """
+    Özet tablodaki satırları beklenen sayılarla karşılaştırır.
+    Sapmaları [(anahtar, tablodaki adet, beklenen adet), ...] olarak döndürür; repair=True ise düzeltir.
+    """
+    key_fields = model.objects.key_fields
+    # Satırlar önce kilitlenir: artımlı güncelleme yapan transaction'lar bu senkronizasyonun bitmesini bekler,
+    # böylece henüz commit edilmemiş değişiklikler iki kez sayılmaz.
+    stored_rows = {
+        tuple(getattr(row, attname) for attname in key_fields): row
+        for row in model.objects.select_for_update()
+    }
+    expected_counts = compute_expected()
+
+    drift = []
+    to_update = []
+    for key, row in stored_rows.items():
+        expected = expected_counts.get(key, 0)
+        if row.count != expected:
+            drift.append((key, row.count, expected))
+            row.count = expected
+            to_update.append(row)
+    to_create = []
+    for key, expected in expected_counts.items():
+        if key not in stored_rows:
+            drift.append((key, None, expected))
+            to_create.append(model(count=expected, **dict(zip(key_fields, key))))
+
+    if repair:
+        model.objects.bulk_update(to_update, ['count'])
+        model.objects.bulk_create(to_create)
+    return drift
+
+
+def sync_stock_levels(repair=True):
+    """
+    Parça ve uçak stok özet tablolarını kaynak tablolarla karşılaştırır, repair=True ise sapmaları düzeltir.
+    Dönüş değeri: {'parts': [...], 'aircraft': [...]} sapma listeleri.
+    """
+    with transaction.atomic():
+        part_drift = _sync_table(StockLevel, compute_part_stock, repair)
+        aircraft_drift = _sync_table(AircraftStockLevel, compute_aircraft_stock, repair)
+    return {'parts': part_drift, 'aircraft': aircraft_drift}
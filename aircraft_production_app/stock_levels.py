@@ -0,0 +1,120 @@
+# aircraft_production_app/stock_levels.py
+"""
+Stok seviyeleri uç noktasının (DataTable) sorguları ve satır üretimi.
+
+Sorgular ve yanıt üretimi ayrıdır: senkron view sorguları list() ile, async view async ORM ile çalıştırır
+(bkz. views.StockLevelsAPIView, async_views.stock_levels); her iki view da aynı yanıtı üretir.
+Sayımlar Part/Aircraft tabloları yerine artımlı güncellenen StockLevel/AircraftStockLevel özet tablolarından okunur.
+"""
+from django.db import models
+
+from .models import AircraftModel, AircraftStockLevel, AircraftStatusChoices, PartStatusChoices, PartType, StockLevel
+
+STOCK_TYPES = ('parts', 'aircrafts')
+INVALID_STOCK_TYPE_MESSAGE = "Geçerli bir 'stock_type' parametresi ('parts' veya 'aircrafts') gereklidir."
+
+
+def stock_level_querysets(stock_type, role, params):
+    """
+    Yanıt için çalıştırılacak sorgular: {ad: queryset}.
+    Kullanıcının göremeyeceği stok tipi için None döner (boş yanıt).
+    """
+    if not role.has_personnel and not role.is_admin:
+        return None
+
+    aircraft_model_id = params.get('aircraft_model_id')
+    aircraft_models = AircraftModel.objects.all()
+    if aircraft_model_id:
+        aircraft_models = aircraft_models.filter(id=aircraft_model_id)
+
+    if stock_type == 'parts':
+        part_category_id = params.get('part_category_id')
+        # Montaj takımı ve admin tüm kategorileri, üretim takımları yalnızca kendi kategorisini görür.
+        category = None
+        if not role.is_admin and not role.can_assemble and role.producible_category:
+            category = role.producible_category.value
+
+        part_types = PartType.objects.all()
+        stock = StockLevel.objects.filter(count__gt=0)
+        if category:
+            part_types = part_types.filter(category=category)
+            stock = stock.filter(part_type__category=category)
+        if part_category_id:
+            part_types = part_types.filter(id=part_category_id)
+            stock = stock.filter(part_type_id=part_category_id)
+        if aircraft_model_id:
+            stock = stock.filter(aircraft_model_id=aircraft_model_id)
+        return {
+            'aircraft_models': aircraft_models,
+            'part_types': part_types,
+            'stock': stock.values_list('aircraft_model_id', 'part_type_id', 'status', 'count'),
+        }
+
+    if not (role.is_admin or role.can_assemble):
+        return None
+    stock = AircraftStockLevel.objects.filter(count__gt=0)
+    if aircraft_model_id:
+        stock = stock.filter(aircraft_model_id=aircraft_model_id)
+    if role.can_assemble and not role.is_admin and role.team_id:
+        stock = stock.filter(assembled_by_team_id=role.team_id)
+    return {
+        'aircraft_models': aircraft_models,
+        'stock': stock.values_list('aircraft_model_id', 'status').annotate(count=models.Sum('count')).order_by(),
+    }
+
+
+def _part_rows(results):
+    counts = {}
+    for aircraft_model_id, part_type_id, part_status, count in results['stock']:
+        counts.setdefault((aircraft_model_id, part_type_id), {})[part_status] = count
+
+    rows = []
+    for aircraft_model in results['aircraft_models']:
+        for part_type in results['part_types']:
+            combo_counts = counts.get((aircraft_model.id, part_type.id), {})
+            row = {
+                "aircraft_model_name": aircraft_model.get_name_display(),
+                "part_type_category_display": part_type.get_category_display(),
+                "warning_zero_stock": combo_counts.get(PartStatusChoices.AVAILABLE.value, 0) == 0,
+            }
+            for status_choice, status_label in PartStatusChoices.choices:
+                row[status_choice] = combo_counts.get(status_choice, 0)
+            rows.append(row)
+    return rows
+
+
+def _aircraft_rows(results):
+    counts = {}
+    for aircraft_model_id, aircraft_status, count in results['stock']:
+        counts.setdefault(aircraft_model_id, {})[aircraft_status] = count
+
+    rows = []
+    for aircraft_model in results['aircraft_models']:
+        model_counts = counts.get(aircraft_model.id, {})
+        row = {"aircraft_model_name": aircraft_model.get_name_display()}
+        for status_choice, status_label in AircraftStatusChoices.choices:
+            row[status_choice] = model_counts.get(status_choice, 0)
+        rows.append(row)
+    return rows
+
+
+def build_stock_levels_response(stock_type, params, results):
+    """
+    Çalıştırılmış sorgu sonuçlarından ({ad: satır listesi} veya None) DataTable yanıtını üretir.
+    Her model/parça tipi birleşimi, stoğu olmasa da sıfır sayılarla listelenir.
+    """
+    draw = int(params.get('draw', 0))
+    if results is None:
+        return {'draw': draw, 'recordsTotal': 0, 'recordsFiltered': 0, 'data': []}
+    start = int(params.get('start', 0))
+    length = int(params.get('length', 10))
+    if length == -1:
+        length = 999999
+
+    rows = _part_rows(results) if stock_type == 'parts' else _aircraft_rows(results)
+    return {
+        'draw': draw,
+        'recordsTotal': len(rows),
+        'recordsFiltered': len(rows),
+        'data': rows[start: start + length],
+    }
@@ -0,0 +1,62 @@
+# aircraft_production_app/team_stats.py
+"""
+Takım üretim istatistikleri (takımlar tablosu ve panel kartları için).
+
+Tüm takımların personel sayısı, durum bazında üretilen parça sayıları, monte edilen uçak sayısı ve
+son `window_days` gündeki günlük üretim hızı TeamQuerySet.with_stats ile tek sorguda hesaplanır.
+Sonuç önbellekte tutulur; anahtar Team, Personnel, Part ve Aircraft sayım sürümlerini içerdiğinden
+(bkz. counts.invalidate_counts) bu tablolara yapılan her yazma önbelleği kendiliğinden geçersiz kılar.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .counts import get_count_version
+from .models import Aircraft, DefinedTeamTypes, Part, PartStatusChoices, Personnel, Team
+
+DEFAULT_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 365
+
+
+def _cache_key(window_days):
+    versions = '.'.join(str(get_count_version(model)) for model in (Team, Personnel, Part, Aircraft))
+    return f"team-stats:v{versions}:{window_days}"
+
+
+def compute_team_stats(window_days=DEFAULT_WINDOW_DAYS):
+    """Takım istatistiklerini önbelleğe bakmadan hesaplar."""
+    now = timezone.now()
+    part_fields = {status: f'parts_{status.lower()}' for status in PartStatusChoices.values}
+    rows = Team.objects.with_stats(since=now - timedelta(days=window_days)).order_by('name').values(
+        'id', 'name', 'team_type', 'member_total', 'aircraft_total', 'recent_part_total', 'recent_aircraft_total',
+        *part_fields.values()
+    )
+
+    teams = []
+    for row in rows:
+        parts = {status: row[field] for status, field in part_fields.items()}
+        parts['total'] = sum(parts.values())
+        is_assembly = row['team_type'] == DefinedTeamTypes.ASSEMBLY_TEAM
+        recent_total = row['recent_aircraft_total'] if is_assembly else row['recent_part_total']
+        teams.append({
+            'id': row['id'],
+            'name': row['name'],
+            'team_type': row['team_type'],
+            'team_type_display': DefinedTeamTypes(row['team_type']).label if row['team_type'] in DefinedTeamTypes.values else row['team_type'],
+            'member_count': row['member_total'],
+            'parts': parts,
+            'aircraft_assembled': row['aircraft_total'],
+            # Team.get_produced_item_count ile aynı: montaj takımı için uçak, diğerleri için parça sayısı.
+            'produced_total': row['aircraft_total'] if is_assembly else parts['total'],
+            'produced_in_window': recent_total,
+            'throughput_per_day': round(recent_total / window_days, 2),
+        })
+    return {'window_days': window_days, 'generated_at': now, 'teams': teams}
+
+
+def get_team_stats(window_days=DEFAULT_WINDOW_DAYS):
+    """Takım istatistiklerini önbellekten döndürür; yoksa hesaplayıp saklar."""
+    timeout = getattr(settings, 'TEAM_STATS_CACHE_TIMEOUT', 300)
+    return cache.get_or_set(_cache_key(window_days), lambda: compute_team_stats(window_days), timeout)
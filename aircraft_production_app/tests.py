@@ -1,3 +1,1384 @@
-from django.test import TestCase
+from io import StringIO
+import asyncio
+import json
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from aircraft_production_project.asgi import ConcurrencyLimiter
+
+from .authentication import CachingTokenAuthentication, RoleAwareTokenAuthentication, token_cache
+
+from .inventory import pick_available_parts
+
+from .models import (
+    Aircraft, AircraftModel, AircraftStockLevel, Part, PartType, Personnel, ProductionEvent, SearchNgram, SerialSequence, StockLevel, Team, WorkOrder,
+    AircraftModelChoices, AircraftStatusChoices, DefinedTeamTypes, PartCategory, PartSlotChoices, PartStatusChoices, ProductionEventTypeChoices, WorkOrderStatusChoices,
+)
+from .roles import build_role_context, invalidate_role_context
+from .recycling import cancel_work_orders, recycle_aircraft, recycle_parts
+from .installations import sync_part_installations
+from .live import RESYNC, STOCK_CHANGED, LiveEventBroker, broker as live_broker, issue_stream_ticket, notify_payloads, publish, read_stream_ticket, scope_message, token_fingerprint
+from .metrics import RequestMetrics, fingerprint_sql, registry as metrics_registry
+from .signals import update_work_order_progress_on_aircraft_save
+from .stock import sync_stock_levels
+from .assembly import assemble_work_order_batch
+from .checks import check_multi_worker_settings
+
+
+class ProductionFixturesMixin:
+    """Testlerde kullanılan takım, personel ve parça oluşturma yardımcıları."""
+
+    TEAM_TYPE_FOR_CATEGORY = {
+        PartCategory.WING: DefinedTeamTypes.WING_TEAM,
+        PartCategory.FUSELAGE: DefinedTeamTypes.FUSELAGE_TEAM,
+        PartCategory.TAIL: DefinedTeamTypes.TAIL_TEAM,
+        PartCategory.AVIONICS: DefinedTeamTypes.AVIONICS_TEAM,
+    }
+
+    @classmethod
+    def create_team_with_member(cls, name, team_type):
+        team = Team.objects.create(name=name, team_type=team_type)
+        user = User.objects.create_user(username=f"{name.lower()}_user", password='test-pass-123')
+        personnel = Personnel.objects.create(user=user, team=team)
+        return team, personnel
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tb2 = AircraftModel.objects.get(name=AircraftModelChoices.TB2)
+        cls.akinci = AircraftModel.objects.get(name=AircraftModelChoices.AKINCI)
+        cls.part_types = {part_type.category: part_type for part_type in PartType.objects.all()}
+        cls.production_teams = {}
+        cls.production_personnel = {}
+        for category, team_type in cls.TEAM_TYPE_FOR_CATEGORY.items():
+            team, personnel = cls.create_team_with_member(f"{category.label}Team", team_type)
+            cls.production_teams[category] = team
+            cls.production_personnel[category] = personnel
+        cls.assembly_team, cls.assembly_personnel = cls.create_team_with_member('Montaj', DefinedTeamTypes.ASSEMBLY_TEAM)
+
+    def create_part(self, category, aircraft_model=None, **kwargs):
+        return Part.objects.create(
+            part_type=self.part_types[category],
+            aircraft_model_compatibility=aircraft_model or self.tb2,
+            produced_by_team=self.production_teams[category],
+            created_by_personnel=self.production_personnel[category],
+            **kwargs
+        )
+
+    def create_part_set(self, aircraft_model=None):
+        return {category: self.create_part(category, aircraft_model) for category in PartCategory}
+
+
+class SerialSequenceTests(ProductionFixturesMixin, TestCase):
+
+    def test_part_serials_are_sequential_per_prefix(self):
+        first = self.create_part(PartCategory.WING)
+        second = self.create_part(PartCategory.WING)
+        other_model = self.create_part(PartCategory.WING, self.akinci)
+        self.assertEqual(first.serial_number, 'TB2-KNT-00001')
+        self.assertEqual(second.serial_number, 'TB2-KNT-00002')
+        self.assertEqual(other_model.serial_number, 'AKINCI-KNT-00001')
+        self.assertEqual(SerialSequence.objects.get(prefix='TB2-KNT-').last_value, 2)
+
+    def test_recycled_parts_do_not_cause_serial_reuse(self):
+        part = self.create_part(PartCategory.TAIL)
+        part.delete()
+        self.assertEqual(self.create_part(PartCategory.TAIL).serial_number, 'TB2-KYR-00002')
+
+    def test_block_reservation_assigns_contiguous_range(self):
+        self.create_part(PartCategory.AVIONICS)
+        parts = [
+            Part(part_type=self.part_types[PartCategory.AVIONICS], aircraft_model_compatibility=self.tb2,
+                 produced_by_team=self.production_teams[PartCategory.AVIONICS])
+            for _ in range(3)
+        ]
+        Part.allocate_serial_numbers(parts)
+        self.assertEqual([part.serial_number for part in parts], ['TB2-AVY-00002', 'TB2-AVY-00003', 'TB2-AVY-00004'])
+
+    def test_missing_counter_is_seeded_from_existing_serials(self):
+        self.create_part(PartCategory.FUSELAGE)
+        Part.objects.filter(serial_number='TB2-GVD-00001').update(serial_number='TB2-GVD-00041')
+        SerialSequence.objects.all().delete()
+        self.assertEqual(self.create_part(PartCategory.FUSELAGE).serial_number, 'TB2-GVD-00042')
+
+    def test_aircraft_serial_uses_model_counter(self):
+        parts = self.create_part_set()
+        aircraft = Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+        self.assertEqual(aircraft.serial_number, 'TB2-0001')
+        self.assertEqual(SerialSequence.objects.get(prefix='TB2-').last_value, 1)
+
+    def test_sync_command_raises_counters_to_existing_serials(self):
+        self.create_part(PartCategory.WING)
+        Part.objects.filter(serial_number='TB2-KNT-00001').update(serial_number='TB2-KNT-00120')
+        call_command('sync_serial_sequences', stdout=StringIO())
+        self.assertEqual(SerialSequence.objects.get(prefix='TB2-KNT-').last_value, 120)
+        self.assertEqual(self.create_part(PartCategory.WING).serial_number, 'TB2-KNT-00121')
+
+
+class PartReservationTests(ProductionFixturesMixin, TestCase):
+
+    def test_pick_returns_oldest_available_part_per_category_in_one_query(self):
+        oldest = self.create_part_set()
+        self.create_part_set()
+        self.create_part(PartCategory.WING, status=PartStatusChoices.RECYCLED)
+        with self.assertNumQueries(1):
+            picked = pick_available_parts(self.tb2)
+        self.assertEqual({category: parts[0] for category, parts in picked.items()}, oldest)
+
+    def test_pick_reports_short_categories(self):
+        self.create_part(PartCategory.WING)
+        self.create_part(PartCategory.WING)
+        self.create_part(PartCategory.TAIL)
+        picked = pick_available_parts(self.tb2, quantity=2)
+        self.assertEqual(len(picked[PartCategory.WING]), 2)
+        self.assertEqual(len(picked[PartCategory.TAIL]), 1)
+        self.assertEqual(picked[PartCategory.FUSELAGE], [])
+
+    def test_assemble_endpoint_uses_fifo_parts_and_marks_them_used(self):
+        oldest = self.create_part_set()
+        self.create_part_set()
+        client = APIClient()
+        client.force_authenticate(self.assembly_personnel.user)
+        response = client.post('/api/assembly/assemble-aircraft/', {'aircraft_model_id': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['wing_sn'], oldest[PartCategory.WING].serial_number)
+        used = Part.objects.filter(status=PartStatusChoices.USED)
+        self.assertEqual(set(used), set(oldest.values()))
+
+    def test_assemble_endpoint_reports_missing_categories(self):
+        self.create_part(PartCategory.WING)
+        client = APIClient()
+        client.force_authenticate(self.assembly_personnel.user)
+        response = client.post('/api/assembly/assemble-aircraft/', {'aircraft_model_id': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data['missing_parts']), 3)
+        self.assertEqual(Part.objects.get().status, PartStatusChoices.AVAILABLE)
+
+    def test_part_taken_concurrently_aborts_assembly(self):
+        parts = self.create_part_set()
+        Part.objects.filter(pk=parts[PartCategory.TAIL].pk).update(status=PartStatusChoices.USED)
+        aircraft = Aircraft(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+        with self.assertRaises(DjangoValidationError):
+            aircraft.save()
+        self.assertFalse(Aircraft.objects.exists())
+        self.assertFalse(Part.objects.filter(pk=parts[PartCategory.WING].pk, status=PartStatusChoices.USED).exists())
+
+
+class BatchAssemblyTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.assembly_personnel.user)
+        self.work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=3, assigned_to_assembly_team=self.assembly_team)
+
+    def post_batch(self, count, **extra):
+        return self.client.post('/api/assembly/assemble-batch/', {'work_order_id': self.work_order.id, 'count': count, **extra}, format='json')
+
+    def test_batch_builds_all_units_and_completes_work_order(self):
+        part_sets = [self.create_part_set() for _ in range(3)]
+        response = self.post_batch(3)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['assembled'], 3)
+        self.assertEqual(response.data['shortfalls'], [])
+        self.assertEqual([row['serial_number'] for row in response.data['aircraft']], ['TB2-0001', 'TB2-0002', 'TB2-0003'])
+        self.assertEqual(response.data['aircraft'][0]['wing_sn'], part_sets[0][PartCategory.WING].serial_number)
+        self.assertFalse(Part.objects.exclude(status=PartStatusChoices.USED).exists())
+        self.work_order.refresh_from_db()
+        self.assertEqual(self.work_order.status, WorkOrderStatusChoices.COMPLETED)
+
+    def test_batch_reports_per_unit_shortfalls(self):
+        self.create_part_set()
+        self.create_part_set()
+        self.create_part(PartCategory.WING)
+        response = self.post_batch(3)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['assembled'], 2)
+        self.assertEqual(response.data['shortfalls'], [{'unit': 3, 'missing_parts': ['Gövde', 'Kuyruk', 'Aviyonik']}])
+        self.work_order.refresh_from_db()
+        self.assertEqual(self.work_order.status, WorkOrderStatusChoices.IN_PROGRESS)
+
+    def test_batch_without_partial_builds_nothing_on_shortfall(self):
+        self.create_part_set()
+        response = self.post_batch(2, allow_partial=False)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Aircraft.objects.exists())
+        self.assertFalse(Part.objects.filter(status=PartStatusChoices.USED).exists())
+
+    def test_batch_cannot_exceed_work_order_quantity(self):
+        response = self.post_batch(4)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('count', response.data['details'])
+
+
+class StockLevelTests(ProductionFixturesMixin, TestCase):
+
+    def assertStockConsistent(self):
+        self.assertEqual(sync_stock_levels(repair=False), {'parts': [], 'aircraft': []})
+
+    def test_summary_follows_part_and_aircraft_lifecycle(self):
+        parts = self.create_part_set()
+        self.create_part(PartCategory.WING).delete()
+        aircraft = Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+        self.assertStockConsistent()
+        wing_used = StockLevel.objects.get(aircraft_model=self.tb2, part_type=self.part_types[PartCategory.WING], status=PartStatusChoices.USED)
+        self.assertEqual(wing_used.count, 1)
+
+        aircraft.delete()
+        self.assertStockConsistent()
+        self.assertEqual(AircraftStockLevel.objects.get(status=AircraftStatusChoices.RECYCLED).count, 1)
+
+    def test_batch_assembly_updates_summary(self):
+        work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=2)
+        self.create_part_set()
+        self.create_part_set()
+        assemble_work_order_batch(work_order.id, 2, self.assembly_team, self.assembly_personnel)
+        self.assertStockConsistent()
+
+    def test_rebuild_command_repairs_drift(self):
+        self.create_part_set()
+        StockLevel.objects.filter(status=PartStatusChoices.AVAILABLE).update(count=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_stock_levels', '--check', stdout=StringIO())
+        call_command('rebuild_stock_levels', stdout=StringIO())
+        self.assertStockConsistent()
+
+    def test_apply_deltas_upserts_new_and_existing_keys(self):
+        wing = self.part_types[PartCategory.WING].pk
+        existing = (self.tb2.pk, wing, PartStatusChoices.AVAILABLE)
+        new = (self.akinci.pk, wing, PartStatusChoices.AVAILABLE)
+        StockLevel.objects.update_or_create(aircraft_model_id=self.tb2.pk, part_type_id=wing, status=PartStatusChoices.AVAILABLE, defaults={'count': 2})
+        StockLevel.objects.filter(aircraft_model_id=self.akinci.pk, part_type_id=wing, status=PartStatusChoices.AVAILABLE).delete()
+        # Satır olup olmadığı tablo yeniden okunarak belirlenmez; tek bir INSERT ... ON CONFLICT yeterlidir.
+        with self.assertNumQueries(1):
+            StockLevel.objects.apply_deltas({existing: 3, new: 1})
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False):
+            StockLevel.objects.apply_deltas({existing: -1, new: 4})
+        counts = dict(StockLevel.objects.filter(part_type_id=wing, status=PartStatusChoices.AVAILABLE, count__gt=0).values_list('aircraft_model_id', 'count'))
+        self.assertEqual(counts, {self.tb2.pk: 4, self.akinci.pk: 5})
+
+    def test_stock_endpoint_reads_summary_table(self):
+        self.create_part(PartCategory.WING)
+        client = APIClient()
+        client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        response = client.get('/api/inventory/stock-levels/', {'stock_type': 'parts', 'aircraft_model_id': self.tb2.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['recordsTotal'], 1)
+        row = response.data['data'][0]
+        self.assertEqual((row['AVAILABLE'], row['warning_zero_stock']), (1, False))
+
+
+class BulkPartProductionTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+
+    def test_bulk_create_allocates_contiguous_serials(self):
+        self.create_part(PartCategory.WING)
+        response = self.client.post('/api/parts/bulk/', {'items': [
+            {'aircraft_model_compatibility': self.tb2.id, 'quantity': 3},
+            {'aircraft_model_compatibility': self.akinci.id, 'quantity': 2},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(response.data['serial_numbers'], [
+            'TB2-KNT-00002', 'TB2-KNT-00003', 'TB2-KNT-00004', 'AKINCI-KNT-00001', 'AKINCI-KNT-00002',
+        ])
+        self.assertEqual(Part.objects.filter(produced_by_team=self.production_teams[PartCategory.WING]).count(), 6)
+        self.assertEqual(sync_stock_levels(repair=False), {'parts': [], 'aircraft': []})
+
+    def test_bulk_create_requires_quantity(self):
+        response = self.client.post('/api/parts/bulk/', {'aircraft_model_compatibility': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Part.objects.exists())
+
+    def test_assembly_team_cannot_bulk_create(self):
+        self.client.force_authenticate(self.assembly_personnel.user)
+        response = self.client.post('/api/parts/bulk/', {'aircraft_model_compatibility': self.tb2.id, 'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class KeysetPaginationTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        self.parts = [self.create_part(PartCategory.WING) for _ in range(5)]
+
+    def get_page(self, **params):
+        response = self.client.get('/api/parts/', {'paging': 'keyset', 'length': 2, 'draw': 3, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_cursor_walks_all_pages_in_order(self):
+        expected = [part.serial_number for part in Part.objects.order_by('-production_date', '-id')]
+        pages = [self.get_page()]
+        while pages[-1]['next']:
+            pages.append(self.get_page(cursor=pages[-1]['next']))
+        self.assertEqual([row['serial_number'] for page in pages for row in page['data']], expected)
+        self.assertEqual((pages[0]['draw'], pages[0]['recordsTotal'], pages[0]['previous']), (3, 5, None))
+
+        previous_page = self.get_page(cursor=pages[-1]['previous'])
+        self.assertEqual([row['serial_number'] for row in previous_page['data']], expected[2:4])
+
+    def test_count_is_cached_until_parts_change(self):
+        self.assertEqual(self.get_page()['countMode'], 'cached')
+        # Sinyal göndermeyen bir yazma önbelleği geçersiz kılmaz.
+        Part.objects.bulk_create([Part(
+            part_type=self.part_types[PartCategory.WING], aircraft_model_compatibility=self.tb2,
+            produced_by_team=self.production_teams[PartCategory.WING], serial_number='TB2-KNT-99999',
+        )])
+        self.assertEqual(self.get_page()['recordsTotal'], 5)
+        self.assertEqual(self.get_page(count_mode='exact')['recordsTotal'], 6)
+
+        self.create_part(PartCategory.WING)
+        self.assertEqual(self.get_page()['recordsTotal'], 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/parts/', {'paging': 'keyset', 'cursor': 'bozuk'})
+        self.assertEqual(response.status_code, 404)
+
+
+class IndexedSearchTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        self.tb2_part = self.create_part(PartCategory.WING)
+        self.akinci_part = self.create_part(PartCategory.WING, self.akinci)
+
+    def search(self, **params):
+        response = self.client.get('/api/parts/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['serial_number'] for row in response.data['data']]
+
+    def test_serial_search_uses_ngram_index(self):
+        self.assertTrue(SearchNgram.objects.filter(object_id=self.akinci_part.pk, gram='AKI').exists())
+        self.assertEqual(self.search(search='nci-knt'), [self.akinci_part.serial_number])
+        self.assertEqual(self.search(serial_number='TB2-KNT-0'), [self.tb2_part.serial_number])
+        # N-gramlar eşleşse de sıra tutmayan terimler elenir.
+        self.assertEqual(self.search(search='KNT-TB2'), [])
+
+    def test_related_fields_and_multiple_terms(self):
+        self.assertEqual(len(self.search(search='kanatteam')), 2)
+        self.assertEqual(self.search(search='kanatteam akinci'), [self.akinci_part.serial_number])
+
+    def test_index_follows_bulk_production_and_rebuild(self):
+        self.client.post('/api/parts/bulk/', {'aircraft_model_compatibility': self.tb2.id, 'quantity': 2}, format='json')
+        self.assertEqual(self.search(search='KNT-00003'), ['TB2-KNT-00003'])
+
+        SearchNgram.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search(search='KNT-00003'), ['TB2-KNT-00003'])
+
+    def test_work_order_notes_search(self):
+        WorkOrder.objects.create(aircraft_model=self.tb2, quantity=1, notes='Acil teslimat')
+        WorkOrder.objects.create(aircraft_model=self.tb2, quantity=1, notes='Normal')
+        self.client.force_authenticate(User.objects.create_user('yonetici', password='x', is_staff=True))
+        response = self.client.get('/api/work-orders/', {'search': 'teslim'})
+        self.assertEqual([row['notes'] for row in response.data['data']], ['Acil teslimat'])
+
+
+class RoleContextTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        invalidate_role_context()
+        self.wing_user = self.production_personnel[PartCategory.WING].user
+        self.token = Token.objects.create(user=self.wing_user)
+
+    def test_token_authentication_loads_role_in_one_query(self):
+        with self.assertNumQueries(1):
+            user, _ = RoleAwareTokenAuthentication().authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            role = build_role_context(user)
+        self.assertEqual(
+            (role.team_id, role.producible_category, role.can_assemble, role.is_admin),
+            (self.production_teams[PartCategory.WING].pk, PartCategory.WING, False, False)
+        )
+
+    def test_cached_role_is_invalidated_when_team_changes(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(client.get('/api/aircraft/').data['recordsTotal'], 0)
+        self.assertTrue(build_role_context(self.wing_user).is_production_team)
+
+        team = self.production_teams[PartCategory.WING]
+        team.team_type = DefinedTeamTypes.ASSEMBLY_TEAM
+        team.save()
+        self.assertTrue(build_role_context(User.objects.get(pk=self.wing_user.pk)).can_assemble)
+        response = client.post('/api/parts/', {'aircraft_model_compatibility': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_writes_reject_role_cached_before_personnel_changed_elsewhere(self):
+        # Başka bir süreçteki değişiklik: sinyal çalışmaz, bu süreçteki önbellek eskimiş kalır.
+        wing_client = APIClient()
+        wing_client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        build_role_context(self.wing_user)
+        Personnel.objects.filter(user=self.wing_user).update(team=self.production_teams[PartCategory.TAIL])
+        response = wing_client.post('/api/parts/', {'aircraft_model_compatibility': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Part.objects.exists())
+        # Önbellek silindi; sonraki istek güncel takımla çalışır.
+        self.assertEqual(build_role_context(User.objects.get(pk=self.wing_user.pk)).producible_category, PartCategory.TAIL)
+
+        assembly_user = self.assembly_personnel.user
+        assembly_client = APIClient()
+        assembly_client.force_authenticate(assembly_user)
+        build_role_context(assembly_user)
+        Personnel.objects.filter(user=assembly_user).delete()
+        response = assembly_client.post('/api/assembly/assemble-aircraft/', {'aircraft_model_id': self.tb2.id}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class TokenCacheTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        invalidate_role_context()
+        self.user = self.production_personnel[PartCategory.WING].user
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachingTokenAuthentication()
+
+    def test_cache_hit_costs_no_queries(self):
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+        hits_before = token_cache.stats()['hits']
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+            role = build_role_context(user)
+        self.assertEqual((user.pk, token.user, role.team_id), (self.user.pk, user, self.production_teams[PartCategory.WING].pk))
+        self.assertEqual(token_cache.stats()['hits'], hits_before + 1)
+
+    def test_token_deletion_and_deactivation_evict_entries(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+        self.user.is_active = True
+        self.user.save()
+        self.authentication.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_stats_endpoint_is_admin_only(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(client.get('/api/auth/cache-stats/').status_code, 403)
+        client.force_authenticate(User.objects.create_user('yonetici', password='x', is_staff=True))
+        response = client.get('/api/auth/cache-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('misses', response.data['token_cache'])
+
+
+class WorkOrderProgressTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        self.work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=2, assigned_to_assembly_team=self.assembly_team)
+
+    def create_aircraft(self, work_order=None):
+        parts = self.create_part_set()
+        return Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team, work_order=work_order,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+
+    def assertProgress(self, completed_count, status):
+        self.work_order.refresh_from_db()
+        self.assertEqual((self.work_order.completed_count, self.work_order.status), (completed_count, status))
+
+    def test_attach_detach_updates_counter_and_status(self):
+        aircraft = self.create_aircraft(self.work_order)
+        self.assertProgress(1, WorkOrderStatusChoices.IN_PROGRESS)
+
+        aircraft.work_order = None
+        aircraft.save()
+        self.assertProgress(0, WorkOrderStatusChoices.ASSIGNED)
+
+        aircraft.work_order = self.work_order
+        aircraft.save()
+        self.create_aircraft(self.work_order)
+        self.assertProgress(2, WorkOrderStatusChoices.COMPLETED)
+
+    def test_status_only_edit_does_not_touch_work_order(self):
+        aircraft = self.create_aircraft(self.work_order)
+        aircraft = Aircraft.objects.get(pk=aircraft.pk)
+        aircraft.status = AircraftStatusChoices.RECYCLED
+        with self.assertNumQueries(0):
+            update_work_order_progress_on_aircraft_save(Aircraft, aircraft, created=False)
+
+    def test_stale_instance_save_keeps_counter(self):
+        stale = WorkOrder.objects.get(pk=self.work_order.pk)
+        WorkOrder.objects.apply_progress({self.work_order.pk: 1})
+
+        stale.notes = 'Güncellendi'
+        stale.save()
+        self.assertProgress(1, WorkOrderStatusChoices.IN_PROGRESS)
+        self.assertEqual((stale.completed_count, stale.status), (1, WorkOrderStatusChoices.IN_PROGRESS))
+
+        # Miktar değişince durum güncel sayaçtan yeniden hesaplanır.
+        stale.quantity = 1
+        stale.save()
+        self.assertProgress(1, WorkOrderStatusChoices.COMPLETED)
+        self.assertEqual(self.work_order.notes, 'Güncellendi')
+
+    def test_reconcile_command_repairs_drift(self):
+        self.create_aircraft(self.work_order)
+        WorkOrder.objects.filter(pk=self.work_order.pk).update(completed_count=5, status=WorkOrderStatusChoices.PENDING)
+        with self.assertRaises(CommandError):
+            call_command('reconcile_work_order_progress', '--check', stdout=StringIO())
+        call_command('reconcile_work_order_progress', stdout=StringIO())
+        self.assertProgress(1, WorkOrderStatusChoices.IN_PROGRESS)
+
+
+class AircraftSaveQueryTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.assembly_personnel.user)
+        # Rol bağlamını önbelleğe al; sorgu sayıları yalnızca montaj işini ölçsün.
+        build_role_context(self.assembly_personnel.user)
+
+    def assemble(self):
+        return self.client.post('/api/assembly/assemble-aircraft/', {'aircraft_model_id': self.tb2.id}, format='json')
+
+    def test_assembly_query_count_does_not_grow(self):
+        for _ in range(3):
+            self.create_part_set()
+        # İlk montaj seri numarası sayacını oluşturur; sonraki montajlar aynı sayıda sorgu kullanmalı.
+        self.assertEqual(self.assemble().status_code, 201)
+        with self.assertNumQueries(22):
+            self.assertEqual(self.assemble().status_code, 201)
+        with self.assertNumQueries(22):
+            self.assertEqual(self.assemble().status_code, 201)
+
+    def test_refit_reads_old_parts_from_snapshot(self):
+        parts = self.create_part_set()
+        aircraft = Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+        new_wing = self.create_part(PartCategory.WING)
+        aircraft = Aircraft.objects.get(pk=aircraft.pk)
+        aircraft.wing = new_wing
+        # Eski parçalar ve değişmeyen slotlar için SELECT yapılmaz: güncelleme, iki toplu durum değişikliği ve stok farkları.
+        with self.assertNumQueries(13):
+            aircraft.clean()
+            aircraft.save()
+        statuses = dict(Part.objects.filter(pk__in=[new_wing.pk, parts[PartCategory.WING].pk]).values_list('pk', 'status'))
+        self.assertEqual(statuses, {new_wing.pk: PartStatusChoices.USED, parts[PartCategory.WING].pk: PartStatusChoices.AVAILABLE})
+
+
+class RecyclingTests(ProductionFixturesMixin, TestCase):
+
+    def create_aircraft(self, work_order=None):
+        parts = self.create_part_set()
+        return Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team, work_order=work_order,
+            wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+            tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+        )
+
+    def recycle_and_count_queries(self, aircraft_count):
+        ids = [self.create_aircraft().pk for _ in range(aircraft_count)]
+        with CaptureQueriesContext(connection) as queries:
+            report = recycle_aircraft(Aircraft.objects.filter(pk__in=ids))
+        self.assertEqual(report.processed, aircraft_count)
+        return len(queries)
+
+    def test_recycle_aircraft_frees_parts_with_constant_queries(self):
+        self.recycle_and_count_queries(1) # İlk çağrı 'RECYCLED' stok satırlarını oluşturur.
+        self.assertEqual(self.recycle_and_count_queries(1), self.recycle_and_count_queries(5))
+        self.assertFalse(Part.objects.exclude(status=PartStatusChoices.AVAILABLE).exists())
+        self.assertFalse(Aircraft.objects.filter(wing__isnull=False).exists())
+        self.assertEqual(sync_stock_levels(repair=False), {'parts': [], 'aircraft': []})
+        self.assertEqual(recycle_aircraft(Aircraft.objects.all()).skipped, sorted(Aircraft.objects.values_list('pk', flat=True)))
+
+    def test_recycle_parts_reports_used_parts(self):
+        aircraft = self.create_aircraft()
+        spare = self.create_part(PartCategory.WING)
+        report = recycle_parts(Part.objects.filter(pk__in=[aircraft.wing_id, spare.pk]))
+        self.assertEqual(report.processed, 1)
+        self.assertEqual([refused['id'] for refused in report.refused], [aircraft.wing_id])
+        self.assertEqual(Part.objects.get(pk=spare.pk).status, PartStatusChoices.RECYCLED)
+        with self.assertRaises(DjangoValidationError):
+            Part.objects.get(pk=aircraft.wing_id).delete()
+
+    def test_cancel_work_orders_detaches_aircraft(self):
+        work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=3)
+        aircraft = self.create_aircraft(work_order)
+        report = cancel_work_orders(WorkOrder.objects.all())
+        self.assertEqual(report.processed, 1)
+        work_order.refresh_from_db()
+        self.assertEqual((work_order.status, work_order.completed_count), (WorkOrderStatusChoices.CANCELLED, 0))
+        self.assertIsNone(Aircraft.objects.get(pk=aircraft.pk).work_order_id)
+
+    def test_recycle_endpoint_returns_report(self):
+        aircraft = self.create_aircraft()
+        spare = self.create_part(PartCategory.WING)
+        other_team_part = self.create_part(PartCategory.TAIL)
+        client = APIClient()
+        client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        response = client.post('/api/parts/recycle/', {'ids': [spare.pk, aircraft.wing_id, other_team_part.pk]}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['processed'], 1)
+        self.assertEqual(response.data['refused'][0]['id'], aircraft.wing_id)
+        self.assertEqual(response.data['not_found'], [other_team_part.pk])
+
+
+class ProductionEventTests(ProductionFixturesMixin, TestCase):
+
+    def event_types(self, **filters):
+        return list(ProductionEvent.objects.filter(**filters).order_by('occurred_at', 'id').values_list('event_type', flat=True))
+
+    def test_events_are_written_in_one_batch_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            parts = self.create_part_set()
+            aircraft = Aircraft.objects.create(
+                aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+                wing=parts[PartCategory.WING], fuselage=parts[PartCategory.FUSELAGE],
+                tail=parts[PartCategory.TAIL], avionics=parts[PartCategory.AVIONICS]
+            )
+            self.assertFalse(ProductionEvent.objects.exists())
+        wing_serial = parts[PartCategory.WING].serial_number
+        self.assertEqual(self.event_types(serial_number=wing_serial), [ProductionEventTypeChoices.PART_PRODUCED, ProductionEventTypeChoices.PART_USED])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            aircraft.delete()
+        self.assertEqual(self.event_types(serial_number=aircraft.serial_number), [ProductionEventTypeChoices.AIRCRAFT_ASSEMBLED, ProductionEventTypeChoices.AIRCRAFT_RECYCLED])
+        self.assertEqual(self.event_types(serial_number=wing_serial)[-1], ProductionEventTypeChoices.PART_FREED)
+
+    def test_rolled_back_transaction_writes_no_events(self):
+        from django.db import transaction
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.create_part(PartCategory.WING)
+                    raise DjangoValidationError("geri al")
+            except DjangoValidationError:
+                pass
+            self.create_part(PartCategory.TAIL)
+        self.assertEqual(self.event_types(), [ProductionEventTypeChoices.PART_PRODUCED])
+
+    def test_rolled_back_savepoint_keeps_outer_events(self):
+        from django.db import transaction
+        with self.captureOnCommitCallbacks(execute=True):
+            wing = self.create_part(PartCategory.WING)
+            try:
+                with transaction.atomic():
+                    self.create_part(PartCategory.FUSELAGE)
+                    with transaction.atomic():
+                        self.create_part(PartCategory.AVIONICS)
+                    raise DjangoValidationError("geri al")
+            except DjangoValidationError:
+                pass
+            tail = self.create_part(PartCategory.TAIL)
+        self.assertEqual(
+            sorted(ProductionEvent.objects.values_list('serial_number', flat=True)),
+            sorted([wing.serial_number, tail.serial_number])
+        )
+
+    def test_work_order_transitions_are_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=1)
+            work_order.apply_progress(1)
+        events = ProductionEvent.objects.filter(entity_id=work_order.pk).order_by('id')
+        self.assertEqual([event.event_type for event in events], [ProductionEventTypeChoices.WORK_ORDER_CREATED, ProductionEventTypeChoices.WORK_ORDER_STATUS_CHANGED])
+        self.assertEqual(events[1].data['to_status'], WorkOrderStatusChoices.COMPLETED)
+
+    def test_events_endpoint_is_scoped_to_team(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            wing = self.create_part(PartCategory.WING)
+            self.create_part(PartCategory.TAIL)
+        client = APIClient()
+        client.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        response = client.get('/api/events/', {'serial_number': wing.serial_number})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([row['serial_number'] for row in response.data['data']], [wing.serial_number])
+        self.assertEqual(len(client.get('/api/events/').data['data']), 1)
+
+
+class StreamingExportTests(ProductionFixturesMixin, TestCase):
+
+    def export(self, user, path, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_part_csv_export_honours_filters_and_team_scope(self):
+        available = self.create_part(PartCategory.WING)
+        self.create_part(PartCategory.WING, status=PartStatusChoices.RECYCLED)
+        self.create_part(PartCategory.TAIL)
+        content = self.export(self.production_personnel[PartCategory.WING].user, '/api/parts/export/', status='AVAILABLE')
+        lines = content.splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['id', 'serial_number'])
+        self.assertEqual([line.split(',')[1] for line in lines[1:]], [available.serial_number])
+
+    def test_work_order_ndjson_export(self):
+        WorkOrder.objects.create(aircraft_model=self.tb2, quantity=3, notes='Acil "teslimat"')
+        admin = User.objects.create_user('yonetici', password='x', is_staff=True)
+        content = self.export(admin, '/api/work-orders/export/', export_format='ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([(row['quantity'], row['notes']) for row in rows], [(3, 'Acil "teslimat"')])
+
+    async def test_asgi_export_streams_rows_in_chunks(self):
+        parts = [await sync_to_async(self.create_part)(PartCategory.WING) for _ in range(3)]
+        user = self.production_personnel[PartCategory.WING].user
+        token = await sync_to_async(lambda: Token.objects.create(user=user).key)()
+        response = await self.async_client.get('/api/parts/export/', {'ordering': 'id'}, headers={'Authorization': f'Token {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)  # Senkron iteratör ASGI'de tamamen belleğe alınırdı.
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode('utf-8-sig')
+        lines = content.splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['id', 'serial_number'])
+        self.assertEqual([line.split(',')[1] for line in lines[1:]], [part.serial_number for part in parts])
+
+    def test_csv_export_neutralises_formulas(self):
+        WorkOrder.objects.create(aircraft_model=self.tb2, quantity=1, notes='=HYPERLINK("http://x")')
+        admin = User.objects.create_user('yonetici', password='x', is_staff=True)
+        content = self.export(admin, '/api/work-orders/export/')
+        self.assertIn('"\'=HYPERLINK(""http://x"")"', content)
+        ndjson = self.export(admin, '/api/work-orders/export/', export_format='ndjson')
+        self.assertEqual(json.loads(ndjson)['notes'], '=HYPERLINK("http://x")')  # NDJSON olduğu gibi kalır.
+
+    def test_unknown_export_format_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.assembly_personnel.user)
+        self.assertEqual(client.get('/api/aircraft/export/', {'export_format': 'xlsx'}).status_code, 400)
+
+
+class ProjectedListTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('yonetici', password='x', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=2, assigned_to_assembly_team=self.assembly_team)
+        parts = self.create_part_set()
+        Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team, assembled_by_personnel=self.assembly_personnel,
+            work_order=work_order, **{category.lower(): part for category, part in parts.items()}
+        )
+        self.create_part(PartCategory.TAIL, self.akinci)
+        WorkOrder.objects.create(aircraft_model=self.akinci, quantity=1, notes='Öncelikli')
+
+    def assert_matches_serializer(self, path, viewset, **params):
+        response = self.client.get(path, {'length': 50, **params})
+        self.assertEqual(response.status_code, 200)
+        view = viewset(request=response.wsgi_request, format_kwarg=None, action='list')
+        view.request = response.renderer_context['request']
+        instances = view.filter_queryset(view.get_queryset())
+        expected = view.get_serializer(instances, many=True).data
+        self.assertTrue(expected)
+        self.assertEqual(json.loads(response.content)['data'], json.loads(json.dumps(expected, cls=DjangoJSONEncoder)))
+
+    def test_list_payloads_match_serializers(self):
+        from .views import AircraftViewSet, PartViewSet, WorkOrderViewSet
+        self.assert_matches_serializer('/api/parts/', PartViewSet)
+        self.assert_matches_serializer('/api/parts/', PartViewSet, paging='keyset')
+        self.assert_matches_serializer('/api/aircraft/', AircraftViewSet)
+        self.assert_matches_serializer('/api/work-orders/', WorkOrderViewSet)
+
+    def test_keyset_cursor_from_projected_rows(self):
+        pages = [self.client.get('/api/parts/', {'paging': 'keyset', 'length': 2}).data]
+        while pages[-1]['next']:
+            pages.append(self.client.get('/api/parts/', {'paging': 'keyset', 'length': 2, 'cursor': pages[-1]['next']}).data)
+        serials = [row['serial_number'] for page in pages for row in page['data']]
+        self.assertEqual(serials, list(Part.objects.order_by('-production_date', '-id').values_list('serial_number', flat=True)))
+
+    def test_benchmark_command_checks_output(self):
+        out = StringIO()
+        call_command('bench_list_rendering', rows=10, repeat=1, stdout=out)
+        self.assertIn('rows/s', out.getvalue())
+        self.assertIn('matches the serializers', out.getvalue())
+
+
+class InstalledAircraftInfoTests(ProductionFixturesMixin, TestCase):
+
+    def assemble(self, aircraft_model=None):
+        parts = self.create_part_set(aircraft_model)
+        return Aircraft.objects.create(
+            aircraft_model=aircraft_model or self.tb2, assembled_by_team=self.assembly_team,
+            assembled_by_personnel=self.assembly_personnel, **{category.lower(): part for category, part in parts.items()}
+        )
+
+    def test_serializer_resolves_page_in_one_query(self):
+        from .serializers import PartSerializer
+        aircraft = [self.assemble(), self.assemble(self.akinci)]
+        self.create_part(PartCategory.WING)
+        queryset = Part.objects.select_related(
+            'part_type', 'aircraft_model_compatibility', 'produced_by_team', 'created_by_personnel__user'
+        ).order_by('id')
+        with CaptureQueriesContext(connection) as queries:
+            data = PartSerializer(queryset, many=True).data
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            [row['installed_aircraft_info'] for row in data],
+            [str(aircraft[0])] * 4 + [str(aircraft[1])] * 4 + ['-'],
+        )
+        # Tekil kayıtta önceden çözülmemiş değer eski yöntemle aynı sonucu verir.
+        self.assertEqual(Part.objects.get(pk=data[4]['id']).get_installed_aircraft_info(), str(aircraft[1]))
+
+    def test_admin_changelist_query_count_does_not_grow(self):
+        admin = User.objects.create_superuser('yonetici', password='x')
+        self.client.force_login(admin)
+        self.assemble()
+        self.client.get('/admin/aircraft_production_app/part/')
+        with CaptureQueriesContext(connection) as small_page:
+            self.assertEqual(self.client.get('/admin/aircraft_production_app/part/').status_code, 200)
+        self.assemble()
+        self.assemble()
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get('/admin/aircraft_production_app/part/')
+        self.assertContains(response, 'TB2 - SN:')
+        # Takılı uçak bilgisi satır başına sorgu üretmez (ilişkili nesneler ayrıca sorgulanabilir).
+        installed_queries = [q for q in large_page.captured_queries if '"aircraft_production_app_aircraft"' in q['sql']]
+        self.assertEqual(len(installed_queries), 1)
+        self.assertLessEqual(len(large_page), len(small_page) + 8 * 4)
+
+
+class PartInstallationTests(ProductionFixturesMixin, TestCase):
+
+    def assemble(self):
+        parts = self.create_part_set()
+        return Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team,
+            assembled_by_personnel=self.assembly_personnel, **{category.lower(): part for category, part in parts.items()}
+        )
+
+    def installations(self):
+        return dict(Part.objects.filter(installed_in__isnull=False).values_list('pk', 'installed_in_id'))
+
+    def test_assembly_refit_and_recycle_keep_pointer_in_sync(self):
+        aircraft = self.assemble()
+        self.assertEqual(set(aircraft.installed_parts.values_list('installed_slot', flat=True)), set(PartSlotChoices.values))
+
+        old_wing_id = aircraft.wing_id
+        aircraft.wing = self.create_part(PartCategory.WING)
+        aircraft.save()
+        self.assertEqual(self.installations().get(aircraft.wing_id), aircraft.pk)
+        self.assertNotIn(old_wing_id, self.installations())
+
+        recycle_aircraft(Aircraft.objects.filter(pk=aircraft.pk))
+        self.assertEqual(self.installations(), {})
+
+    def test_batch_assembly_sets_pointers(self):
+        work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=2, assigned_to_assembly_team=self.assembly_team)
+        for _ in range(2):
+            self.create_part_set()
+        _, aircrafts, _ = assemble_work_order_batch(work_order.id, 2, self.assembly_team, self.assembly_personnel)
+        expected = {getattr(aircraft, f'{slot}_id'): aircraft.pk for aircraft in aircrafts for slot in Aircraft.part_slot_fields}
+        self.assertEqual(self.installations(), expected)
+
+    def test_checker_reports_and_repairs_mismatches(self):
+        aircraft = self.assemble()
+        loose_part = self.create_part(PartCategory.TAIL)
+        self.assertEqual(sync_part_installations(repair=False), {'status': [], 'installed_in': [], 'duplicates': []})
+
+        Part.objects.filter(pk=aircraft.wing_id).update(installed_in=None, installed_slot='')
+        Part.objects.filter(pk=aircraft.tail_id).update(status=PartStatusChoices.AVAILABLE, installed_in=None)
+        Part.objects.filter(pk=loose_part.pk).update(status=PartStatusChoices.USED)
+        with self.assertRaises(CommandError):
+            call_command('check_part_installations', check=True, stdout=StringIO())
+
+        out = StringIO()
+        call_command('check_part_installations', stdout=out)
+        self.assertIn('Repaired 4 part installation mismatches', out.getvalue())
+        self.assertEqual(sync_part_installations(repair=False), {'status': [], 'installed_in': [], 'duplicates': []})
+        self.assertEqual(Part.objects.get(pk=loose_part.pk).status, PartStatusChoices.AVAILABLE)
+        self.assertEqual(self.installations(), {getattr(aircraft, f'{slot}_id'): aircraft.pk for slot in Aircraft.part_slot_fields})
+
+
+    def test_check_mode_takes_no_row_locks(self):
+        self.assemble()
+        Part.objects.filter(pk=self.create_part(PartCategory.WING).pk).update(status=PartStatusChoices.USED)
+        select_for_update = QuerySet.select_for_update
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=select_for_update) as lock:
+            report = sync_part_installations(repair=False)
+            lock.assert_not_called()
+            self.assertEqual(len(report['status']), 1)
+            sync_part_installations(repair=True)
+            lock.assert_called()
+
+class AdminChangelistTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('yonetici', password='x'))
+
+    def assemble(self):
+        parts = self.create_part_set()
+        work_order = WorkOrder.objects.create(aircraft_model=self.tb2, quantity=1, assigned_to_assembly_team=self.assembly_team)
+        return Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team, assembled_by_personnel=self.assembly_personnel,
+            work_order=work_order, **{category.lower(): part for category, part in parts.items()}
+        )
+
+    def count_queries(self, path, **params):
+        self.client.get(path, params)  # oturum ve sayım önbelleği ısınır
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_render_in_constant_queries(self):
+        paths = ['/admin/aircraft_production_app/part/', '/admin/aircraft_production_app/aircraft/',
+                 '/admin/aircraft_production_app/team/', '/admin/aircraft_production_app/workorder/']
+        self.assemble()
+        baseline = {path: self.count_queries(path) for path in paths}
+        for _ in range(3):
+            self.assemble()
+        self.assertEqual({path: self.count_queries(path) for path in paths}, baseline)
+
+    def test_input_filters_replace_large_choice_lists(self):
+        aircraft = self.assemble()
+        self.assemble()
+        response = self.client.get('/admin/aircraft_production_app/aircraft/', {'work_order_id': aircraft.work_order_id})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        self.assertContains(response, 'name="work_order_id"')
+        wing_user = self.production_personnel[PartCategory.WING].user.username
+        response = self.client.get('/admin/aircraft_production_app/part/', {'created_by': wing_user, 'status__exact': 'USED'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertContains(response, 'name="status__exact" value="USED"')
+        response = self.client.get('/admin/aircraft_production_app/team/')
+        self.assertContains(response, 'montaj_user')
+
+
+class TeamStatsTests(ProductionFixturesMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('yonetici', password='x', is_staff=True))
+
+    def team_stats(self, **params):
+        response = self.client.get('/api/teams/stats/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return {team['name']: team for team in response.data['teams']}
+
+    def test_stats_match_per_team_methods_and_are_cached(self):
+        parts = self.create_part_set()
+        Aircraft.objects.create(
+            aircraft_model=self.tb2, assembled_by_team=self.assembly_team, assembled_by_personnel=self.assembly_personnel,
+            **{category.lower(): part for category, part in parts.items()}
+        )
+        self.create_part(PartCategory.WING)
+        stats = self.team_stats()
+        for team in Team.objects.all():
+            self.assertEqual(
+                (stats[team.name]['produced_total'], stats[team.name]['member_count']),
+                (team.get_produced_item_count(), team.personnel_count()),
+            )
+        wing_stats = stats[self.production_teams[PartCategory.WING].name]
+        self.assertEqual(wing_stats['parts'], {'AVAILABLE': 1, 'USED': 1, 'RECYCLED': 0, 'total': 2})
+        self.assertEqual(wing_stats['throughput_per_day'], round(2 / 7, 2))
+        self.assertEqual(stats['Montaj']['aircraft_assembled'], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.team_stats()
+        self.assertEqual(len(queries), 0)
+
+        # Parça yazması önbelleği geçersiz kılar.
+        self.create_part(PartCategory.WING)
+        self.assertEqual(self.team_stats()[self.production_teams[PartCategory.WING].name]['parts']['total'], 3)
+
+    def test_team_list_query_count_does_not_grow(self):
+        self.client.get('/api/teams/')
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/api/teams/')
+        self.create_team_with_member('Yedek', DefinedTeamTypes.WING_TEAM)
+        self.create_team_with_member('Yedek2', DefinedTeamTypes.TAIL_TEAM)
+        self.client.get('/api/teams/')  # sayım önbelleği yeniden ısınır
+        with CaptureQueriesContext(connection) as more:
+            response = self.client.get('/api/teams/')
+        self.assertEqual(len(more), len(few))
+        self.assertEqual({row['name']: row['personnel_count'] for row in response.data['data']}['Yedek'], 1)
+
+    def test_invalid_window_is_rejected(self):
+        self.assertEqual(self.client.get('/api/teams/stats/', {'window_days': 'x'}).status_code, 400)
+
+
+class ProductionDatasetTests(TestCase):
+    """generate_production_dataset: ölçek, tutarlılık ve seri numarası sayaçları."""
+
+    def generate(self, **options):
+        options = {'parts': 60, 'aircraft': 10, 'work_orders': 4, 'teams': 6, 'members_per_team': 2, 'chunk_size': 7, **options}
+        call_command('generate_production_dataset', stdout=StringIO(), **options)
+
+    def test_generated_dataset_is_consistent(self):
+        self.generate(seed=7)
+
+        self.assertEqual(Part.objects.count(), 60)
+        self.assertEqual(Aircraft.objects.count(), 10)
+        self.assertEqual(WorkOrder.objects.count(), 4)
+        self.assertEqual(Personnel.objects.filter(team__name__startswith='GEN7-').count(), 12)
+        self.assertEqual(
+            Part.objects.filter(status=PartStatusChoices.USED).count(),
+            4 * Aircraft.objects.exclude(status=AircraftStatusChoices.RECYCLED).count(),
+        )
+        # Özet tablolar, installed_in kopyası ve iş emri sayaçları kaynak satırlarla uyumlu.
+        self.assertEqual(sync_stock_levels(repair=False), {'parts': [], 'aircraft': []})
+        self.assertEqual(sync_part_installations(repair=False), {'status': [], 'installed_in': [], 'duplicates': []})
+        call_command('reconcile_work_order_progress', '--check', stdout=StringIO())
+        for aircraft in Aircraft.objects.exclude(status=AircraftStatusChoices.RECYCLED).select_related('wing'):
+            self.assertLessEqual(aircraft.wing.production_date, aircraft.assembly_date)
+
+        # Sayaçlar üretilen seri numaralarının devamından verir.
+        serials = set(Part.objects.values_list('serial_number', flat=True))
+        self.assertEqual(len(serials), 60)
+        prefix = 'TB2-KNT-'
+        next_value = SerialSequence.objects.reserve(prefix)
+        self.assertNotIn(f'{prefix}{next_value:05d}', serials)
+        self.assertIn(f'{prefix}{next_value - 1:05d}', serials)
+
+    def test_rejects_reused_seed_and_too_few_parts(self):
+        self.generate(seed=3)
+        with self.assertRaises(CommandError):
+            self.generate(seed=3)
+        with self.assertRaises(CommandError):
+            self.generate(seed=4, parts=10)
+        self.assertFalse(Team.objects.filter(name__startswith='GEN4-').exists())
+
+
+class ApiBenchmarkTests(TestCase):
+    """bench_api: tüm endpoint/rol çiftleri ölçülür, sorgu bütçeleri aşılmaz ve veri kümesi değişmez."""
+
+    def test_endpoints_stay_within_query_budgets(self):
+        call_command('generate_production_dataset', parts=80, aircraft=8, work_orders=4, teams=6, members_per_team=2, stdout=StringIO())
+        User.objects.create_superuser('bench_admin', 'bench@example.com', 'x')
+        aircraft_count = Aircraft.objects.count()
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench_api', iterations=2, warmup=2, output=output.name, stdout=StringIO())
+            report = json.load(output)
+
+        self.assertEqual(len(report['results']), 18)
+        self.assertEqual(report['budget_violations'], [])
+        statuses = {(row['endpoint'], row['role']): row['status'] for row in report['results']}
+        self.assertEqual(statuses[('assemble-aircraft', 'assembly')], 201)
+        self.assertEqual(statuses[('assemble-aircraft', 'wing')], 403)
+        self.assertEqual(statuses[('parts', 'admin')], 200)
+        self.assertEqual(Aircraft.objects.count(), aircraft_count)
+
+
+class RequestMetricsTests(ProductionFixturesMixin, TestCase):
+    """QueryMetricsMiddleware ve /metrics: view/metod bazında ölçüm, N+1 sayımı ve sorgu bütçesi uyarısı."""
+
+    def setUp(self):
+        metrics_registry.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('yonetici', password='x', is_staff=True))
+
+    def test_fingerprint_ignores_literals_and_parameters(self):
+        self.assertEqual(
+            fingerprint_sql('SELECT * FROM "part" WHERE "id" IN (%s, %s,  %s) AND "status" = \'USED\' LIMIT 21'),
+            fingerprint_sql('SELECT * FROM "part" WHERE "id" IN (%s) AND "status" = \'AVAILABLE\' LIMIT 1'),
+        )
+
+    def test_requests_are_exported_per_view_and_method(self):
+        self.create_part(PartCategory.WING)
+        self.client.get('/api/parts/')
+        self.client.get('/api/teams/')
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('http_requests_total{view="api:part-list",method="GET",status="200"} 1', body)
+        self.assertIn('db_queries_per_request_count{view="api:team-list",method="GET"} 1', body)
+        self.assertIn('http_response_size_bytes_bucket{view="api:part-list",method="GET",le="+Inf"} 1', body)
+        serializer_seconds = metrics_registry.histograms[('serializer_duration_seconds', 'api:team-list', 'GET')].sum
+        self.assertGreater(serializer_seconds, 0)
+
+        member = APIClient()
+        member.force_authenticate(self.production_personnel[PartCategory.WING].user)
+        self.assertEqual(member.get('/metrics').status_code, 403)
+
+    def test_repeated_queries_are_counted_and_budget_is_logged(self):
+        request_metrics = RequestMetrics()
+        for part_id in (1, 2, 3):
+            request_metrics(lambda *args: None, 'SELECT * FROM "part" WHERE "id" = %s', (part_id,), False, {})
+        request_metrics(lambda *args: None, 'SELECT 1', (), False, {})
+        self.assertEqual(request_metrics.duplicate_queries, 2)
+        self.assertEqual(request_metrics.most_repeated(), ('SELECT * FROM "part" WHERE "id" = ?', 3))
+
+        with self.settings(METRICS_QUERY_BUDGET=1), self.assertLogs('aircraft_production_app.metrics', 'WARNING') as logs:
+            self.client.get('/api/teams/')
+        self.assertIn('/api/teams/', logs.output[0])
+        self.assertEqual(metrics_registry.budget_exceeded[('api:team-list', 'GET')], 1)
+
+
+class LiveEventsTests(ProductionFixturesMixin, TestCase):
+    """Canlı olaylar: commit sonrası yayın, takım kapsamı ve SSE akışı."""
+
+    def published_since(self, event_id):
+        return [message for _, message in live_broker.entries_after(event_id)]
+
+    def role(self, category=None):
+        personnel = self.production_personnel[category] if category else self.assembly_personnel
+        return build_role_context(personnel.user)
+
+    def test_committed_changes_are_published_and_scoped_by_team(self):
+        start = live_broker.last_id
+        with self.captureOnCommitCallbacks(execute=True):
+            part = self.create_part(PartCategory.WING)
+        messages = {message['type']: message for message in self.published_since(start)}
+        produced = messages[ProductionEventTypeChoices.PART_PRODUCED]
+        self.assertEqual((produced['ids'], produced['count'], produced['team_id']), ([part.pk], 1, part.produced_by_team_id))
+        stock = messages[STOCK_CHANGED]
+        self.assertEqual(stock['rows'], [{
+            'aircraft_model_id': self.tb2.pk, 'part_type_id': part.part_type_id, 'category': PartCategory.WING,
+            'status': PartStatusChoices.AVAILABLE, 'delta': 1,
+        }])
+
+        self.assertIsNotNone(scope_message(self.role(PartCategory.WING), produced))
+        self.assertIsNotNone(scope_message(self.role(), produced))
+        self.assertIsNone(scope_message(self.role(PartCategory.TAIL), produced))
+        self.assertIsNone(scope_message(self.role(PartCategory.TAIL), stock))
+        self.assertEqual(scope_message(self.role(), stock), stock)
+
+    def test_reconnect_replays_missed_messages_or_requests_resync(self):
+        history = LiveEventBroker(history_size=2)
+        first_id = history.publish({'type': RESYNC})
+        for _ in range(3):
+            history.publish({'type': STOCK_CHANGED, 'stock': 'parts', 'rows': []})
+        loop = asyncio.new_event_loop()
+        try:
+            replayed = history.subscribe(loop, last_event_id=history.last_id - 1)
+            self.assertEqual(replayed.queue.get_nowait()[0], history.last_id)
+            stale = history.subscribe(loop, last_event_id=first_id)
+            self.assertEqual(stale.queue.get_nowait()[1], {'type': RESYNC})
+        finally:
+            loop.close()
+
+    def test_notify_payloads_stay_under_the_postgres_limit(self):
+        rows = [{'aircraft_model_id': i, 'part_type_id': i, 'category': PartCategory.WING, 'status': 'AVAILABLE', 'delta': 1} for i in range(400)]
+        payloads = notify_payloads({'type': STOCK_CHANGED, 'stock': 'parts', 'rows': rows})
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload.encode()) < 8000 for payload in payloads))
+        self.assertEqual([row for payload in payloads for row in json.loads(payload)['rows']], rows)
+        with self.assertLogs('aircraft_production_app.live', 'WARNING'):
+            self.assertEqual(notify_payloads({'type': 'PART_PRODUCED', 'note': 'x' * 8000}), ['{"type": "RESYNC"}'])
+
+    @override_settings(LIVE_EVENTS_BACKEND='postgres')
+    def test_failed_notify_publishes_resync_locally(self):
+        start = live_broker.last_id
+        with mock.patch.object(connection, 'cursor', side_effect=RuntimeError('notify')), self.assertLogs('aircraft_production_app.live', 'ERROR'):
+            publish({'type': STOCK_CHANGED, 'stock': 'parts', 'rows': []})
+        self.assertEqual(self.published_since(start), [{'type': RESYNC}])
+
+    async def test_stream_sends_only_events_visible_to_the_user(self):
+        ticket = issue_stream_ticket(self.production_personnel[PartCategory.WING].user)
+        response = await self.async_client.get('/api/live/events/', {'ticket': ticket})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+
+        wing_team_id = self.production_teams[PartCategory.WING].pk
+        tail_team_id = self.production_teams[PartCategory.TAIL].pk
+        for team_id in (tail_team_id, wing_team_id):
+            live_broker.publish({'type': 'PART_PRODUCED', 'entity': 'PART', 'team_id': team_id, 'count': 1, 'ids': [1]})
+        chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+        await stream.aclose()
+        self.assertIn(f'"team_id":{wing_team_id}', chunk)
+        self.assertTrue(chunk.startswith(f'id: {live_broker.last_id}\n'))
+
+    @override_settings(LIVE_EVENTS_KEEPALIVE=0.05)
+    async def test_stream_closes_when_token_is_revoked_or_team_changes(self):
+        user = self.production_personnel[PartCategory.WING].user
+        token = await Token.objects.acreate(user=user)
+
+        async def open_stream():
+            response = await self.async_client.get('/api/live/events/', {'ticket': issue_stream_ticket(user, token)})
+            stream = aiter(response.streaming_content)
+            self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+            self.assertEqual(await asyncio.wait_for(anext(stream), 5), b': keepalive\n\n')
+            return stream
+
+        async def assertClosed(stream):
+            with self.assertRaises(StopAsyncIteration):
+                while True:
+                    await asyncio.wait_for(anext(stream), 5)
+
+        stream = await open_stream()
+        await Personnel.objects.filter(user=user).aupdate(team=self.production_teams[PartCategory.TAIL])
+        await assertClosed(stream)
+
+        stream = await open_stream()
+        await token.adelete()
+        await assertClosed(stream)
+
+    def test_stream_requires_valid_ticket_and_asgi(self):
+        self.assertEqual(self.client.get('/api/live/events/', {'ticket': 'x'}).status_code, 503)
+        client = APIClient()
+        client.force_authenticate(self.assembly_personnel.user)
+        # WSGI altında akış çalışmaz; istemci bilet almaya çalışmayı bırakır.
+        self.assertEqual(client.post('/api/live/ticket/').data, {'enabled': False})
+
+        key = Token.objects.create(user=self.assembly_personnel.user).key
+        response = async_to_sync(self.async_client.post)('/api/live/ticket/', headers={'Authorization': f'Token {key}'})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertTrue(data['enabled'])
+        self.assertEqual(read_stream_ticket(data['ticket']), (self.assembly_personnel.user.pk, token_fingerprint(key)))
+        with self.assertRaises(signing.BadSignature):
+            read_stream_ticket(data['ticket'] + 'x')
+
+
+class AsyncReadViewsTests(ProductionFixturesMixin, TestCase):
+    """ASGI modu: async salt okunur view'lar senkron view'larla aynı yanıtı üretir; middleware async yolda çalışır."""
+
+    PATHS = (
+        '/api/user/me/',
+        '/api/aircraft-models/?limit=1&offset=1',
+        '/api/part-types/',
+        '/api/inventory/stock-levels/?stock_type=parts&draw=2&start=0&length=-1',
+        '/api/inventory/stock-levels/?stock_type=aircrafts&draw=1',
+        '/api/inventory/stock-levels/?stock_type=x',
+    )
+
+    def setUp(self):
+        token_cache.clear()
+        metrics_registry.reset()
+        self.create_part(PartCategory.WING)
+        self.create_part(PartCategory.TAIL, aircraft_model=self.akinci)
+
+    def async_get(self, path, **headers):
+        with override_settings(ROOT_URLCONF='aircraft_production_project.asgi_urls'):
+            return async_to_sync(self.async_client.get)(path, headers=headers)
+
+    def test_async_views_match_sync_views(self):
+        for personnel in (self.production_personnel[PartCategory.WING], self.assembly_personnel):
+            key = Token.objects.create(user=personnel.user).key
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+            for path in self.PATHS:
+                with self.subTest(user=personnel.user.username, path=path):
+                    expected = client.get(path)
+                    response = self.async_get(path, Authorization=f'Token {key}')
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(json.loads(response.content), json.loads(expected.content))
+
+        view = 'aircraft_production_app.async_views.stock_levels'
+        self.assertEqual(metrics_registry.requests[(view, 'GET', 200)], 4)
+        self.assertGreater(metrics_registry.histograms[('db_queries_per_request', view, 'GET')].sum, 0)
+
+    def test_async_views_require_token_and_read_methods(self):
+        response = self.async_get('/api/user/me/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+        self.assertEqual(self.async_get('/api/part-types/', Authorization='Token yanlis').status_code, 401)
+
+        key = Token.objects.create(user=self.assembly_personnel.user).key
+        with override_settings(ROOT_URLCONF='aircraft_production_project.asgi_urls'):
+            response = async_to_sync(self.async_client.post)('/api/part-types/', headers={'Authorization': f'Token {key}'})
+        self.assertEqual(response.status_code, 405)
+
+    def test_session_login_works_on_async_middleware_path(self):
+        User.objects.create_user('yonetici', password='test-pass-123', is_staff=True, is_superuser=True)
+        response = async_to_sync(self.async_client.post)(
+            '/admin/login/?next=/admin/', {'username': 'yonetici', 'password': 'test-pass-123'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(async_to_sync(self.async_client.get)('/admin/').status_code, 200)
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_session_saved_on_every_request_runs_in_thread(self):
+        user = self.assembly_personnel.user
+        self.async_client.force_login(user)  # Boş olmayan oturum; yanıtta kaydedilir.
+        response = self.async_get('/api/part-types/', Authorization=f'Token {Token.objects.create(user=user).key}')
+        self.assertEqual(response.status_code, 200)
+
+
+def asgi_get(app, path, query_string='', headers=()):
+    """`app`e ASGI GET isteği başlatır; (görev, yanıt mesajları kuyruğu, istemci mesajları kuyruğu) döndürür."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query_string.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers], 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    inbound, outbound = asyncio.Queue(), asyncio.Queue()
+    inbound.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+    return asyncio.ensure_future(app(scope, inbound.get, outbound.put)), outbound, inbound
+
+
+class ConcurrencyLimiterTests(TransactionTestCase):
+    """asgi.ConcurrencyLimiter: açık SSE akışları sınırdaki yerleri tutmaz. Django istekleri ayrı thread'lerde
+    çalıştırdığından veriler commit edilmiş olmalıdır."""
+    serialized_rollback = True
+
+    def setUp(self):
+        token_cache.clear()
+        user = User.objects.create_user('izleyici', password='x', is_staff=True)
+        self.token = Token.objects.create(user=user).key
+        self.ticket = issue_stream_ticket(user)
+
+    async def test_open_stream_does_not_block_other_requests(self):
+        app = ConcurrencyLimiter(ASGIHandler(), 1)  # ASGI_THREADS=1
+        stream, stream_messages, stream_inbound = asgi_get(app, '/api/live/events/', f'ticket={self.ticket}')
+        try:
+            start = await asyncio.wait_for(stream_messages.get(), 5)
+            self.assertEqual((start['type'], start['status']), ('http.response.start', 200))
+
+            request, messages, _ = asgi_get(app, '/api/user/me/', headers=[(b'authorization', f'Token {self.token}'.encode())])
+            start = await asyncio.wait_for(messages.get(), 5)
+            self.assertEqual(start['status'], 200)
+            body = await asyncio.wait_for(messages.get(), 5)
+            self.assertEqual(json.loads(body['body'])['username'], 'izleyici')
+            await asyncio.wait_for(request, 5)
+        finally:
+            stream_inbound.put_nowait({'type': 'http.disconnect'})
+            await asyncio.wait_for(stream, 5)
+
+
+class MultiWorkerCheckTests(TestCase):
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    SHARED = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+
+    def check_ids(self):
+        return [error.id for error in check_multi_worker_settings(None)]
+
+    def test_single_worker_allows_process_local_backends(self):
+        with override_settings(WEB_WORKERS=1, CACHES=self.LOCMEM, LIVE_EVENTS_BACKEND='local'):
+            self.assertEqual(self.check_ids(), [])
+
+    def test_multiple_workers_require_shared_backends(self):
+        with override_settings(WEB_WORKERS=4, CACHES=self.LOCMEM, LIVE_EVENTS_BACKEND='local'):
+            self.assertEqual(self.check_ids(), ['aircraft_production_app.E001', 'aircraft_production_app.E002'])
+        with override_settings(WEB_WORKERS=4, CACHES=self.SHARED, LIVE_EVENTS_BACKEND='postgres'):
+            self.assertEqual(self.check_ids(), [])
@@ -4,10 +4,10 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     # ViewSet'ler
     AircraftModelViewSet, PartTypeViewSet, TeamViewSet, PersonnelViewSet, 
-    PartViewSet, WorkOrderViewSet, AircraftViewSet,
+    PartViewSet, WorkOrderViewSet, AircraftViewSet, ProductionEventViewSet,
     # APIView'lar ve Fonksiyon Bazlı View'lar
-    AssembleAircraftAPIView, UserRegisterAPIView, StockLevelsAPIView, 
-    current_user_info, 
+    AssembleAircraftAPIView, AssembleAircraftBatchAPIView, UserRegisterAPIView, StockLevelsAPIView, 
+    current_user_info, auth_cache_stats, live_events_ticket, live_events_stream,
     # Frontend View'ları
     frontend_login_view, frontend_dashboard_view, frontend_register_view 
 )
@@ -22,14 +22,19 @@ api_router.register(r'personnel', PersonnelViewSet, basename='personnel') # Pers
 api_router.register(r'work-orders', WorkOrderViewSet, basename='workorder') # İş emri yönetimi (CRUD)
 api_router.register(r'parts', PartViewSet, basename='part') # Parça yönetimi (üretim, listeleme, geri dönüşüm)
 api_router.register(r'aircraft', AircraftViewSet, basename='aircraft') # Uçak yönetimi (listeleme, geri dönüşüm)
+api_router.register(r'events', ProductionEventViewSet, basename='productionevent') # Üretim olay günlüğü (salt okunur)
 
 # === API URL Pattern'leri ===
 api_urlpatterns = [
     path('', include(api_router.urls)), # Router URL'leri buraya dahil ediliyor
     path('user/me/', current_user_info, name='current-user-api'),
     path('assembly/assemble-aircraft/', AssembleAircraftAPIView.as_view(), name='assemble-aircraft-api'),
+    path('assembly/assemble-batch/', AssembleAircraftBatchAPIView.as_view(), name='assemble-aircraft-batch-api'),
     path('inventory/stock-levels/', StockLevelsAPIView, name='stock-levels-api'),
     path('auth/register/', UserRegisterAPIView.as_view(), name='api_user_register'),
+    path('auth/cache-stats/', auth_cache_stats, name='auth-cache-stats-api'),
+    path('live/ticket/', live_events_ticket, name='live-events-ticket'), # SSE bağlantı bileti
+    path('live/events/', live_events_stream, name='live-events-stream'), # Canlı değişiklik olayları (SSE, ASGI)
 ]
 
 # === Frontend URL Pattern'leri ===
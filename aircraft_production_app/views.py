@@ -1,18 +1,39 @@
+from functools import partial
+
 from rest_framework.decorators import api_view, permission_classes, authentication_classes, action
+from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import viewsets, filters, permissions, status as drf_status, serializers
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.models import User
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction, models
 
-from .models import Part, PartType, AircraftModel, Aircraft, Team, Personnel, PartCategory, DefinedTeamTypes, PartStatusChoices, AircraftStatusChoices, WorkOrder, WorkOrderStatusChoices
-from .serializers import AircraftModelSerializer, AircraftSerializer, AircraftAssemblySerializer, PartTypeSerializer, TeamSerializer, PersonnelSerializer, PartSerializer, WorkOrderSerializer
+from .models import count_subquery, Part, PartType, AircraftModel, Aircraft, Team, Personnel, PartCategory, DefinedTeamTypes, PartStatusChoices, WorkOrder, WorkOrderStatusChoices, ProductionEvent
+from .serializers import AircraftModelSerializer, AircraftSerializer, AircraftAssemblySerializer, AircraftBatchAssemblySerializer, PartTypeSerializer, TeamSerializer, PersonnelSerializer, PartSerializer, PartBulkCreateSerializer, BulkRecycleSerializer, WorkOrderSerializer, ProductionEventSerializer
 from .permissions import IsAdminOrReadOnly, IsOwnerTeamOrAdminForPart, IsAssemblyTeamMemberOrAdminForAircraft, CanAssembleAircraft, IsNotAssemblyTeamForCreate
-from .filters import WorkOrderFilter, PartFilter, AircraftFilter
+from .filters import WorkOrderFilter, PartFilter, AircraftFilter, ProductionEventFilter
+from .pagination import KeysetDataTablePagination, SelectablePaginationMixin
+from .roles import STALE_ROLE_MESSAGE, RoleContext, get_role_context, load_role_personnel, role_context_cache
+from .authentication import get_token_cache_stats
+from .search import IndexedSearchFilter
+from .inventory import pick_available_parts, produce_parts
+from .assembly import assemble_work_order_batch
+from .recycling import cancel_work_orders, recycle_aircraft, recycle_parts
+from .exports import StreamingExportMixin
+from .team_stats import DEFAULT_WINDOW_DAYS, MAX_WINDOW_DAYS, get_team_stats
+from .listing import AircraftListProjection, PartListProjection, ProjectedListMixin, WorkOrderListProjection
+from .metrics import registry as metrics_registry
+from .live import issue_stream_ticket, read_stream_ticket, stream_events, token_fingerprint
+from .stock_levels import INVALID_STOCK_TYPE_MESSAGE, STOCK_TYPES, build_stock_levels_response, stock_level_querysets
 
 
 def frontend_login_view(request):
@@ -89,11 +110,14 @@ def current_user_info(request):
     user = request.user
     try:
         personnel = user.personnel
-        personnel_data = PersonnelSerializer(personnel).data
     except Personnel.DoesNotExist:
-        personnel_data = None
+        personnel = None
+    return Response(current_user_payload(user, personnel))
 
-    return Response({
+
+def current_user_payload(user, personnel):
+    """current_user_info yanıtı; async karşılığı da bunu kullanır (bkz. async_views.current_user_info)."""
+    return {
         'id': user.id,
         'username': user.username,
         'email': user.email,
@@ -101,8 +125,8 @@ def current_user_info(request):
         'last_name': user.last_name,
         'is_staff': user.is_staff,
         'is_superuser': user.is_superuser,
-        'personnel_profile': personnel_data
-    })
+        'personnel_profile': PersonnelSerializer(personnel).data if personnel else None
+    }
 
 
 class AircraftModelViewSet(viewsets.ReadOnlyModelViewSet):
@@ -128,20 +152,63 @@ class TeamViewSet(viewsets.ModelViewSet):
     Takımların CRUD işlemlerini yöneten ViewSet.
     Sadece admin erişimine açıktır.
     """
-    queryset = Team.objects.all().prefetch_related('members')
+    queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAdminUser]
 
     def get_queryset(self):
         """
         query_params içinde 'team_type' varsa takımları filtreler.
+        Personel sayısı alt sorguyla aynı sorguda okunur (Team.personnel_count anotasyonu kullanır).
         """
-        queryset = Team.objects.all().prefetch_related('members')
+        queryset = Team.objects.annotate(member_total=count_subquery(Personnel, 'team'))
         team_type_filter = self.request.query_params.get('team_type')
         if team_type_filter:
             queryset = queryset.filter(team_type=team_type_filter)
         return queryset
 
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request):
+        """
+        Tüm takımların üretim istatistikleri (önbellekli, bkz. team_stats).
+        Parametreler: window_days (günlük üretim hızı penceresi, varsayılan 7), team_type.
+        """
+        try:
+            window_days = int(request.query_params.get('window_days', DEFAULT_WINDOW_DAYS))
+        except ValueError:
+            window_days = 0
+        if not 1 <= window_days <= MAX_WINDOW_DAYS:
+            raise serializers.ValidationError({'window_days': f"1 ile {MAX_WINDOW_DAYS} arasında bir gün sayısı olmalıdır."})
+
+        stats = get_team_stats(window_days)
+        team_type_filter = request.query_params.get('team_type')
+        if team_type_filter:
+            stats = {**stats, 'teams': [team for team in stats['teams'] if team['team_type'] == team_type_filter]}
+        return Response(stats)
+
+
+class BulkRecycleMixin:
+    """
+    Toplu yumuşak silme için ortak yardımcılar. `recycle_function` queryset alıp RecycleReport döndürür.
+    Kayıtlar get_queryset() ile süzülür; kullanıcının göremediği ID'ler 'not_found' olarak raporlanır.
+    """
+    recycle_function = None
+
+    def bulk_recycle_response(self, request):
+        serializer = BulkRecycleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        requested_ids = set(serializer.validated_data['ids'])
+        queryset = self.get_queryset().filter(pk__in=requested_ids)
+        visible_ids = set(queryset.values_list('pk', flat=True))
+        report = self.recycle_function(queryset)
+        return Response({**report.as_dict(), 'not_found': sorted(requested_ids - visible_ids)})
+
+    def perform_destroy(self, instance):
+        """Tek kaydı toplu işlemle aynı yoldan işler; reddedilen kayıt 400 döner."""
+        report = self.recycle_function(type(instance).objects.filter(pk=instance.pk))
+        if report.refused:
+            raise serializers.ValidationError([refused['reason'] for refused in report.refused])
+
 
 class PersonnelViewSet(viewsets.ModelViewSet):
     """
@@ -158,13 +225,31 @@ class PersonnelViewSet(viewsets.ModelViewSet):
         raise serializers.ValidationError({"detail": "Yeni personel oluşturma bu endpoint üzerinden desteklenmiyor. Lütfen kayıt sayfasını kullanın ve ardından buradan takım atayın."})
 
 
-class PartViewSet(viewsets.ModelViewSet):
+class PartViewSet(StreamingExportMixin, ProjectedListMixin, BulkRecycleMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
     """
     Parça üretim ve yönetim işlemlerini yöneten ViewSet.
     Üretim takımları, kendi ürettiği parçalar üzerinde değişiklik yapabilir.
+    ?paging=keyset ile (production_date, id) üzerinde imleç tabanlı sayfalama kullanılabilir.
+    /api/parts/export/?export_format=csv|ndjson liste filtreleriyle tüm kayıtları akış halinde dışa aktarır.
+    Liste yanıtı serializer yerine PartListProjection ile (.values() satırlarından) üretilir.
     """
     serializer_class = PartSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    list_projection = PartListProjection()
+    recycle_function = staticmethod(recycle_parts)
+    export_filename = 'parts'
+    export_columns = [
+        ('id', 'id'),
+        ('serial_number', 'serial_number'),
+        ('part_type', 'part_type__category'),
+        ('aircraft_model', 'aircraft_model_compatibility__name'),
+        ('status', 'status'),
+        ('produced_by_team', 'produced_by_team__name'),
+        ('created_by', 'created_by_personnel__user__username'),
+        ('production_date', 'production_date'),
+        ('updated_at', 'updated_at'),
+    ]
+    keyset_ordering_field = 'production_date'
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_class = PartFilter
 
     ordering_fields = [
@@ -188,17 +273,18 @@ class PartViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """İşleme göre izin kontrolü uygular."""
-        if self.action in ['update', 'partial_update', 'destroy']:
+        if self.action in ['update', 'partial_update', 'destroy', 'recycle']:
             if self.request.user.is_authenticated:
-                if self.request.user.is_staff or self.request.user.is_superuser:
+                role = get_role_context(self.request)
+                if role.is_admin:
                     self.permission_classes = [permissions.IsAdminUser]
-                elif hasattr(self.request.user, 'personnel') and self.request.user.personnel.team and self.request.user.personnel.team.can_perform_assembly():
+                elif role.can_assemble:
                     self.permission_classes = [permissions.IsAuthenticated]
                 else:
                     self.permission_classes = [permissions.IsAuthenticated, IsOwnerTeamOrAdminForPart]
             else:
                 self.permission_classes = [permissions.IsAuthenticated]
-        elif self.action == 'create':
+        elif self.action in ['create', 'bulk_create']:
             self.permission_classes = [permissions.IsAuthenticated, IsNotAssemblyTeamForCreate]
         else:
             self.permission_classes = [permissions.IsAuthenticated]
@@ -206,7 +292,6 @@ class PartViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """İlgili kullanıcının rolüne göre parça listesini döndürür."""
-        user = self.request.user
         queryset = Part.objects.all().select_related(
             'part_type',
             'aircraft_model_compatibility',
@@ -214,57 +299,79 @@ class PartViewSet(viewsets.ModelViewSet):
             'created_by_personnel__user'
         )
 
-        if user.is_superuser or user.is_staff:
+        role = get_role_context(self.request)
+        if role.is_admin:
             return queryset.order_by('-production_date')
 
-        try:
-            personnel = user.personnel
-            if personnel.team:
-                if personnel.team.can_perform_assembly():
-                    if not self.request.query_params.get('status'):
-                        return queryset.filter(status=PartStatusChoices.AVAILABLE).order_by('-production_date')
-                    return queryset.order_by('-production_date')
-                else:
-                    return queryset.filter(produced_by_team=personnel.team).order_by('-production_date')
-        except Personnel.DoesNotExist:
-            return queryset.none()
+        if role.team_id is not None:
+            if role.can_assemble:
+                if not self.request.query_params.get('status'):
+                    return queryset.filter(status=PartStatusChoices.AVAILABLE).order_by('-production_date')
+                return queryset.order_by('-production_date')
+            return queryset.filter(produced_by_team_id=role.team_id).order_by('-production_date')
 
         return queryset.none()
 
-    def perform_create(self, serializer):
-        """Parça oluşturma sırasında takım ve personel ataması yapar."""
-        user = self.request.user
-        try:
-            personnel = user.personnel
-            if not personnel or not personnel.team:
-                raise serializers.ValidationError("Parça üretebilmek için bir takıma atanmış olmalısınız.")
+    def get_production_context(self):
+        """
+        İstek sahibinin parça üretim yetkisini bir kez doğrular.
+        Dönüş değeri: (personel, takım, üretilecek parça tipi)
+        """
+        role = get_role_context(self.request)
+        if not role.has_personnel:
+            raise serializers.ValidationError("Bu işlemi yapmak için geçerli bir personel kaydınız bulunmuyor.")
+        if role.team_id is None:
+            raise serializers.ValidationError("Parça üretebilmek için bir takıma atanmış olmalısınız.")
 
-            team = personnel.team
-            producible_category_enum_member = team.get_producible_part_category()
-            if not producible_category_enum_member and not (user.is_staff or user.is_superuser):
-                raise serializers.ValidationError(f"Takımınızın ({team.name}) üretebileceği bir parça kategorisi tanımlanmamış.")
+        # İstek sahibi takımın üyesi olduğundan takımda en az bir personel vardır; ayrıca kontrol edilmez.
+        personnel = load_role_personnel(role)
+        if personnel is None:
+            raise serializers.ValidationError(STALE_ROLE_MESSAGE)
+        team = personnel.team
+        if not role.producible_category:
+            raise serializers.ValidationError(f"Takımınızın ({team.name}) üretebileceği bir parça kategorisi tanımlanmamış.")
 
-            part_type_instance = get_object_or_404(PartType, category=producible_category_enum_member.value)
+        part_type_instance = get_object_or_404(PartType, category=role.producible_category.value)
+        return personnel, team, part_type_instance
 
-            if not team.members.exists():
-                raise serializers.ValidationError(f"Takımınızda ({team.name}) kayıtlı personel bulunmamaktadır. Üretim yapabilmek için önce personel ekleyiniz.")
+    def perform_create(self, serializer):
+        """Parça oluşturma sırasında takım ve personel ataması yapar."""
+        personnel, team, part_type_instance = self.get_production_context()
+        serializer.save(
+            part_type=part_type_instance,
+            produced_by_team=team,
+            created_by_personnel=personnel,
+            status=PartStatusChoices.AVAILABLE
+        )
 
-            serializer.save(
-                part_type=part_type_instance,
-                produced_by_team=team,
-                created_by_personnel=personnel,
-                status=PartStatusChoices.AVAILABLE
-            )
-        except Personnel.DoesNotExist:
-            raise serializers.ValidationError("Bu işlemi yapmak için geçerli bir personel kaydınız bulunmuyor.")
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Takımın parça tipinden toplu üretim yapar.
+        Gövde: {"aircraft_model_compatibility": <id>, "quantity": <n>} veya
+               {"items": [{"aircraft_model_compatibility": <id>, "quantity": <n>}, ...]}
+        Takım doğrulaması bir kez yapılır, seri numaraları blok halinde ayrılır ve kayıtlar tek seferde yazılır.
+        """
+        serializer = PartBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        personnel, team, part_type_instance = self.get_production_context()
 
-    def perform_destroy(self, instance):
-        """Gerçek silme yerine parçayı geri dönüştürür."""
-        try:
-            instance.delete()
-        except DjangoValidationError as e:
-            error_messages = e.messages if hasattr(e, 'messages') else str(e)
-            raise serializers.ValidationError(error_messages)
+        parts = produce_parts(
+            part_type_instance, team, serializer.validated_data['quantities_by_model'], personnel=personnel
+        )
+        return Response({
+            "created": len(parts),
+            "part_type": part_type_instance.category,
+            "serial_numbers": [part.serial_number for part in parts],
+        }, status=drf_status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='recycle')
+    def recycle(self, request):
+        """
+        Parçaları toplu geri dönüştürür. Gövde: {"ids": [<id>, ...]}
+        Uçağa takılı parçalar 'refused' listesinde gerekçesiyle döner.
+        """
+        return self.bulk_recycle_response(request)
 
 
 class AssembleAircraftAPIView(APIView):
@@ -285,13 +392,15 @@ class AssembleAircraftAPIView(APIView):
         aircraft_model_id = validated_data.get('aircraft_model_id')
         work_order_id = validated_data.get('work_order_id')
 
-        try:
-            personnel = request.user.personnel
-            if not personnel.team or not personnel.team.can_perform_assembly():
-                return Response({"error": "Bu işlemi yapmak için yetkili bir montaj takımına üye olmalısınız."}, status=drf_status.HTTP_403_FORBIDDEN)
-            assembling_team = personnel.team
-        except Personnel.DoesNotExist:
+        role = get_role_context(request)
+        if not role.has_personnel:
             return Response({"error": "Geçerli bir personel kaydınız bulunmuyor."}, status=drf_status.HTTP_403_FORBIDDEN)
+        if not role.can_assemble:
+            return Response({"error": "Bu işlemi yapmak için yetkili bir montaj takımına üye olmalısınız."}, status=drf_status.HTTP_403_FORBIDDEN)
+        personnel = load_role_personnel(role)
+        if personnel is None:
+            return Response({"error": STALE_ROLE_MESSAGE}, status=drf_status.HTTP_403_FORBIDDEN)
+        assembling_team = personnel.team
 
         target_aircraft_model = get_object_or_404(AircraftModel, id=aircraft_model_id)
         target_work_order = None
@@ -302,29 +411,12 @@ class AssembleAircraftAPIView(APIView):
             if target_work_order.status in [WorkOrderStatusChoices.COMPLETED, WorkOrderStatusChoices.CANCELLED]:
                 return Response({"error": "Bu iş emri tamamlanmış veya iptal edilmiş, yeni uçak monte edilemez."}, status=drf_status.HTTP_400_BAD_REQUEST)
 
-        required_parts = {}
-        missing_parts_info = []
-
-        part_categories_map = {
-            'wing': PartCategory.WING,
-            'fuselage': PartCategory.FUSELAGE,
-            'tail': PartCategory.TAIL,
-            'avionics': PartCategory.AVIONICS,
-        }
-
-        for slot_name, category_value in part_categories_map.items():
-            part_type_for_slot = get_object_or_404(PartType, category=category_value)
-
-            available_part = Part.objects.filter(
-                part_type=part_type_for_slot,
-                aircraft_model_compatibility=target_aircraft_model,
-                status=PartStatusChoices.AVAILABLE
-            ).order_by('production_date').first()
-
-            if not available_part:
-                missing_parts_info.append(f"{target_aircraft_model.get_name_display()} için {part_type_for_slot.get_category_display()}")
-            else:
-                required_parts[slot_name] = available_part
+        # Her kategoriden en eski AVAILABLE parça tek sorguda (PostgreSQL'de kilitlenerek) seçilir.
+        picked_parts = pick_available_parts(target_aircraft_model)
+        missing_parts_info = [
+            f"{target_aircraft_model.get_name_display()} için {category.label}"
+            for category, parts in picked_parts.items() if not parts
+        ]
 
         if missing_parts_info:
             return Response(
@@ -338,12 +430,14 @@ class AssembleAircraftAPIView(APIView):
                 assembled_by_team=assembling_team,
                 assembled_by_personnel=personnel,
                 work_order=target_work_order,
-                wing=required_parts.get('wing'),
-                fuselage=required_parts.get('fuselage'),
-                tail=required_parts.get('tail'),
-                avionics=required_parts.get('avionics')
+                wing=picked_parts[PartCategory.WING][0],
+                fuselage=picked_parts[PartCategory.FUSELAGE][0],
+                tail=picked_parts[PartCategory.TAIL][0],
+                avionics=picked_parts[PartCategory.AVIONICS][0]
             )
-            new_aircraft.full_clean()
+            # İlişkili nesneler bu istekte okundu/kilitlendi; alan başına varlık ve tekillik sorguları atlanır.
+            # Slotların tekilliği veritabanı kısıtı ve save() içindeki durum kontrolüyle korunur.
+            new_aircraft.full_clean(exclude=Aircraft.ASSEMBLY_PRELOADED_FIELDS, validate_unique=False)
             new_aircraft.save()
 
             response_serializer = AircraftSerializer(new_aircraft)
@@ -357,12 +451,83 @@ class AssembleAircraftAPIView(APIView):
                             status=drf_status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AircraftViewSet(viewsets.ModelViewSet):
+class AssembleAircraftBatchAPIView(APIView):
+    """
+    Bir iş emri için toplu montaj endpoint'i.
+    POST: İş emri kapsamında N adet uçağı tek transaction içinde monte eder.
+    """
+    permission_classes = [permissions.IsAuthenticated, CanAssembleAircraft]
+    serializer_class = AircraftBatchAssemblySerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = AircraftBatchAssemblySerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=drf_status.HTTP_400_BAD_REQUEST)
+
+        role = get_role_context(request)
+        if not role.has_personnel:
+            return Response({"error": "Geçerli bir personel kaydınız bulunmuyor."}, status=drf_status.HTTP_403_FORBIDDEN)
+        if not role.can_assemble:
+            return Response({"error": "Bu işlemi yapmak için yetkili bir montaj takımına üye olmalısınız."}, status=drf_status.HTTP_403_FORBIDDEN)
+        personnel = load_role_personnel(role)
+        if personnel is None:
+            return Response({"error": STALE_ROLE_MESSAGE}, status=drf_status.HTTP_403_FORBIDDEN)
+
+        validated_data = serializer.validated_data
+        try:
+            work_order, aircrafts, shortfalls = assemble_work_order_batch(
+                validated_data['work_order_id'],
+                validated_data['count'],
+                assembling_team=personnel.team,
+                personnel=personnel,
+                allow_partial=validated_data['allow_partial'],
+            )
+        except DjangoValidationError as e:
+            return Response({"error": "Toplu montaj doğrulama hatası.", "details": e.message_dict if hasattr(e, 'message_dict') else e.messages},
+                            status=drf_status.HTTP_400_BAD_REQUEST)
+
+        response_data = {
+            "work_order": work_order.id,
+            "work_order_status": work_order.status,
+            "requested": validated_data['count'],
+            "assembled": len(aircrafts),
+            "aircraft": AircraftSerializer(aircrafts, many=True).data,
+            "shortfalls": shortfalls,
+        }
+        if not aircrafts:
+            response_data["error"] = "Montaj için yeterli parça bulunamadı."
+            return Response(response_data, status=drf_status.HTTP_400_BAD_REQUEST)
+        return Response(response_data, status=drf_status.HTTP_201_CREATED)
+
+
+class AircraftViewSet(StreamingExportMixin, ProjectedListMixin, BulkRecycleMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
     """
     Uçakların görüntülenmesi ve (admin) tarafından eklenmesi için ViewSet.
+    ?paging=keyset ile (assembly_date, id) üzerinde imleç tabanlı sayfalama kullanılabilir.
+    /api/aircraft/export/?export_format=csv|ndjson liste filtreleriyle tüm kayıtları akış halinde dışa aktarır.
+    Liste yanıtı serializer yerine AircraftListProjection ile (.values() satırlarından) üretilir.
     """
     serializer_class = AircraftSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    list_projection = AircraftListProjection()
+    recycle_function = staticmethod(recycle_aircraft)
+    export_filename = 'aircraft'
+    export_columns = [
+        ('id', 'id'),
+        ('serial_number', 'serial_number'),
+        ('aircraft_model', 'aircraft_model__name'),
+        ('status', 'status'),
+        ('work_order', 'work_order_id'),
+        ('assembled_by_team', 'assembled_by_team__name'),
+        ('assembled_by', 'assembled_by_personnel__user__username'),
+        ('assembly_date', 'assembly_date'),
+        ('wing_sn', 'wing__serial_number'),
+        ('fuselage_sn', 'fuselage__serial_number'),
+        ('tail_sn', 'tail__serial_number'),
+        ('avionics_sn', 'avionics__serial_number'),
+        ('updated_at', 'updated_at'),
+    ]
+    keyset_ordering_field = 'assembly_date'
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_class = AircraftFilter
     ordering_fields = [
         'id', 'serial_number', 'aircraft_model__name', 'status',
@@ -375,7 +540,7 @@ class AircraftViewSet(viewsets.ModelViewSet):
 
     def get_permissions(self):
         """İşleme göre izin kontrolü uygular."""
-        if self.action in ['update', 'partial_update', 'destroy']:
+        if self.action in ['update', 'partial_update', 'destroy', 'recycle']:
             self.permission_classes = [permissions.IsAuthenticated, IsAssemblyTeamMemberOrAdminForAircraft]
         elif self.action == 'create':
             self.permission_classes = [permissions.IsAdminUser]
@@ -387,46 +552,57 @@ class AircraftViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Mevcut kullanıcı rolüne uygun uçağı listeler."""
-        user = self.request.user
         queryset = Aircraft.objects.all().select_related(
             'aircraft_model', 'assembled_by_team',
             'assembled_by_personnel__user', 'work_order',
             'wing', 'fuselage', 'tail', 'avionics'
         )
 
-        if user.is_superuser or user.is_staff:
+        role = get_role_context(self.request)
+        if role.is_admin:
             return queryset.order_by('-assembly_date')
 
-        try:
-            personnel = user.personnel
-            if personnel and personnel.team and personnel.team.can_perform_assembly():
-                return queryset.filter(assembled_by_team=personnel.team).order_by('-assembly_date')
-        except Personnel.DoesNotExist:
-            return queryset.none()
+        if role.can_assemble:
+            return queryset.filter(assembled_by_team_id=role.team_id).order_by('-assembly_date')
 
         return queryset.none()
 
-    def perform_destroy(self, instance):
+    @action(detail=False, methods=['post'], url_path='recycle')
+    def recycle(self, request):
         """
-        Bir uçağı fiziksel olarak silmek yerine 'RECYCLED' yapar (yumuşak silme).
-        Modelin kendi delete() metodu bu işi yapıyordu.
+        Uçakları toplu geri dönüştürür (yumuşak silme); takılı parçalar kullanıma hazır hale gelir.
+        Gövde: {"ids": [<id>, ...]}
         """
-        try:
-            instance.delete()
-        except DjangoValidationError as e:
-            raise serializers.ValidationError(e.detail if hasattr(e, 'detail') else e.messages)
+        return self.bulk_recycle_response(request)
 
 
-class WorkOrderViewSet(viewsets.ModelViewSet):
+class WorkOrderViewSet(StreamingExportMixin, ProjectedListMixin, BulkRecycleMixin, viewsets.ModelViewSet):
     """
     İş emirlerini yönetmek için CRUD fonksiyonlarını barındıran ViewSet.
+    /api/work-orders/export/?export_format=csv|ndjson liste filtreleriyle tüm kayıtları akış halinde dışa aktarır.
+    Liste yanıtı serializer yerine WorkOrderListProjection ile (.values() satırlarından) üretilir.
     """
     serializer_class = WorkOrderSerializer
+    list_projection = WorkOrderListProjection()
+    recycle_function = staticmethod(cancel_work_orders)
+    export_filename = 'work-orders'
+    export_columns = [
+        ('id', 'id'),
+        ('aircraft_model', 'aircraft_model__name'),
+        ('quantity', 'quantity'),
+        ('completed_count', 'completed_count'),
+        ('status', 'status'),
+        ('assigned_to_assembly_team', 'assigned_to_assembly_team__name'),
+        ('created_by', 'created_by__username'),
+        ('created_at', 'created_at'),
+        ('target_completion_date', 'target_completion_date'),
+        ('notes', 'notes'),
+    ]
 
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter
+        IndexedSearchFilter
     ]
     filterset_class = WorkOrderFilter
 
@@ -451,7 +627,7 @@ class WorkOrderViewSet(viewsets.ModelViewSet):
         """Oluşturma, güncelleme, silme sadece admin yetkisine açıktır."""
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             self.permission_classes = [permissions.IsAdminUser]
-        elif self.action in ['list', 'retrieve']:
+        elif self.action in ['list', 'retrieve', 'export']:
             self.permission_classes = [permissions.IsAuthenticated]
         else:
             self.permission_classes = [permissions.IsAdminUser]
@@ -459,27 +635,20 @@ class WorkOrderViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Montaj takımı veya admin rolüne göre iş emirlerini döndürür."""
-        user = self.request.user
         queryset = WorkOrder.objects.all().select_related(
             'aircraft_model',
             'created_by',
             'assigned_to_assembly_team'
         )
 
-        if user.is_superuser or user.is_staff:
+        role = get_role_context(self.request)
+        if role.is_admin:
             return queryset.order_by('-created_at')
 
-        try:
-            personnel = user.personnel
-            if personnel and personnel.team and personnel.team.can_perform_assembly():
-                visibility_filter = models.Q(assigned_to_assembly_team=personnel.team) | models.Q(assigned_to_assembly_team__isnull=True, status=WorkOrderStatusChoices.PENDING) | models.Q(assigned_to_assembly_team__isnull=True, status=WorkOrderStatusChoices.IN_PROGRESS)
-
-                return queryset.filter(visibility_filter).distinct().order_by('-created_at')
-            else:
-                return queryset.none()
+        if role.can_assemble:
+            visibility_filter = models.Q(assigned_to_assembly_team_id=role.team_id) | models.Q(assigned_to_assembly_team__isnull=True, status=WorkOrderStatusChoices.PENDING) | models.Q(assigned_to_assembly_team__isnull=True, status=WorkOrderStatusChoices.IN_PROGRESS)
 
-        except Personnel.DoesNotExist:
-            return queryset.none()
+            return queryset.filter(visibility_filter).distinct().order_by('-created_at')
 
         return queryset.none()
 
@@ -487,163 +656,125 @@ class WorkOrderViewSet(viewsets.ModelViewSet):
         """İş emri oluşturulurken, oluşturan kullanıcıyı otomatik ata."""
         serializer.save(created_by=self.request.user)
 
-    def perform_destroy(self, instance):
+    @action(detail=False, methods=['post'], url_path='cancel')
+    def cancel(self, request):
         """
-        Bir iş emrini silmek yerine durumunu 'CANCELLED' yapar ve uçak bağlantılarını keser.
-        Modelin kendi delete() metodu bu işi yapıyordu.
+        İş emirlerini toplu iptal eder ve bağlı uçakları iş emrinden ayırır (sadece admin).
+        Gövde: {"ids": [<id>, ...]}
         """
-        try:
-            instance.delete()
-        except DjangoValidationError as e:
-            error_messages = e.messages if hasattr(e, 'messages') else str(e)
-            raise serializers.ValidationError(error_messages)
+        return self.bulk_recycle_response(request)
+
+
+class ProductionEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Üretim olay günlüğü (salt okunur). ?serial_number=<SN> ile bir parçanın veya uçağın geçmişi,
+    ?entity_type=&entity_id= ile herhangi bir kaydın geçmişi (yeniden eskiye) imleç tabanlı sayfalanır.
+    Adminler tüm olayları, takım üyeleri yalnızca kendi takımlarına ait olayları görür.
+    """
+    serializer_class = ProductionEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetDataTablePagination
+    keyset_ordering_field = 'occurred_at'
+    # Günlük hızla büyür; toplam sayı PostgreSQL'de planlayıcı tahmininden okunur.
+    count_mode = 'estimate'
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProductionEventFilter
+
+    def get_queryset(self):
+        queryset = ProductionEvent.objects.all()
+        role = get_role_context(self.request)
+        if role.is_admin:
+            return queryset
+        if role.team_id is not None:
+            return queryset.filter(team_id=role.team_id)
+        return queryset.none()
 
 
 @api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def auth_cache_stats(request):
+    """
+    Token ve rol bağlamı önbelleklerinin bu süreçteki isabet/ıska sayaçlarını döndürür (sadece admin).
+    """
+    return Response({
+        'token_cache': get_token_cache_stats(),
+        'role_context_cache': role_context_cache.stats(),
+    })
+
+
+@api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def StockLevelsAPIView(request):
+def live_events_ticket(request):
     """
-    Parça veya uçak stok seviyelerini DataTable uyumlu formatta döndürür.
+    Canlı olay akışı (SSE) için kısa ömürlü bağlantı bileti ve akış adresini döndürür.
+    Sunucu ASGI altında çalışmıyorsa akış kullanılamaz; {'enabled': false} döner ve istemci yeniden denemez.
     """
-    stock_type = request.query_params.get('stock_type')
-    if stock_type not in ['parts', 'aircrafts']:
-        return Response({"error": "Geçerli bir 'stock_type' parametresi ('parts' veya 'aircrafts') gereklidir."}, status=drf_status.HTTP_400_BAD_REQUEST)
+    if not isinstance(request._request, ASGIRequest):
+        return Response({'enabled': False})
+    ticket = issue_stream_ticket(request.user, request.auth)
+    return Response({'enabled': True, 'ticket': ticket, 'url': f"{reverse('api:live-events-stream')}?ticket={ticket}"})
 
-    user = request.user
-    user_personnel = None
-    user_team = None
-    user_is_admin = user.is_staff or user.is_superuser
-    user_can_assemble = False
-    user_producible_category_value = None
 
+def _load_stream_role(user_id, token_hash):
+    """
+    Akış sahibinin rol bağlamını veritabanından taze okur (süreç içi önbellek kullanılmaz).
+    Kullanıcı pasifse veya bilet bir token'a bağlıysa ve o token artık yoksa None döner.
+    """
+    user = User.objects.select_related('personnel__team').filter(pk=user_id, is_active=True).first()
+    if user is None:
+        return None
+    if token_hash is not None and token_hash not in map(token_fingerprint, Token.objects.filter(user_id=user_id).values_list('key', flat=True)):
+        return None
+    return RoleContext.from_user(user, user.personnel if hasattr(user, 'personnel') else None)
+
+
+async def live_events_stream(request):
+    """
+    Parça, uçak, iş emri ve stok değişikliklerini server-sent events olarak iletir (ASGI sunucusu gerektirir).
+    Kimlik doğrulama `ticket` parametresiyle yapılır (bkz. live_events_ticket); yeniden bağlanan istemci
+    Last-Event-ID başlığı veya `last_event_id` parametresiyle kaldığı yerden devam eder.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Canlı olay akışı yalnızca ASGI sunucusu altında çalışır."}, status=drf_status.HTTP_503_SERVICE_UNAVAILABLE)
     try:
-        user_personnel = user.personnel
-        if user_personnel.team:
-            user_team = user_personnel.team
-            user_can_assemble = user_team.can_perform_assembly()
-            if not user_can_assemble:
-                producible_category_enum = user_team.get_producible_part_category()
-                if producible_category_enum:
-                    user_producible_category_value = producible_category_enum.value
-    except Personnel.DoesNotExist:
-        if not user_is_admin:
-            return Response({'draw': int(request.query_params.get('draw', 0)), 'recordsTotal': 0, 'recordsFiltered': 0, 'data': []}, status=drf_status.HTTP_200_OK)
-
-    draw = int(request.query_params.get('draw', 0))
-    start = int(request.query_params.get('start', 0))
-    length = int(request.query_params.get('length', 10))
-    if length == -1:
-        length = 999999
-
-    aircraft_model_id_filter = request.query_params.get('aircraft_model_id')
-
-    data_list = []
-    records_total = 0
-    records_filtered = 0
-
-    if stock_type == 'parts':
-        part_category_id_filter = request.query_params.get('part_category_id')
-
-        part_types_to_query = PartType.objects.all()
-        if not user_is_admin and not user_can_assemble and user_producible_category_value:
-            part_types_to_query = part_types_to_query.filter(category=user_producible_category_value)
-        if part_category_id_filter:
-            part_types_to_query = part_types_to_query.filter(id=part_category_id_filter)
-
-        aircraft_models_for_parts = AircraftModel.objects.all()
-        if aircraft_model_id_filter:
-            aircraft_models_for_parts = aircraft_models_for_parts.filter(id=aircraft_model_id_filter)
-
-        all_combinations = []
-        if aircraft_models_for_parts.exists() and part_types_to_query.exists():
-            for am_part in aircraft_models_for_parts:
-                for pt in part_types_to_query:
-                    all_combinations.append({'am_id': am_part.id, 'am_name': am_part.get_name_display(),
-                                             'pt_id': pt.id, 'pt_name': pt.get_category_display()})
-
-        records_total = len(all_combinations)
-
-        part_stock_query = Part.objects
-        if aircraft_model_id_filter:
-            part_stock_query = part_stock_query.filter(aircraft_model_compatibility_id=aircraft_model_id_filter)
-        if part_category_id_filter:
-            part_stock_query = part_stock_query.filter(part_type_id=part_category_id_filter)
-
-        if not user_is_admin and not user_can_assemble and user_producible_category_value:
-            part_stock_query = part_stock_query.filter(part_type__category=user_producible_category_value)
-
-        raw_part_stock_data = part_stock_query.values(
-            'aircraft_model_compatibility_id', 'part_type_id', 'status'
-        ).annotate(count=models.Count('id')).order_by()
-
-        processed_part_counts = {}
-        for item in raw_part_stock_data:
-            key = (item['aircraft_model_compatibility_id'], item['part_type_id'])
-            if key not in processed_part_counts: processed_part_counts[key] = {}
-            processed_part_counts[key][item['status']] = item['count']
-
-        for combo in all_combinations:
-            current_key = (combo['am_id'], combo['pt_id'])
-            counts_for_this_combo = processed_part_counts.get(current_key, {})
-
-            row_data = {
-                "aircraft_model_name": combo['am_name'],
-                "part_type_category_display": combo['pt_name'],
-                "warning_zero_stock": counts_for_this_combo.get(PartStatusChoices.AVAILABLE.value, 0) == 0
-            }
-            for status_choice, status_label in PartStatusChoices.choices:
-                row_data[status_choice] = counts_for_this_combo.get(status_choice, 0)
-
-            data_list.append(row_data)
-
-        records_filtered = len(data_list)
-        data_list = data_list[start: start + length]
-
-    elif stock_type == 'aircrafts':
-        if not (user_is_admin or user_can_assemble):
-            return Response({'draw': draw, 'recordsTotal': 0, 'recordsFiltered': 0, 'data': []}, status=drf_status.HTTP_200_OK)
-
-        aircraft_models_for_stock = AircraftModel.objects.all()
-        if aircraft_model_id_filter:
-            aircraft_models_for_stock = aircraft_models_for_stock.filter(id=aircraft_model_id_filter)
-
-        all_aircraft_model_combos = []
-        if aircraft_models_for_stock.exists():
-            for am_stock in aircraft_models_for_stock:
-                all_aircraft_model_combos.append({'am_id': am_stock.id, 'am_name': am_stock.get_name_display()})
-
-        records_total = len(all_aircraft_model_combos)
-
-        aircraft_stock_query = Aircraft.objects
-        if aircraft_model_id_filter:
-            aircraft_stock_query = aircraft_stock_query.filter(aircraft_model_id=aircraft_model_id_filter)
-
-        if user_can_assemble and not user_is_admin and user_team:
-            aircraft_stock_query = aircraft_stock_query.filter(assembled_by_team=user_team)
-
-        raw_aircraft_stock_data = aircraft_stock_query.values(
-            'aircraft_model_id', 'status'
-        ).annotate(count=models.Count('id')).order_by()
-
-        processed_aircraft_counts = {}
-        for item in raw_aircraft_stock_data:
-            key = item['aircraft_model_id']
-            if key not in processed_aircraft_counts: processed_aircraft_counts[key] = {}
-            processed_aircraft_counts[key][item['status']] = item['count']
-
-        for combo in all_aircraft_model_combos:
-            counts_for_this_model = processed_aircraft_counts.get(combo['am_id'], {})
-            row_data = {"aircraft_model_name": combo['am_name']}
-            for status_choice, status_label in AircraftStatusChoices.choices:
-                row_data[status_choice] = counts_for_this_model.get(status_choice, 0)
-            data_list.append(row_data)
-
-        records_filtered = len(data_list)
-        data_list = data_list[start: start + length]
+        user_id, token_hash = read_stream_ticket(request.GET.get('ticket', ''))
+    except signing.BadSignature:
+        return JsonResponse({"error": "Geçersiz veya süresi dolmuş bağlantı bileti."}, status=drf_status.HTTP_401_UNAUTHORIZED)
+    reauthorize = partial(sync_to_async(_load_stream_role), user_id, token_hash)
+    role = await reauthorize()
+    if role is None:
+        return JsonResponse({"error": "Kullanıcı bulunamadı veya pasif."}, status=drf_status.HTTP_401_UNAUTHORIZED)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    response = StreamingHttpResponse(stream_events(role, last_event_id, reauthorize), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx arabelleğe almasın
+    return response
 
-    return Response({
-        'draw': draw,
-        'recordsTotal': records_total,
-        'recordsFiltered': records_filtered,
-        'data': data_list
-    }, status=drf_status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics_view(request):
+    """
+    Bu süreçteki istek metriklerini Prometheus metin formatında döndürür (sadece admin).
+    """
+    return HttpResponse(metrics_registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def StockLevelsAPIView(request):
+    """
+    Parça veya uçak stok seviyelerini DataTable uyumlu formatta döndürür.
+    """
+    stock_type = request.query_params.get('stock_type')
+    if stock_type not in STOCK_TYPES:
+        return Response({"error": INVALID_STOCK_TYPE_MESSAGE}, status=drf_status.HTTP_400_BAD_REQUEST)
+
+    querysets = stock_level_querysets(stock_type, get_role_context(request), request.query_params)
+    results = None if querysets is None else {name: list(queryset) for name, queryset in querysets.items()}
+    return Response(build_stock_levels_response(stock_type, request.query_params, results), status=drf_status.HTTP_200_OK)
@@ -7,10 +7,60 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aircraft_production_project.settings')
+# Salt okunur uç noktalar ASGI altında async view'lardan sunulur (bkz. asgi_urls.py).
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402 (ayarlar get_asgi_application ile yüklenir)
+
+if settings.DEBUG:
+    # runserver'daki gibi statik dosyalar DEBUG modunda uygulama tarafından sunulur.
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+    application = ASGIStaticFilesHandler(application)
+
+
+class ConcurrencyLimiter:
+    """
+    Süreç başına aynı anda işlenen HTTP isteği sayısını sınırlar; fazlası kuyrukta bekler (503 dönülmez).
+    Django her isteğin senkron kodunu (ORM dahil) o isteğe ait ayrı bir thread'de çalıştırdığından bu sınır,
+    süreç başına thread ve veritabanı bağlantısı sayısının da üst sınırıdır.
+    Bir istek yalnızca yanıt başlıkları gönderilene kadar (view tamamlanana kadar) yer tutar; SSE ve dışa
+    aktarım gibi uzun süren akış gövdeleri sınıra sayılmaz, aksi halde açık dashboard'lar tüm yerleri tutar.
+    """
+
+    def __init__(self, app, limit):
+        self.app = app
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        await self.semaphore.acquire()
+        held = True
+
+        def release():
+            nonlocal held
+            if held:
+                held = False
+                self.semaphore.release()
+
+        async def send_and_release(message):
+            if message['type'] == 'http.response.start':
+                release()
+            await send(message)
+
+        try:
+            return await self.app(scope, receive, send_and_release)
+        finally:
+            release()
+
+if settings.ASGI_THREADS:
+    application = ConcurrencyLimiter(application, settings.ASGI_THREADS)
@@ -0,0 +1,19 @@
+"""
+ASGI modunda kullanılan URL yapılandırması (bkz. asgi.py ve ASYNC_READ_VIEWS ayarı).
+
+Sık çağrılan salt okunur uç noktaların async karşılıkları (aircraft_production_app/async_views.py) aynı
+adreslerle senkron URL'lerin önüne eklenir; diğer tüm adresler urls.py ile aynıdır. URL adları ve
+reverse() sonuçları değişmez, çünkü async adresler isimsizdir ve senkron adreslerle aynıdır.
+"""
+from django.urls import path
+
+from aircraft_production_app import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/user/me/', async_views.current_user_info),
+    path('api/aircraft-models/', async_views.aircraft_model_list),
+    path('api/part-types/', async_views.part_type_list),
+    path('api/inventory/stock-levels/', async_views.stock_levels),
+    *sync_urlpatterns,
+]
@@ -49,16 +49,21 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'aircraft_production_app.middleware.SecurityMiddleware', # Standart middleware'ler; ASGI altında istek başına thread geçişi yapmayan alt sınıflar (bkz. middleware.py)
+    'aircraft_production_app.metrics.QueryMetricsMiddleware', # İstek başına SQL/süre ölçümü; oturum ve kimlik doğrulama sorguları da sayılsın diye başta
+    'aircraft_production_app.middleware.SessionMiddleware',
+    'aircraft_production_app.middleware.CommonMiddleware',
+    'aircraft_production_app.middleware.CsrfViewMiddleware',
+    'aircraft_production_app.middleware.AuthenticationMiddleware',
+    'aircraft_production_app.middleware.MessageMiddleware',
+    'aircraft_production_app.middleware.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'aircraft_production_project.urls' # Projenin ana URL yapılandırma dosyası
+# ASGI sunucusu altında salt okunur uç noktaların async karşılıkları kullanılır (asgi.py bunu açar)
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+ROOT_URLCONF = 'aircraft_production_project.asgi_urls' if ASYNC_READ_VIEWS else 'aircraft_production_project.urls' # Projenin ana URL yapılandırma dosyası
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', '0')) # ASGI süreci başına eşzamanlı istek (= thread/DB bağlantısı) sınırı; 0 sınırsız
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', '1')) # Sunucu süreç sayısı; 1'den büyükse önbellek ve canlı olaylar süreçler arası paylaşılmalıdır (bkz. aircraft_production_app/checks.py)
 
 TEMPLATES = [
     {
@@ -92,6 +97,18 @@ DATABASES = {
     }
 }
 
+# Önbellek: locmem süreç içidir; birden fazla worker'da sayım/istatistik geçersiz kılmaları diğer süreçlere ulaşmaz.
+# database: tüm süreçlerin paylaştığı DatabaseCache (tablo `manage.py createcachetable` ile oluşturulur).
+CACHE_BACKEND = os.getenv('CACHE_BACKEND') or ('database' if WEB_WORKERS > 1 else 'locmem') # locmem veya database
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    } if CACHE_BACKEND == 'database' else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,7 +154,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField' # Yeni modeller için varsa
 # Django REST Framework Ayarları
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication', # API için varsayılan kimlik doğrulama yöntemi
+        'aircraft_production_app.authentication.CachingTokenAuthentication', # Token doğrulaması; token -> kullanıcı eşlemesi önbellekten okunur
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated', # Varsayılan olarak tüm API endpoint'leri kimlik doğrulaması gerektirir
@@ -152,6 +169,35 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema', # drf-spectacular için varsayılan şema sınıfı
 }
 
+# DataTable kayıt sayma stratejisi (bkz. aircraft_production_app/counts.py)
+DATATABLE_COUNT_MODE = os.environ.get('DATATABLE_COUNT_MODE', 'cached') # exact, cached veya estimate
+DATATABLE_COUNT_CACHE_TIMEOUT = int(os.environ.get('DATATABLE_COUNT_CACHE_TIMEOUT', 30)) # Önbellekteki sayımın geçerlilik süresi (saniye)
+DATATABLE_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('DATATABLE_COUNT_ESTIMATE_THRESHOLD', 100000)) # Bu değerin altındaki tahminlerde kesin sayım önbelleği kullanılır
+
+# Kullanıcı rol bağlamı önbelleği (bkz. aircraft_production_app/roles.py)
+ROLE_CONTEXT_CACHE_SIZE = int(os.environ.get('ROLE_CONTEXT_CACHE_SIZE', 4096)) # Süreç başına tutulacak en fazla kullanıcı sayısı
+ROLE_CONTEXT_CACHE_TTL = int(os.environ.get('ROLE_CONTEXT_CACHE_TTL', 60)) # Diğer süreçlerdeki değişikliklerin yansıma süresi (saniye)
+
+# Token kimlik doğrulama önbelleği (bkz. aircraft_production_app/authentication.py)
+TOKEN_AUTH_CACHE_SIZE = int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 4096)) # Süreç başına tutulacak en fazla token sayısı
+TOKEN_AUTH_CACHE_TTL = int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 300)) # Silinen token/pasif kullanıcının diğer süreçlerde yansıma süresi (saniye)
+TOKEN_AUTH_SHARED_CACHE = os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None # Süreçler arası paylaşım için CACHES içindeki önbellek adı (örn. 'default')
+
+# Takım istatistikleri önbelleği (bkz. aircraft_production_app/team_stats.py)
+TEAM_STATS_CACHE_TIMEOUT = int(os.environ.get('TEAM_STATS_CACHE_TIMEOUT', 300)) # Yazma olmasa da istatistiklerin yeniden hesaplanma süresi (saniye)
+
+# İstek metrikleri ve /metrics endpoint'i (bkz. aircraft_production_app/metrics.py)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true' # False ise middleware ölçüm yapmaz
+METRICS_QUERY_BUDGET = int(os.environ.get('METRICS_QUERY_BUDGET', 50)) # Bu sayıdan fazla sorgu çalıştıran istekler SQL parmak iziyle loglanır (0: kapalı)
+
+# Canlı değişiklik olayları / SSE (bkz. aircraft_production_app/live.py)
+LIVE_EVENTS_BACKEND = os.environ.get('LIVE_EVENTS_BACKEND') or ('postgres' if WEB_WORKERS > 1 else 'local') # local: süreç içi (tek worker); postgres: LISTEN/NOTIFY ile tüm worker'lara
+LIVE_EVENTS_CHANNEL = os.environ.get('LIVE_EVENTS_CHANNEL', 'production_live') # NOTIFY kanal adı
+LIVE_EVENTS_HISTORY = int(os.environ.get('LIVE_EVENTS_HISTORY', 1000)) # Yeniden bağlanan istemciler için saklanan son mesaj sayısı
+LIVE_EVENTS_QUEUE_SIZE = int(os.environ.get('LIVE_EVENTS_QUEUE_SIZE', 500)) # Bağlantı başına bekleyen mesaj sınırı; aşılırsa istemciye RESYNC gönderilir
+LIVE_EVENTS_KEEPALIVE = int(os.environ.get('LIVE_EVENTS_KEEPALIVE', 15)) # Boşta bağlantılara keep-alive gönderme aralığı (saniye)
+LIVE_EVENTS_TICKET_MAX_AGE = int(os.environ.get('LIVE_EVENTS_TICKET_MAX_AGE', 60)) # SSE bağlantı biletinin geçerlilik süresi (saniye)
+
 # drf-spectacular Ayarları (API Dokümantasyonu için)
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Hava Aracı Üretim API', # API dokümantasyonunun başlığı
@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.authtoken import views as authtoken_views
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from aircraft_production_app.views import metrics_view
 # from aircraft_production_app.views import frontend_dashboard_view # Eğer kök URL'de bir sayfa göstermek isterseniz
 
 urlpatterns = [
@@ -26,6 +27,9 @@ urlpatterns = [
 
     # API Token Kimlik Doğrulama Endpoint'i
     path('api-token-auth/', authtoken_views.obtain_auth_token, name='api_token_auth'),
+
+    # Prometheus metrikleri (sadece admin; bkz. aircraft_production_app/metrics.py)
+    path('metrics', metrics_view, name='metrics'),
     
     # Ana Uygulama URL'leri (API ve Frontend view'larını içerir)
     # Kök path ('') aircraft_production_app.urls'e yönlendiriliyor.
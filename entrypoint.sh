@@ -25,11 +25,29 @@ done
 
 echo "Applying database migrations..."
 python manage.py migrate --noinput
+# CACHE_BACKEND=database ise paylaşılan önbellek tablosu (diğer durumlarda işlem yapmaz)
+python manage.py createcachetable
 
 # Statik dosyaları toplamak istersen (DEBUG=False ise genellikle gerekir):
 # echo "Collecting static files..."
 # python manage.py collectstatic --noinput --clear
 
+# SERVER_MODE=asgi: çok süreçli uvicorn ile ASGI (async salt okunur uç noktalar, bkz. aircraft_production_project/asgi.py)
+# SERVER_MODE=runserver (varsayılan): Django geliştirme sunucusu
+SERVER_MODE=${SERVER_MODE:-runserver}
+
+if [ "$SERVER_MODE" = "asgi" ]; then
+  # WEB_WORKERS: uvicorn süreç sayısı. 1'den büyükse önbellek (CACHE_BACKEND=database) ve canlı olaylar
+  # (LIVE_EVENTS_BACKEND=postgres) süreçler arası paylaşılmalıdır; ayarlarda varsayılanlar buna göre seçilir
+  # ve aksi durumda migrate sistem kontrolünde durur (bkz. aircraft_production_app/checks.py)
+  # ASGI_THREADS: süreç başına aynı anda işlenen istek sayısı; her istek bir thread ve bir DB bağlantısı kullanır
+  # (fazlası kuyrukta bekler; SSE gibi akış gövdeleri sınıra sayılmaz, bkz. asgi.py)
+  export WEB_WORKERS=${WEB_WORKERS:-1}
+  export ASGI_THREADS=${ASGI_THREADS:-16}
+  echo "Starting uvicorn with $WEB_WORKERS workers ($ASGI_THREADS threads each)..."
+  exec uvicorn aircraft_production_project.asgi:application --host 0.0.0.0 --port 8000 --workers "$WEB_WORKERS"
+fi
+
 echo "Starting Django development server..."
 # 0.0.0.0 tüm arayüzlerden erişime izin verir
 exec python manage.py runserver 0.0.0.0:8000
\ No newline at end of file